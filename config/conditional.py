@@ -0,0 +1,121 @@
+"""
+Условные GET-запросы (ETag / Last-Modified) для ViewSet-ов.
+
+Валидаторы ответа вычисляются дешевыми запросами — COUNT(*) и MAX(updated_at)
+по отфильтрованному queryset-у или updated_at одной строки. Если клиент
+прислал совпадающий If-None-Match / If-Modified-Since, возвращается 304
+без выборки и сериализации данных.
+"""
+
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+
+def aggregate_state(queryset):
+    """Пара (количество строк, последнее изменение) для queryset-а."""
+    state = queryset.order_by().aggregate(count=Count("pk"), last=Max("updated_at"))
+    return state["count"], state["last"]
+
+
+async def aaggregate_state(queryset):
+    """Асинхронный вариант aggregate_state."""
+    state = await queryset.order_by().aaggregate(
+        count=Count("pk"), last=Max("updated_at")
+    )
+    return state["count"], state["last"]
+
+
+def latest(values):
+    """Самое позднее из значений updated_at (None пропускаются)."""
+    return max((value for value in values if value is not None), default=None)
+
+
+def make_validators(etag_parts, last_modified):
+    """ETag (хэш частей) и Last-Modified (метка времени) ответа."""
+    etag = quote_etag(hashlib.md5("|".join(map(str, etag_parts)).encode()).hexdigest())
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return etag, timestamp
+
+
+def state_validators(key, states):
+    """Валидаторы по списку пар (количество, последнее изменение)."""
+    return make_validators(
+        [key, *(part for state in states for part in state)],
+        latest(last for _, last in states),
+    )
+
+
+def not_modified_response(request, etag, timestamp):
+    """Ответ 304/412, если у клиента актуальная версия, иначе None."""
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def set_validators(response, etag, timestamp):
+    """Добавляет ETag и Last-Modified к успешному ответу или 304."""
+    if 200 <= response.status_code < 300 or response.status_code == 304:
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Добавляет ETag и Last-Modified к list и retrieve ViewSet-а.
+
+    Наследник описывает состояние данных:
+    - get_list_state(queryset) — список пар (количество, последнее изменение)
+    - get_detail_state(pk) — список updated_at строки и вложенных объектов
+      или None, если строки нет
+    """
+
+    def get_list_state(self, queryset):
+        return [aggregate_state(queryset)]
+
+    def get_detail_state(self, pk):
+        updated_at = (
+            self.get_queryset().filter(pk=pk).values_list("updated_at", flat=True)
+        )
+        return list(updated_at[:1]) or None
+
+    def conditional_response(self, request, etag_parts, last_modified, render):
+        """
+        Возвращает 304, если у клиента актуальная версия, иначе render().
+        Ответ дополняется заголовками ETag и Last-Modified.
+        """
+        etag, timestamp = make_validators(etag_parts, last_modified)
+        response = not_modified_response(request, etag, timestamp) or render()
+        return set_validators(response, etag, timestamp)
+
+    def conditional_state_response(self, request, key, states, render):
+        """Условный ответ по списку пар (количество, последнее изменение)."""
+        etag, timestamp = state_validators(key, states)
+        response = not_modified_response(request, etag, timestamp) or render()
+        return set_validators(response, etag, timestamp)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional_state_response(
+            request,
+            request.get_full_path(),
+            self.get_list_state(queryset),
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            state = self.get_detail_state(kwargs[self.lookup_field])
+        except (TypeError, ValueError):
+            state = None
+        if state is None:
+            # Строки нет: обычная обработка вернет 404
+            return super().retrieve(request, *args, **kwargs)
+        return self.conditional_response(
+            request,
+            [request.get_full_path(), *state],
+            latest(state),
+            lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+        )
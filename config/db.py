@@ -0,0 +1,66 @@
+"""
+Статистика пулов соединений с базой (DB_CONNECTION_MODE=pool).
+
+Пул psycopg создается Django отдельно в каждом процессе при первом
+обращении к базе; pool_stats() читает счетчики только уже созданных пулов
+и сам пул не создает: сбор метрик в воркере, который еще не обращался
+к базе, не открывает соединений. Значения попадают в /metrics/ через
+реестр config.metrics.
+"""
+
+from django.db import connections
+
+from .metrics import registry
+
+# Поле статистики psycopg_pool: метрика
+POOL_GAUGES = {
+    "pool_size": "db_pool_connections",
+    "pool_available": "db_pool_available_connections",
+    "pool_max": "db_pool_max_connections",
+    "requests_waiting": "db_pool_requests_waiting",
+}
+POOL_COUNTERS = {
+    "requests_num": "db_pool_requests_total",
+    "requests_errors": "db_pool_request_errors_total",
+    "connections_lost": "db_pool_connections_lost_total",
+}
+
+
+def existing_pool(alias):
+    """
+    Пул алиаса, если процесс его уже создал, иначе None. Свойство
+    DatabaseWrapper.pool создает пул при первом обращении, поэтому
+    читается словарь созданных пулов бэкенда PostgreSQL.
+    """
+    return getattr(connections[alias], "_connection_pools", {}).get(alias)
+
+
+def pool_stats():
+    """Статистика созданных пулов по алиасам баз, для которых включен пул."""
+    stats = {}
+    for alias in connections:
+        if not connections.settings[alias].get("OPTIONS", {}).get("pool"):
+            continue
+        pool = existing_pool(alias)
+        if pool is not None:
+            stats[alias] = pool.get_stats()
+    return stats
+
+
+def collect_metrics():
+    samples = []
+    for alias, stats in pool_stats().items():
+        labels = {"alias": alias}
+        for field, name in {**POOL_GAUGES, **POOL_COUNTERS}.items():
+            samples.append((name, labels, stats.get(field, 0)))
+        samples.append(
+            (
+                "db_pool_requests_wait_seconds_total",
+                labels,
+                stats.get("requests_wait_ms", 0) / 1000,
+            )
+        )
+    return samples
+
+
+registry.register_collector(collect_metrics)
@@ -0,0 +1,73 @@
+"""
+Быстрые JSON-рендерер и парсер API на orjson.
+
+FastJSONRenderer и FastJSONParser заменяют JSONRenderer и JSONParser DRF
+(REST_FRAMEWORK в settings, переключатель FAST_JSON) и дают тот же JSON:
+компактный, UTF-8 без \\uXXXX-экранирования кириллицы, datetime в ISO 8601
+(UTC — с суффиксом Z), date — YYYY-MM-DD. Типы, которых нет в orjson
+(Decimal, ленивые строки переводов вроде подписей Task.Status, timedelta,
+QuerySet), преобразует тот же JSONEncoder DRF, что и в стандартном рендерере.
+
+Если orjson не установлен или запрошен ответ с отступами
+(Accept: application/json; indent=4, Browsable API), используется
+стандартный json.
+"""
+
+from django.conf import settings
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Значения DRF-кодировщика для типов, которых нет в orjson
+_default = JSONEncoder().default
+
+if orjson is not None:
+    OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def dumps(data):
+    """JSON в байтах, как JSONRenderer DRF без отступов."""
+    content = orjson.dumps(data, default=_default, option=OPTIONS)
+    # JSONRenderer экранирует разделители строк U+2028/U+2029 (JavaScript)
+    if b"\xe2\x80\xa8" in content or b"\xe2\x80\xa9" in content:
+        content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+    return content
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """JSONRenderer на orjson (без orjson или с отступами — стандартный)."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if orjson is None or self.get_indent(
+            accepted_media_type, renderer_context or {}
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class FastJSONParser(parsers.JSONParser):
+    """JSONParser на orjson (без orjson — стандартный)."""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            content = stream.read() if stream is not None else b""
+            if encoding.lower().replace("-", "") != "utf8":
+                content = content.decode(encoding)
+            return orjson.loads(content)
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
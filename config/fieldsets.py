@@ -0,0 +1,167 @@
+"""
+Выборочные поля ответа: ?fields= и ?expand=.
+
+- ?fields=id,title,status — в ответе только перечисленные поля
+- ?expand=executor — связанный объект вкладывается целиком
+
+Если передан хотя бы один из параметров, связи, не указанные в expand,
+отдаются как id (плоские ссылки) и не требуют JOIN. Без параметров ответ
+не меняется: все поля, связи вложены.
+
+Queryset читает только столбцы выбранных полей (only()) и присоединяет
+только раскрытые связи (select_related), поэтому ответ меньше, а запрос
+и сериализация дешевле. Параметры действуют только для безопасных
+запросов: при записи сериализатор нужен целиком для валидации.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+
+def split_param(params, name):
+    """Множество значений параметра name, перечисленных через запятую."""
+    value = params.get(name)
+    if value is None:
+        return None
+    return {item.strip() for item in value.split(",") if item.strip()}
+
+
+def parse_fieldset(params, serializer_class):
+    """
+    Пара (fields, expand) из параметров запроса или None без параметров.
+    fields — None, если нужны все поля. Неизвестные имена — ValidationError.
+    """
+    fields = split_param(params, "fields")
+    expand = split_param(params, "expand")
+    if fields is None and expand is None:
+        return None
+
+    readable = {
+        name
+        for name, field in serializer_class().fields.items()
+        if not field.write_only
+    }
+    expandable = set(serializer_class.expandable_fields)
+    if fields is not None:
+        if not fields:
+            raise ValidationError({"fields": "Укажите хотя бы одно поле."})
+        unknown = fields - readable
+        if unknown:
+            raise ValidationError(
+                {"fields": f"Неизвестные поля: {', '.join(sorted(unknown))}."}
+            )
+    expand = expand or set()
+    if expand - expandable:
+        raise ValidationError(
+            {"expand": f"Допустимые значения: {', '.join(sorted(expandable))}."}
+        )
+    return fields, expand
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Сериализатор с выборочными полями: fieldset (fields, expand)
+    передается в контексте. expandable_fields — вложенные связи,
+    которые без expand заменяются на id.
+    """
+
+    expandable_fields = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fieldset = self.context.get("fieldset")
+        if fieldset is None:
+            return
+        selected, expand = fieldset
+        fields = self.fields
+        for name in list(fields):
+            if fields[name].write_only or (
+                selected is not None and name not in selected
+            ):
+                fields.pop(name)
+        for name in self.expandable_fields:
+            if name in fields and name not in expand:
+                fields[name] = serializers.IntegerField(
+                    source=f"{fields[name].source}_id", read_only=True
+                )
+
+
+def column_name(model, source):
+    """Имя поля модели для only() или None, если source — не столбец."""
+    try:
+        field = model._meta.get_field(source)
+    except FieldDoesNotExist:
+        return None
+    if not field.concrete:
+        return None
+    return field.name
+
+
+def restrict_queryset(queryset, serializer, extra_columns=()):
+    """
+    Ограничивает queryset столбцами полей serializer (и extra_columns)
+    и JOIN-ами раскрытых связей. Если поле не соответствует столбцу
+    модели, queryset возвращается без изменений.
+    """
+    model = queryset.model
+    columns = [model._meta.pk.name, *extra_columns]
+    related = []
+    for field in serializer.fields.values():
+        if isinstance(field, serializers.BaseSerializer):
+            related.append(field.source)
+            related_model = model._meta.get_field(field.source).related_model
+            for nested in field.fields.values():
+                name = column_name(related_model, nested.source)
+                if name is None:
+                    return queryset
+                columns.append(f"{field.source}__{name}")
+            continue
+        name = column_name(model, field.source)
+        if name is None:
+            return queryset
+        columns.append(name)
+    return queryset.select_related(None).select_related(*related).only(*columns)
+
+
+class SparseFieldsetMixin:
+    """
+    Поддержка ?fields= и ?expand= в ViewSet-е: сериализатор получает
+    fieldset в контексте, get_queryset выбирает только нужные столбцы.
+    Сериализатор должен наследовать SparseFieldsetSerializerMixin.
+    """
+
+    def get_fieldset(self):
+        if self.request.method not in SAFE_METHODS:
+            return None
+        if not hasattr(self, "_fieldset"):
+            self._fieldset = parse_fieldset(
+                self.request.query_params, self.get_serializer_class()
+            )
+        return self._fieldset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request is not None:
+            context["fieldset"] = self.get_fieldset()
+        return context
+
+    def get_ordering_columns(self, queryset):
+        """
+        Ключи сортировки курсорной пагинации: курсор следующей страницы
+        читается из последней строки, поэтому эти столбцы не откладываются.
+        """
+        paginator = self.paginator
+        if not hasattr(paginator, "get_ordering"):
+            return []
+        ordering = paginator.get_ordering(self.request, queryset, self)
+        return [name.lstrip("-") for name in ordering]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request is None or self.get_fieldset() is None:
+            return queryset
+        return restrict_queryset(
+            queryset, self.get_serializer(), self.get_ordering_columns(queryset)
+        )
@@ -0,0 +1,60 @@
+"""
+Конфигурация gunicorn.
+
+SERVER_MODE=wsgi (по умолчанию) — синхронные воркеры, config.wsgi.
+SERVER_MODE=asgi — uvicorn-воркеры, config.asgi: async-эндпоинты
+(/api/async/...) не блокируют воркер на время запросов к базе.
+
+При заданном METRICS_DIR снимки метрик воркеров из прошлых запусков
+удаляются при старте мастер-процесса, а снимок завершившегося
+или перезапущенного воркера сразу после его выхода (child_exit)
+сворачивается в итог завершившихся воркеров: счетчики и гистограммы
+/metrics/ не уменьшаются, значения gauge воркера отбрасываются.
+
+С несколькими воркерами и локальным кэшем (CACHE_BACKEND не задан
+или locmem) мастер-процесс пишет предупреждение: кэш отчетов, версии
+пользователей JWT и отметки read-your-writes реплик у каждого воркера
+свои, нужен общий кэш (Redis, Memcached).
+
+gunicorn -c config/gunicorn.conf.py
+"""
+
+import os
+from pathlib import Path
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", "1"))
+
+if os.getenv("SERVER_MODE", "wsgi") == "asgi":
+    wsgi_app = "config.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    wsgi_app = "config.wsgi:application"
+
+
+LOCAL_CACHE_BACKEND = "django.core.cache.backends.locmem.LocMemCache"
+
+
+def on_starting(server):
+    cache_backend = os.getenv("CACHE_BACKEND", LOCAL_CACHE_BACKEND)
+    if workers > 1 and cache_backend == LOCAL_CACHE_BACKEND:
+        server.log.warning(
+            "CACHE_BACKEND=%s — кэш процесса: для %d воркеров задайте общий кэш "
+            "(Redis, Memcached), иначе поколения кэша отчетов, версии "
+            "пользователей JWT и отметки read-your-writes (DB_REPLICA_HOSTS) "
+            "не видны другим воркерам",
+            cache_backend,
+            workers,
+        )
+    metrics_dir = os.getenv("METRICS_DIR")
+    if metrics_dir:
+        for path in Path(metrics_dir).glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+def child_exit(server, worker):
+    metrics_dir = os.getenv("METRICS_DIR")
+    if metrics_dir:
+        from config.metrics import mark_process_dead
+
+        mark_process_dead(worker.pid, metrics_dir)
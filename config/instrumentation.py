@@ -0,0 +1,232 @@
+"""
+Замеры SQL и времени обработки каждого запроса.
+
+RequestInstrumentationMiddleware оборачивает выполнение SQL во всех
+соединениях (connection.execute_wrapper) и считает запросы и время в базе,
+отдельно замеряет рендеринг ответа (сериализацию в JSON) и общее время.
+Итог записывается в метрики маршрута (config.metrics) и отдается
+в заголовке Server-Timing, который показывают инструменты разработчика
+браузера:
+
+    Server-Timing: db;dur=3.1;desc="4 queries", render;dur=0.8, app;dur=5.2,
+                   total;dur=9.1
+
+Если запрос медленнее SLOW_REQUEST_MS или выполнил больше
+SLOW_REQUEST_QUERIES SQL-запросов, в лог config.instrumentation пишется
+строка slow_request с JSON: метод, путь, статус, замеры и самые частые
+повторяющиеся SQL-запросы (типичный признак N+1).
+
+При REQUEST_INSTRUMENTATION=0 middleware исключается из цепочки при старте
+(MiddlewareNotUsed) и не добавляет накладных расходов.
+
+Middleware работает и в синхронной, и в асинхронной цепочке: под ASGI
+Django не переводит запрос в поток ради него, и async-эндпоинты остаются
+асинхронными. Соединения с базой у каждого потока свои, поэтому SQL
+перехватывает одна обертка, которая подключается к каждому соединению
+при его открытии (connection_created), а замеры текущего запроса берет
+из contextvar: asgiref копирует контекст в потоки sync_to_async, и запросы
+async-эндпоинтов, в том числе параллельные (ASYNC_PARALLEL_QUERIES),
+учитываются. Для параллельных запросов db — сумма времени всех потоков.
+
+Не учитываются запросы, выполняемые при отдаче потокового ответа
+(выгрузка задач).
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from .metrics import observe_request
+
+logger = logging.getLogger(__name__)
+
+# Сколько повторяющихся SQL-запросов попадает в лог медленного запроса
+TOP_DUPLICATES = 5
+
+# Замеры SQL текущего запроса (QueryStats) или None вне запроса
+current_stats = ContextVar("current_stats", default=None)
+
+
+class QueryStats:
+    """Обертка выполнения SQL: количество, суммарное время и тексты запросов."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+        # Запросы одного запроса могут выполняться в нескольких потоках
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            with self._lock:
+                self.duration += duration
+                self.count += 1
+                self.statements[sql] += 1
+
+    def duplicates(self, limit=TOP_DUPLICATES):
+        """Запросы, выполненные больше одного раза, — самые частые первыми."""
+        return [
+            {"sql": sql, "count": count}
+            for sql, count in self.statements.most_common(limit)
+            if count > 1
+        ]
+
+
+class RequestTimings:
+    """Замеры одного запроса."""
+
+    def __init__(self):
+        self.queries = QueryStats()
+        self.render = 0.0
+        self._render_started = None
+
+    def render_started(self):
+        self._render_started = time.perf_counter()
+
+    def render_finished(self, response):
+        self.render = time.perf_counter() - self._render_started
+
+
+def server_timing(timings, total):
+    """Значение заголовка Server-Timing (длительности в миллисекундах)."""
+    db = timings.queries.duration
+    app = max(total - db - timings.render, 0.0)
+    return ", ".join(
+        [
+            f'db;dur={db * 1000:.1f};desc="{timings.queries.count} queries"',
+            f"render;dur={timings.render * 1000:.1f}",
+            f"app;dur={app * 1000:.1f}",
+            f"total;dur={total * 1000:.1f}",
+        ]
+    )
+
+
+def route_name(request):
+    """Имя маршрута (tasks-list, token_obtain_pair, ...) для меток метрик."""
+    match = request.resolver_match
+    if match is None or not match.url_name:
+        return "unmatched"
+    return match.url_name
+
+
+def record_query(execute, sql, params, many, context):
+    """Обертка SQL всех соединений: передает запрос замерам current_stats."""
+    stats = current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+def install(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def on_connection_created(sender, connection, **kwargs):
+    install(connection)
+
+
+connection_created.connect(on_connection_created)
+
+
+@contextmanager
+def capture_queries(stats):
+    """
+    Передает stats SQL-запросы текущего контекста, в том числе выполненные
+    в потоках sync_to_async.
+    """
+    token = current_stats.set(stats)
+    try:
+        yield
+    finally:
+        current_stats.reset(token)
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Счетчик SQL-запросов и времени обработки: заголовок Server-Timing,
+    метрики маршрута и строка в логе для медленных запросов.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_INSTRUMENTATION:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        # Соединения, открытые до подключения обработчика connection_created
+        for connection in connections.all():
+            install(connection)
+        self.slow_ms = settings.SLOW_REQUEST_MS
+        self.slow_queries = settings.SLOW_REQUEST_QUERIES
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timings = request._timings = RequestTimings()
+        started = time.perf_counter()
+        with capture_queries(timings.queries):
+            response = self.get_response(request)
+        return self.finish(request, response, timings, started)
+
+    async def __acall__(self, request):
+        timings = request._timings = RequestTimings()
+        started = time.perf_counter()
+        with capture_queries(timings.queries):
+            response = await self.get_response(request)
+        return self.finish(request, response, timings, started)
+
+    def finish(self, request, response, timings, started):
+        total = time.perf_counter() - started
+        response["Server-Timing"] = server_timing(timings, total)
+        observe_request(
+            route=route_name(request),
+            method=request.method,
+            status=response.status_code,
+            duration=total,
+            db_duration=timings.queries.duration,
+            queries=timings.queries.count,
+            size=None if response.streaming else len(response.content),
+        )
+        if total * 1000 >= self.slow_ms or timings.queries.count > self.slow_queries:
+            self.log_slow_request(request, response, timings, total)
+        return response
+
+    def process_template_response(self, request, response):
+        """Замер рендеринга ответов DRF (Response рендерится после view)."""
+        timings = request._timings
+        timings.render_started()
+        response.add_post_render_callback(timings.render_finished)
+        return response
+
+    def log_slow_request(self, request, response, timings, total):
+        record = {
+            "method": request.method,
+            "path": request.get_full_path(),
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 1),
+            "db_ms": round(timings.queries.duration * 1000, 1),
+            "render_ms": round(timings.render * 1000, 1),
+            "queries": timings.queries.count,
+            "duplicates": timings.queries.duplicates(),
+        }
+        logger.warning("slow_request %s", json.dumps(record, ensure_ascii=False))
@@ -0,0 +1,339 @@
+"""
+Метрики запросов в формате Prometheus без внешнего APM.
+
+Каждый процесс копит в памяти гистограммы по маршрутам (имя URL:
+tasks-list, tasks-busy-employees, token_obtain_pair, ...): время ответа,
+время в базе, количество SQL-запросов и размер ответа, а также счетчики
+запросов и попаданий в кэши. Наблюдения записывает
+RequestInstrumentationMiddleware (config.instrumentation), счетчики кэшей
+отдают функции, зарегистрированные через register_collector.
+
+Под gunicorn у каждого воркера свой реестр. Если задан METRICS_DIR, воркер
+не чаще раза в METRICS_FLUSH_INTERVAL секунд сохраняет снимок в файл
+<pid>.json этого каталога, а эндпоинт /metrics/ складывает снимки всех
+воркеров. Без METRICS_DIR отдаются метрики только обрабатывающего процесса.
+Снимок завершившегося воркера мастер gunicorn сворачивает в общий итог
+завершившихся воркеров dead_workers.json (child_exit в config/gunicorn.conf.py,
+как mark_process_dead в multiprocess-режиме prometheus_client): счетчики
+и гистограммы прибавляются к итогу, чтобы суммы на /metrics/ не уменьшались
+при перезапуске воркера (Prometheus принял бы это за сброс счетчика),
+а значения gauge отбрасываются. Снимки процессов, которых уже нет (например,
+после аварийного завершения мастера), сворачиваются так же при сборе.
+Перцентили p50/p95/p99 считает Prometheus по бакетам гистограмм
+(histogram_quantile).
+"""
+
+import bisect
+import fcntl
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Имя метрики: (тип, описание, бакеты гистограммы)
+METRICS = {
+    "http_requests_total": ("counter", "Количество запросов", None),
+    "http_request_duration_seconds": (
+        "histogram",
+        "Время обработки запроса",
+        LATENCY_BUCKETS,
+    ),
+    "http_request_db_seconds": (
+        "histogram",
+        "Время SQL-запросов за запрос",
+        LATENCY_BUCKETS,
+    ),
+    "http_request_queries": (
+        "histogram",
+        "Количество SQL-запросов за запрос",
+        QUERY_BUCKETS,
+    ),
+    "http_response_size_bytes": ("histogram", "Размер тела ответа", SIZE_BUCKETS),
+    "tasks_report_cache_requests_total": (
+        "counter",
+        "Обращения к кэшу отчетов (result: hit, miss)",
+        None,
+    ),
+    "auth_user_cache_requests_total": (
+        "counter",
+        "Обращения к кэшу пользователей JWT (result: hit, miss)",
+        None,
+    ),
+    "db_pool_connections": ("gauge", "Открытые соединения пула", None),
+    "db_pool_available_connections": ("gauge", "Свободные соединения пула", None),
+    "db_pool_max_connections": ("gauge", "Максимальный размер пула", None),
+    "db_pool_requests_waiting": ("gauge", "Ожидающие соединения запросы", None),
+    "db_pool_requests_total": ("counter", "Выдачи соединений из пула", None),
+    "db_pool_requests_wait_seconds_total": (
+        "counter",
+        "Суммарное ожидание соединения из пула",
+        None,
+    ),
+    "db_pool_request_errors_total": (
+        "counter",
+        "Ошибки получения соединения (таймаут, ошибка подключения)",
+        None,
+    ),
+    "db_pool_connections_lost_total": (
+        "counter",
+        "Соединения, не прошедшие проверку при выдаче",
+        None,
+    ),
+}
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Итог завершившихся воркеров и блокировка каталога снимков
+DEAD_WORKERS_FILE = "dead_workers.json"
+LOCK_FILE = ".lock"
+
+
+class MetricsRegistry:
+    """
+    Потокобезопасный реестр метрик процесса.
+    Гистограмма хранится как [счетчики по бакетам (+Inf последний), сумма, количество].
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._collectors = []
+        self._flushed_at = 0.0
+
+    def inc(self, name, labels, amount=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        index = bisect.bisect_left(buckets, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(buckets) + 1), 0, 0]
+            histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def register_collector(self, collector):
+        """
+        collector() возвращает счетчики и gauge-метрики
+        [(имя, метки, значение), ...], которые читаются в момент снимка.
+        Значения воркеров при сборе складываются.
+        """
+        self._collectors.append(collector)
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self):
+        """Состояние реестра в виде, пригодном для JSON."""
+        with self._lock:
+            counters = [
+                [name, list(labels), value]
+                for (name, labels), value in self._counters.items()
+            ]
+            histograms = [
+                [name, list(labels), list(counts), total, count]
+                for (name, labels), (counts, total, count) in self._histograms.items()
+            ]
+        for collector in self._collectors:
+            counters.extend(
+                [name, sorted(labels.items()), value]
+                for name, labels, value in collector()
+            )
+        return {"counters": counters, "histograms": histograms}
+
+    def flush(self, force=False):
+        """Сохраняет снимок в METRICS_DIR (не чаще METRICS_FLUSH_INTERVAL)."""
+        if not settings.METRICS_DIR:
+            return
+        now = time.monotonic()
+        if not force and now - self._flushed_at < settings.METRICS_FLUSH_INTERVAL:
+            return
+        self._flushed_at = now
+        directory = Path(settings.METRICS_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        write_snapshot(directory / f"{os.getpid()}.json", self.snapshot())
+
+    def collect(self):
+        """Снимки всех воркеров (или только этого процесса без METRICS_DIR)."""
+        if not settings.METRICS_DIR:
+            return [self.snapshot()]
+        self.flush(force=True)
+        directory = Path(settings.METRICS_DIR)
+        snapshots = []
+        with locked(directory):
+            for path in list(directory.glob("*.json")):
+                if path.name != DEAD_WORKERS_FILE and not process_alive(path.stem):
+                    fold_snapshot(directory, path)
+            for path in directory.glob("*.json"):
+                try:
+                    snapshots.append(json.loads(path.read_text()))
+                except (OSError, ValueError):
+                    # Файл удален или перезаписывается воркером — пропускаем
+                    continue
+        return snapshots
+
+
+@contextmanager
+def locked(directory):
+    """Исключительная блокировка каталога снимков (сбор и сворачивание)."""
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / LOCK_FILE, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def read_snapshot(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {"counters": [], "histograms": []}
+
+
+def write_snapshot(path, snapshot):
+    temp_path = path.with_suffix(".tmp")
+    temp_path.write_text(json.dumps(snapshot))
+    os.replace(temp_path, path)
+
+
+def without_gauges(snapshot):
+    return {
+        "counters": [
+            item
+            for item in snapshot["counters"]
+            if METRICS.get(item[0], ("counter",))[0] != "gauge"
+        ],
+        "histograms": snapshot["histograms"],
+    }
+
+
+def fold_snapshot(directory, path):
+    """
+    Прибавляет счетчики и гистограммы снимка path к итогу завершившихся
+    воркеров и удаляет снимок. Вызывается под блокировкой каталога.
+    """
+    if path.exists():
+        dead_path = directory / DEAD_WORKERS_FILE
+        snapshots = [read_snapshot(dead_path), without_gauges(read_snapshot(path))]
+        counters, histograms = merge(snapshots)
+        write_snapshot(
+            dead_path,
+            {
+                "counters": [
+                    [name, list(labels), value]
+                    for (name, labels), value in counters.items()
+                ],
+                "histograms": [
+                    [name, list(labels), counts, total, count]
+                    for (name, labels), (counts, total, count) in histograms.items()
+                ],
+            },
+        )
+    path.unlink(missing_ok=True)
+
+
+def mark_process_dead(pid, directory):
+    """Сворачивает снимок завершившегося воркера pid (хук child_exit gunicorn)."""
+    directory = Path(directory)
+    with locked(directory):
+        fold_snapshot(directory, directory / f"{pid}.json")
+
+
+def process_alive(pid):
+    """Жив ли процесс с pid (строка из имени файла снимка)."""
+    try:
+        os.kill(int(pid), 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        # Процесс есть, но принадлежит другому пользователю
+        return True
+    return True
+
+
+registry = MetricsRegistry()
+
+
+def merge(snapshots):
+    """Суммирует снимки воркеров по имени метрики и меткам."""
+    counters, histograms = {}, {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot["counters"]:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, counts, total, count in snapshot["histograms"]:
+            key = (name, tuple(map(tuple, labels)))
+            merged = histograms.setdefault(key, [[0] * len(counts), 0, 0])
+            merged[0] = [a + b for a, b in zip(merged[0], counts)]
+            merged[1] += total
+            merged[2] += count
+    return counters, histograms
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels, **extra):
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in pairs) + "}"
+
+
+def render(snapshots):
+    """Метрики в текстовом формате Prometheus."""
+    counters, histograms = merge(snapshots)
+    lines = []
+    for name, (kind, description, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind in ("counter", "gauge"):
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{format_labels(labels)} {value}")
+            continue
+        for (metric, labels), (counts, total, count) in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, bucket_count in zip([*buckets, "+Inf"], counts):
+                cumulative += bucket_count
+                lines.append(
+                    f"{name}_bucket{format_labels(labels, le=bound)} {cumulative}"
+                )
+            lines.append(f"{name}_sum{format_labels(labels)} {total}")
+            lines.append(f"{name}_count{format_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def observe_request(route, method, status, duration, db_duration, queries, size):
+    """Наблюдения одного запроса (вызывается middleware замеров)."""
+    labels = {"route": route}
+    registry.inc(
+        "http_requests_total", {**labels, "method": method, "status": str(status)}
+    )
+    registry.observe("http_request_duration_seconds", labels, duration)
+    registry.observe("http_request_db_seconds", labels, db_duration)
+    registry.observe("http_request_queries", labels, queries)
+    if size is not None:
+        registry.observe("http_response_size_bytes", labels, size)
+    registry.flush()
@@ -0,0 +1,41 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class LargeTablePaginator(Paginator):
+    """
+    Пагинатор списков админки без COUNT(*) по всей таблице.
+
+    Считается не больше max_count строк (COUNT по подзапросу с LIMIT).
+    Если строк больше, для выборки без фильтров на PostgreSQL возвращается
+    оценка из статистики планировщика (pg_class.reltuples), иначе —
+    max_count: страницы дальше него недоступны, сузьте выборку фильтром
+    или поиском.
+    """
+
+    max_count = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        count = queryset.order_by()[: self.max_count + 1].count()
+        if count <= self.max_count:
+            return count
+        return self.estimated_count(queryset) or self.max_count
+
+    def estimated_count(self, queryset):
+        """Оценка числа строк таблицы без фильтров (только PostgreSQL)."""
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql" or queryset.query.has_filters():
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+        # reltuples = -1, если таблица еще не анализировалась
+        if row is None or row[0] <= self.max_count:
+            return None
+        return row[0]
@@ -0,0 +1,121 @@
+"""
+Чтение с реплик базы для безопасных запросов API.
+
+ReplicaReadMixin включает чтение с реплики (REPLICA_DATABASES) на время
+обработки GET/HEAD/OPTIONS-запроса ViewSet-а — после аутентификации,
+поэтому пользователь JWT всегда загружается с основной базы. ReplicaRouter
+направляет на реплику только чтения внутри такого запроса; запись,
+аутентификация, админка и остальные представления работают с default.
+
+Read-your-writes: после успешного изменяющего запроса пользователь
+REPLICA_STICKY_SECONDS секунд читает с основной базы и видит свои
+изменения, даже если реплика отстает. Отметка хранится по id пользователя
+в кэше Django (REPLICA_STICKY_CACHE_ALIAS) — так она действует и для
+клиентов с JWT в заголовке, которые не хранят cookie; чтобы она работала
+во всех воркерах, кэш должен быть общим (Redis, Memcached; gunicorn
+предупреждает о locmem при нескольких воркерах). Дополнительно ответ
+ставит подписанную cookie с id пользователя (срок проверяется по подписи):
+клиент, который хранит cookie, читает с основной базы в любом воркере
+и без общего кэша. Cookie принимается только для того же пользователя.
+
+Отчеты, рассчитанные на реплике, могут отставать от основной базы
+на задержку репликации и храниться в кэше отчетов до его TTL.
+"""
+
+import contextvars
+import random
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+
+_read_from_replica = contextvars.ContextVar("read_from_replica", default=False)
+
+STICKY_COOKIE = "db_primary"
+STICKY_SALT = "config.replicas.sticky"
+
+
+def sticky_key(user_id):
+    return f"db:primary:{user_id}"
+
+
+def sticky_cache():
+    return caches[settings.REPLICA_STICKY_CACHE_ALIAS]
+
+
+def is_sticky(request):
+    """Писал ли пользователь запроса в последние REPLICA_STICKY_SECONDS секунд."""
+    user_id = request.get_signed_cookie(
+        STICKY_COOKIE,
+        default=None,
+        salt=STICKY_SALT,
+        max_age=settings.REPLICA_STICKY_SECONDS,
+    )
+    if user_id is not None and user_id == str(request.user.pk):
+        return True
+    return bool(sticky_cache().get(sticky_key(request.user.pk)))
+
+
+def set_sticky(request, response):
+    sticky_cache().set(
+        sticky_key(request.user.pk), True, settings.REPLICA_STICKY_SECONDS
+    )
+    response.set_signed_cookie(
+        STICKY_COOKIE,
+        str(request.user.pk),
+        salt=STICKY_SALT,
+        max_age=settings.REPLICA_STICKY_SECONDS,
+        secure=request.is_secure(),
+        httponly=True,
+        samesite="Lax",
+    )
+
+
+class ReplicaRouter:
+    """Чтения внутри ReplicaReadMixin — на случайную реплику, остальное — на default."""
+
+    def db_for_read(self, model, **hints):
+        if _read_from_replica.get() and settings.REPLICA_DATABASES:
+            return random.choice(settings.REPLICA_DATABASES)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и основная база
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+class ReplicaReadMixin:
+    """
+    Безопасные запросы ViewSet-а читают с реплики; после записи
+    пользователь некоторое время читает с основной базы.
+    """
+
+    _replica_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            settings.REPLICA_DATABASES
+            and request.method in SAFE_METHODS
+            and not is_sticky(request)
+        ):
+            self._replica_token = _read_from_replica.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if self._replica_token is not None:
+            _read_from_replica.reset(self._replica_token)
+            self._replica_token = None
+        elif (
+            settings.REPLICA_DATABASES
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            set_sticky(request, response)
+        return super().finalize_response(request, response, *args, **kwargs)
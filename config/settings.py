@@ -2,6 +2,7 @@ import os
 import sys
 from datetime import timedelta
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -28,6 +29,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "config.instrumentation.RequestInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -61,8 +63,16 @@ if "test" in sys.argv or os.getenv("GITHUB_WORKFLOW"):
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": ":memory:",
-        }
+        },
+        # Зеркало default для тестов маршрутизации чтения
+        "replica": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": ":memory:",
+            "TEST": {"MIRROR": "default"},
+        },
     }
+    # В тестах чтение с реплики включается через override_settings
+    REPLICA_DATABASES = []
 else:
     DATABASES = {
         "default": {
@@ -74,6 +84,72 @@ else:
             "PORT": os.getenv("DB_PORT", "5432"),
         }
     }
+    # Реплики для чтения: DB_REPLICA_HOSTS — хосты через запятую, DB_REPLICA_PORT
+    # и DB_REPLICA_NAME — порт и база на репликах (по умолчанию как у основной).
+    # Для проверки на одном сервере: DB_REPLICA_HOSTS=localhost и копия базы
+    # в DB_REPLICA_NAME
+    replica_hosts = [
+        host for host in os.getenv("DB_REPLICA_HOSTS", "").split(",") if host
+    ]
+    for number, host in enumerate(replica_hosts, 1):
+        DATABASES["replica" if number == 1 else f"replica_{number}"] = {
+            **DATABASES["default"],
+            "HOST": host,
+            "PORT": os.getenv("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+            "NAME": os.getenv("DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+            "TEST": {"MIRROR": "default"},
+        }
+    REPLICA_DATABASES = [alias for alias in DATABASES if alias != "default"]
+
+# Безопасные запросы TaskViewSet и CustomUserViewSet читают с REPLICA_DATABASES;
+# после записи пользователь REPLICA_STICKY_SECONDS секунд читает с основной базы
+DATABASE_ROUTERS = ["config.replicas.ReplicaRouter"]
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+# Кэш отметок read-your-writes (по id пользователя); при нескольких воркерах
+# должен быть общим
+REPLICA_STICKY_CACHE_ALIAS = os.getenv("REPLICA_STICKY_CACHE_ALIAS", "default")
+
+# Соединения с PostgreSQL (DB_CONNECTION_MODE):
+# new — новое соединение на каждый запрос (по умолчанию);
+# persistent — соединение потока воркера живет DB_CONN_MAX_AGE секунд
+#   и проверяется перед переиспользованием;
+# pool — пул psycopg в каждом воркере: от DB_POOL_MIN_SIZE до DB_POOL_MAX_SIZE
+#   соединений, ожидание свободного не дольше DB_POOL_TIMEOUT секунд,
+#   проверка соединения при выдаче из пула. Статистика пула — в /metrics/.
+DB_CONNECTION_MODE = os.getenv("DB_CONNECTION_MODE", "new")
+if DB_CONNECTION_MODE == "persistent":
+    DB_CONNECTION_SETTINGS = {
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "600")),
+        "CONN_HEALTH_CHECKS": True,
+    }
+elif DB_CONNECTION_MODE == "pool":
+    DB_CONNECTION_SETTINGS = {
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "pool": {
+                "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+                "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+                "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+            }
+        },
+    }
+elif DB_CONNECTION_MODE == "new":
+    DB_CONNECTION_SETTINGS = {}
+else:
+    raise ImproperlyConfigured(
+        f"DB_CONNECTION_MODE={DB_CONNECTION_MODE}: ожидается new, persistent или pool"
+    )
+for database in DATABASES.values():
+    if database["ENGINE"] == "django.db.backends.postgresql":
+        database.update(DB_CONNECTION_SETTINGS)
+
+# Выполнять независимые запросы async-отчетов в отдельных потоках
+# со своими соединениями. Для SQLite в памяти отключено: у каждого
+# соединения была бы своя база.
+ASYNC_PARALLEL_QUERIES = (
+    os.getenv("ASYNC_PARALLEL_QUERIES", "1") == "1"
+    and DATABASES["default"]["NAME"] != ":memory:"
+)
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -90,13 +166,105 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# JSON API через orjson (config.fast_json); 0 — стандартные рендерер и парсер DRF.
+# Без установленного orjson быстрые классы сами используют стандартный json.
+FAST_JSON = os.getenv("FAST_JSON", "1") == "1"
+
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("users.authentication.CachedJWTAuthentication",),
+    "DEFAULT_RENDERER_CLASSES": [
+        (
+            "config.fast_json.FastJSONRenderer"
+            if FAST_JSON
+            else "rest_framework.renderers.JSONRenderer"
+        ),
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        (
+            "config.fast_json.FastJSONParser"
+            if FAST_JSON
+            else "rest_framework.parsers.JSONParser"
+        ),
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+# Размер страницы списка задач и максимум, который можно запросить ?page_size=
+TASKS_PAGE_SIZE = int(os.getenv("TASKS_PAGE_SIZE", "50"))
+TASKS_MAX_PAGE_SIZE = int(os.getenv("TASKS_MAX_PAGE_SIZE", "500"))
+
+# Максимальная глубина обхода иерархии задач (tree/ancestors)
+TASKS_TREE_MAX_DEPTH = int(os.getenv("TASKS_TREE_MAX_DEPTH", "50"))
+
+# Максимальное количество задач в одном запросе массовых операций
+TASKS_BULK_MAX_ITEMS = int(os.getenv("TASKS_BULK_MAX_ITEMS", "1000"))
+
+# Количество строк, читаемых из серверного курсора за раз при выгрузке задач
+TASKS_EXPORT_CHUNK_SIZE = int(os.getenv("TASKS_EXPORT_CHUNK_SIZE", "2000"))
+
+# Максимальное количество результатов поиска задач
+TASKS_SEARCH_MAX_RESULTS = int(os.getenv("TASKS_SEARCH_MAX_RESULTS", "50"))
+
+# Период обновления снимка загрузки сотрудников (refresh_workload), секунды
+WORKLOAD_REFRESH_INTERVAL = int(os.getenv("WORKLOAD_REFRESH_INTERVAL", "300"))
+
+# Кэш. По умолчанию локальный в памяти процесса; для общего кэша воркеров
+# задайте CACHE_BACKEND (например, django.core.cache.backends.redis.RedisCache)
+# и CACHE_LOCATION. С несколькими воркерами (GUNICORN_WORKERS > 1) нужен
+# общий кэш: поколение кэша отчетов увеличивается только в процессе,
+# который записал данные, и в locmem остальные воркеры его не видят
+# (gunicorn предупреждает об этом при старте)
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
+# Кэш отчетов busy-employees и important-tasks: алиас кэша и TTL в секундах
+# (0 — без кэширования)
+TASKS_REPORT_CACHE_ALIAS = os.getenv("TASKS_REPORT_CACHE_ALIAS", "default")
+TASKS_REPORT_CACHE_TIMEOUT = int(os.getenv("TASKS_REPORT_CACHE_TIMEOUT", "60"))
+
+# Кэш пользователей JWT-аутентификации в памяти процесса: размер и TTL в секундах
+# (0 — без кэширования) и алиас общего кэша с версиями пользователей, по которым
+# воркеры узнают о деактивации, смене пароля и удалении
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "1024"))
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv("AUTH_USER_CACHE_TIMEOUT", "30"))
+AUTH_USER_CACHE_ALIAS = os.getenv("AUTH_USER_CACHE_ALIAS", "default")
+
+# Замеры SQL и времени каждого запроса (заголовок Server-Timing) и порог
+# медленного запроса: время в миллисекундах или количество SQL-запросов
+REQUEST_INSTRUMENTATION = os.getenv("REQUEST_INSTRUMENTATION", "1") == "1"
+SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", "500"))
+SLOW_REQUEST_QUERIES = int(os.getenv("SLOW_REQUEST_QUERIES", "50"))
+
+# Метрики Prometheus (/metrics/): каталог снимков воркеров gunicorn и период
+# их сохранения в секундах. Без METRICS_DIR — метрики одного процесса
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+# Постоянный токен Prometheus для /metrics/ (Authorization: Bearer <токен>);
+# пустой — доступ только staff по JWT
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        # В тестах медленные запросы — хеширование паролей, их не логируем
+        "config.instrumentation": {
+            "handlers": ["console"],
+            "level": "ERROR" if "test" in sys.argv else "WARNING",
+        },
+    },
 }
 
 SIMPLE_JWT = {
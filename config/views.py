@@ -0,0 +1,56 @@
+import hmac
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from rest_framework import authentication, permissions
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+)
+from rest_framework.settings import api_settings
+
+from . import db  # noqa: F401 — регистрирует метрики пула соединений
+from .metrics import CONTENT_TYPE, registry, render
+
+# request.auth запроса, подписанного METRICS_TOKEN
+METRICS_SCRAPE = "metrics-scrape"
+
+
+class MetricsTokenAuthentication(authentication.BaseAuthentication):
+    """
+    Постоянный токен сборщика метрик: Authorization: Bearer <METRICS_TOKEN>.
+    Другой токен передается следующим классам аутентификации (JWT).
+    """
+
+    def authenticate(self, request):
+        token = settings.METRICS_TOKEN
+        header = authentication.get_authorization_header(request).split()
+        if not token or len(header) != 2 or header[0].lower() != b"bearer":
+            return None
+        if not hmac.compare_digest(header[1], token.encode()):
+            return None
+        return AnonymousUser(), METRICS_SCRAPE
+
+    def authenticate_header(self, request):
+        # Без этого DRF отвечает 403 вместо 401 неаутентифицированному запросу
+        return 'Bearer realm="api"'
+
+
+class IsMetricsScraper(permissions.BasePermission):
+    def has_permission(self, request, view):
+        return request.auth == METRICS_SCRAPE
+
+
+@api_view(["GET"])
+@authentication_classes(
+    [MetricsTokenAuthentication, *api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+)
+@permission_classes([IsMetricsScraper | permissions.IsAdminUser])
+def metrics_view(request):
+    """
+    GET /metrics/ — метрики всех воркеров в формате Prometheus: для staff
+    (JWT) или сборщика с токеном METRICS_TOKEN.
+    """
+    return HttpResponse(render(registry.collect()), content_type=CONTENT_TYPE)
@@ -1,9 +1,36 @@
 from django.contrib import admin
+from django.db import connections
+
+from config.paginators import LargeTablePaginator
 from .models import Task
+from .search import postgres_search
 
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
     list_display = ("title", "executor", "status", "due_date")
+    # Исполнитель подгружается JOIN-ом, а не запросом на каждую строку
+    list_select_related = ("executor",)
+    # Фильтры и иерархия дат идут по индексам (status, due_date) и (due_date)
     list_filter = ("status", "due_date")
+    date_hierarchy = "due_date"
     search_fields = ("title", "executor__full_name")
+    # Обратный порядок индекса (created_at, id): сортировка без сортировки таблицы
+    ordering = ("-created_at", "-id")
+    # Выбор задач и сотрудников поиском вместо <select> со всей таблицей
+    autocomplete_fields = ("parent", "executor", "creator")
+    # Без COUNT(*) по всей таблице
+    paginator = LargeTablePaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        На PostgreSQL — полнотекстовый поиск по индексам (tasks.search)
+        вместо ILIKE по названию и имени исполнителя; число — поиск по id.
+        """
+        search_term = search_term.strip()
+        if not search_term or connections[queryset.db].vendor != "postgresql":
+            return super().get_search_results(request, queryset, search_term)
+        if search_term.isdigit():
+            return queryset.filter(pk=int(search_term)), False
+        return postgres_search(queryset, search_term), False
@@ -0,0 +1,231 @@
+"""
+Асинхронные версии списка, детального просмотра и отчетов задач.
+
+DRF не поддерживает async-методы ViewSet-ов, поэтому это обычные
+async-представления Django с той же JWT-аутентификацией, ETag и кэшем
+отчетов, что и у TaskViewSet; формат ответов совпадает. Под ASGI
+(uvicorn-воркеры, см. README) ожидание базы не блокирует процесс, и один
+воркер обслуживает много одновременных медленных отчетов.
+
+Независимые запросы отчета выполняются одновременно: при
+ASYNC_PARALLEL_QUERIES каждый — в отдельном потоке со своим соединением,
+иначе — последовательно через асинхронный ORM.
+"""
+
+import asyncio
+import functools
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import HttpResponse
+from django.views.decorators.http import require_safe
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from config.conditional import (
+    aaggregate_state,
+    latest,
+    make_validators,
+    not_modified_response,
+    set_validators,
+    state_validators,
+)
+from config.fieldsets import parse_fieldset, restrict_queryset
+from users.authentication import CachedJWTAuthentication
+from users.models import CustomUser
+from .important_tasks import (
+    candidates_queryset,
+    compute_important_tasks,
+    employee_load_queryset,
+    subtask_executors_queryset,
+)
+from .fast_read import TaskRowSerializer
+from .filters import filter_tasks, task_ordering
+from .models import Task
+from .pagination import TaskCursorPagination
+from .report_cache import acached_report, aget_generation
+from .serializers import TaskSerializer
+from .services import (
+    assigned_active_tasks_queryset,
+    build_busy_employees,
+    busy_employees_queryset,
+)
+
+
+def tasks_queryset():
+    """Задачи с подгруженными JOIN-ом создателем и исполнителем."""
+    return Task.objects.select_related("creator", "executor")
+
+
+def json_response(data, status=200):
+    """Ответ в том же JSON, что отдает DRF (рендерер JSON по умолчанию)."""
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return HttpResponse(
+        renderer.render(data), content_type="application/json", status=status
+    )
+
+
+def error_response(exc):
+    """Ответ с ошибкой API в формате обработчика исключений DRF."""
+    if isinstance(exc.detail, (list, dict)):
+        data = exc.detail
+    else:
+        data = {"detail": exc.detail}
+    return json_response(data, status=exc.status_code)
+
+
+def async_api_view(view):
+    """
+    Оборачивает async-представление: только GET/HEAD, JWT-аутентификация
+    (request.user) и преобразование исключений API в ответы.
+    """
+    authenticator = CachedJWTAuthentication()
+
+    @require_safe
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            user_auth = await sync_to_async(authenticator.authenticate)(request)
+            if user_auth is None:
+                raise exceptions.NotAuthenticated()
+        except exceptions.APIException as exc:
+            response = error_response(exc)
+            response["WWW-Authenticate"] = authenticator.authenticate_header(request)
+            return response
+        request.user = user_auth[0]
+
+        try:
+            return await view(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return error_response(exc)
+
+    return wrapper
+
+
+def _fetch_in_thread(queryset):
+    close_old_connections()
+    try:
+        return list(queryset)
+    finally:
+        close_old_connections()
+
+
+async def fetch(queryset):
+    """Загружает queryset в список, не блокируя цикл событий."""
+    if settings.ASYNC_PARALLEL_QUERIES:
+        return await sync_to_async(_fetch_in_thread, thread_sensitive=False)(queryset)
+    return [row async for row in queryset]
+
+
+async def fetch_all(*querysets):
+    """Загружает независимые queryset-ы одновременно."""
+    return await asyncio.gather(*(fetch(queryset) for queryset in querysets))
+
+
+async def abusy_employees():
+    """Асинхронный расчет отчета "Занятые сотрудники"."""
+    employees, active_tasks = await fetch_all(
+        busy_employees_queryset(), assigned_active_tasks_queryset()
+    )
+    return build_busy_employees(employees, active_tasks)
+
+
+async def aimportant_tasks():
+    """Асинхронный расчет отчета "Важные задачи"."""
+    candidates, subtask_executors, employee_load = await fetch_all(
+        candidates_queryset(), subtask_executors_queryset(), employee_load_queryset()
+    )
+    return compute_important_tasks(candidates, subtask_executors, employee_load)
+
+
+async def tasks_state(queryset):
+    """Состояние задач и сотрудников для ETag (как у TaskViewSet)."""
+    return await asyncio.gather(
+        aaggregate_state(queryset), aaggregate_state(CustomUser.objects.all())
+    )
+
+
+async def report_response(request, name, compute):
+    """Отчет из кэша с проверкой ETag — те же ETag, что у TaskViewSet."""
+    etag, timestamp = state_validators(
+        f"{name}:{await aget_generation()}", await tasks_state(Task.objects.all())
+    )
+    response = not_modified_response(request, etag, timestamp)
+    if response is None:
+        response = json_response(await acached_report(name, etag, compute))
+    return set_validators(response, etag, timestamp)
+
+
+@async_api_view
+async def busy_employees(request):
+    """GET /async/tasks/busy-employees/ — асинхронный отчет busy-employees."""
+    return await report_response(request, "busy-employees", abusy_employees)
+
+
+@async_api_view
+async def important_tasks(request):
+    """GET /async/tasks/important-tasks/ — асинхронный отчет important-tasks."""
+    return await report_response(request, "important-tasks", aimportant_tasks)
+
+
+@async_api_view
+async def task_list(request):
+    """
+    GET /async/tasks/ — список задач с курсорной пагинацией, фильтрами
+    и выборочными полями.
+    """
+    queryset = filter_tasks(tasks_queryset(), request.GET, request.user)
+    ordering = task_ordering(request.GET)
+    fieldset = parse_fieldset(request.GET, TaskSerializer)
+    context = {"request": request, "fieldset": fieldset}
+    etag, timestamp = state_validators(
+        request.get_full_path(), await tasks_state(queryset)
+    )
+    response = not_modified_response(request, etag, timestamp)
+    if response is None:
+        if fieldset is None:
+            # Полный вывод — быстрый путь из строк values()
+            queryset = TaskRowSerializer.values(queryset)
+        else:
+            queryset = restrict_queryset(
+                queryset,
+                TaskSerializer(context=context),
+                [name.lstrip("-") for name in ordering],
+            )
+        paginator = TaskCursorPagination()
+        paginator.ordering = ordering
+        page = await sync_to_async(paginator.paginate_queryset)(
+            queryset, Request(request)
+        )
+        if fieldset is None:
+            data = TaskRowSerializer(page, context=context).data
+        else:
+            data = TaskSerializer(page, many=True, context=context).data
+        response = json_response(paginator.get_paginated_response(data).data)
+    return set_validators(response, etag, timestamp)
+
+
+@async_api_view
+async def task_detail(request, pk):
+    """GET /async/tasks/<id>/ — задача."""
+    state = await (
+        Task.objects.filter(pk=pk)
+        .values_list("updated_at", "creator__updated_at", "executor__updated_at")
+        .afirst()
+    )
+    if state is None:
+        raise exceptions.NotFound()
+
+    etag, timestamp = make_validators([request.get_full_path(), *state], latest(state))
+    response = not_modified_response(request, etag, timestamp)
+    if response is None:
+        try:
+            task = await tasks_queryset().aget(pk=pk)
+        except Task.DoesNotExist:
+            raise exceptions.NotFound()
+        response = json_response(
+            TaskSerializer(task, context={"request": request}).data
+        )
+    return set_validators(response, etag, timestamp)
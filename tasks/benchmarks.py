@@ -0,0 +1,235 @@
+"""
+Набор замеров производительности эндпоинтов API.
+
+Для каждого размера данных база заполняется seed_tracker, затем каждый
+эндпоинт вызывается несколько раз через тестовый клиент DRF. Для каждого
+фиксируются перцентили времени ответа и количество SQL-запросов.
+Результат — словарь, который сохраняется в JSON и сравнивается между
+коммитами (compare_results).
+
+benchmark_serializers — микро-замер сериализации страницы задач без базы
+и HTTP: TaskSerializer против быстрого пути tasks.fast_read.
+benchmark_json — то же для рендеринга и разбора JSON: JSONRenderer и
+JSONParser DRF против config.fast_json.
+"""
+
+import io
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from config.fast_json import FastJSONParser, FastJSONRenderer
+
+from users.models import CustomUser
+from .fast_read import TaskRowSerializer
+from .models import Task
+from .seeding import seed_tracker
+from .serializers import TaskSerializer
+
+
+def percentiles(samples):
+    """p50/p95/p99 и среднее в миллисекундах."""
+    ms = [sample * 1000 for sample in samples]
+    if len(ms) > 1:
+        cuts = statistics.quantiles(ms, n=100, method="inclusive")
+        p95, p99 = cuts[94], cuts[98]
+    else:
+        p95 = p99 = ms[0]
+    return {
+        "p50_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(p95, 3),
+        "p99_ms": round(p99, 3),
+        "mean_ms": round(statistics.fmean(ms), 3),
+    }
+
+
+def endpoint_requests(rng):
+    """
+    Замеряемые эндпоинты: имя и функция, выполняющая один запрос.
+    Задачи для детального просмотра выбираются случайно.
+    """
+    task_ids = list(Task.objects.values_list("pk", flat=True)[:10000])
+    executor_ids = list(CustomUser.objects.values_list("pk", flat=True)[:1000])
+    due_date = (date.today() + timedelta(days=7)).isoformat()
+
+    def create(client):
+        return client.post(
+            reverse("tasks-list"),
+            {
+                "title": "Новая задача",
+                "due_date": due_date,
+                "executor_id": rng.choice(executor_ids),
+            },
+            format="json",
+        )
+
+    return [
+        ("tasks-list", lambda client: client.get(reverse("tasks-list"))),
+        (
+            "tasks-detail",
+            lambda client: client.get(
+                reverse("tasks-detail", kwargs={"pk": rng.choice(task_ids)})
+            ),
+        ),
+        ("tasks-create", create),
+        (
+            "tasks-busy-employees",
+            lambda client: client.get(reverse("tasks-busy-employees")),
+        ),
+        (
+            "tasks-important-tasks",
+            lambda client: client.get(reverse("tasks-important-tasks")),
+        ),
+    ]
+
+
+def benchmark_endpoints(user, repeat, rng):
+    """Замеры всех эндпоинтов на текущих данных."""
+    client = APIClient()
+    client.force_authenticate(user=user)
+    results = {}
+    for name, request in endpoint_requests(rng):
+        timings, query_counts, status_codes = [], [], set()
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = request(client)
+                timings.append(time.perf_counter() - started)
+            query_counts.append(len(queries))
+            status_codes.add(response.status_code)
+        results[name] = {
+            **percentiles(timings),
+            "queries": max(query_counts),
+            "status_codes": sorted(status_codes),
+        }
+    return results
+
+
+def run_suite(sizes, users_per_task, depth, repeat, reset, seed=0, use_cache=False):
+    """
+    Замеры для каждого количества задач из sizes.
+    reset() очищает базу перед заполнением очередного размера.
+    Кэш отчетов по умолчанию отключен, чтобы замерять расчет, а не кэш.
+    """
+    results = {}
+    for size in sizes:
+        reset()
+        users = max(1, int(size * users_per_task))
+        seed_tracker(users=users, tasks=size, depth=depth, seed=seed)
+        user = CustomUser.objects.order_by("pk").first()
+        rng = random.Random(seed)
+        overrides = {} if use_cache else {"TASKS_REPORT_CACHE_TIMEOUT": 0}
+        with override_settings(**overrides):
+            results[str(size)] = {
+                "users": users,
+                "tasks": size,
+                "endpoints": benchmark_endpoints(user, repeat, rng),
+            }
+    return results
+
+
+def compare_results(baseline, current):
+    """
+    Строки сравнения двух прогонов: размер, эндпоинт, p50 до и после,
+    отношение и изменение количества запросов.
+    """
+    rows = []
+    for size, data in current.items():
+        base_size = baseline.get(size)
+        if not base_size:
+            continue
+        for name, stats in data["endpoints"].items():
+            base = base_size["endpoints"].get(name)
+            if not base:
+                continue
+            rows.append(
+                (
+                    size,
+                    name,
+                    base["p50_ms"],
+                    stats["p50_ms"],
+                    stats["p50_ms"] / base["p50_ms"] if base["p50_ms"] else None,
+                    stats["queries"] - base["queries"],
+                )
+            )
+    return rows
+
+
+def best_time(func, repeat):
+    """Лучшее время из repeat запусков func (секунды)."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def benchmark_serializers(limit=1000, repeat=5):
+    """
+    Строк в секунду у TaskSerializer (модели с select_related) и
+    TaskRowSerializer (строки values()) на первых limit задачах.
+    Загрузка из базы в замер не входит.
+    """
+    queryset = Task.objects.order_by("created_at", "id")
+    instances = list(queryset.select_related("creator", "executor")[:limit])
+    rows = list(TaskRowSerializer.values(queryset)[:limit])
+    results = {
+        "rows": len(rows),
+        "drf_rows_per_second": len(instances)
+        / best_time(lambda: TaskSerializer(instances, many=True).data, repeat),
+        "fast_rows_per_second": len(rows)
+        / best_time(lambda: TaskRowSerializer(rows).data, repeat),
+    }
+    results["speedup"] = (
+        results["fast_rows_per_second"] / results["drf_rows_per_second"]
+    )
+    return results
+
+
+def benchmark_json(limit=1000, repeat=5):
+    """
+    Рендеринг страницы TaskSerializer из limit задач (с next/previous,
+    как у списка) и разбор тела массового создания из тех же задач:
+    мегабайт в секунду стандартных классов DRF и config.fast_json.
+    """
+    tasks = Task.objects.select_related("creator", "executor").order_by(
+        "created_at", "id"
+    )[:limit]
+    page = {
+        "next": "http://testserver/api/tasks/?cursor=cD0yMDI2",
+        "previous": None,
+        "results": TaskSerializer(tasks, many=True).data,
+    }
+    body = JSONRenderer().render(
+        [
+            {key: item[key] for key in ("title", "description", "due_date", "status")}
+            for item in page["results"]
+        ]
+    )
+
+    standard, fast = JSONRenderer(), FastJSONRenderer()
+    content = standard.render(page)
+    results = {
+        "bytes": len(content),
+        "identical": fast.render(page) == content,
+    }
+    megabytes = len(content) / 1024 / 1024
+    results["render_mb_per_second"] = {
+        "drf": megabytes / best_time(lambda: standard.render(page), repeat),
+        "fast": megabytes / best_time(lambda: fast.render(page), repeat),
+    }
+    megabytes = len(body) / 1024 / 1024
+    results["parse_mb_per_second"] = {
+        name: megabytes / best_time(lambda: parser.parse(io.BytesIO(body)), repeat)
+        for name, parser in (("drf", JSONParser()), ("fast", FastJSONParser()))
+    }
+    return results
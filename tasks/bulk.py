@@ -0,0 +1,191 @@
+"""
+Массовое создание и изменение задач.
+
+Каждый элемент пакета валидируется отдельно, а ссылки на исполнителей
+и родительские задачи проверяются одним запросом IN на весь пакет.
+Запись выполняется через bulk_create/bulk_update в одной транзакции:
+если хотя бы один элемент невалиден, ничего не сохраняется, а ошибки
+возвращаются списком в порядке элементов запроса (как у many=True в DRF).
+Сигналы моделей при массовой записи не отправляются, поэтому счетчики
+и поколение кэша отчетов обновляются здесь явно.
+"""
+
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from users.models import CustomUser
+from .counters import active_counter_deltas, apply_active_counter_deltas
+from .models import Task
+from .report_cache import bump_generation
+from .serializers import TaskBulkSerializer, TaskBulkUpdateSerializer
+
+# Поля сериализатора, которые в модели хранятся как внешние ключи
+FOREIGN_KEY_FIELDS = {"executor_id": "executor", "parent_id": "parent"}
+
+
+def validate_batch(data, serializer_class, partial=False):
+    """
+    Валидирует пакет элементов без обращений к базе.
+    Возвращает список validated_data и список ошибок по элементам.
+    """
+    if not isinstance(data, list) or not data:
+        raise ValidationError(
+            {"non_field_errors": ["Ожидается непустой список задач."]}
+        )
+    if len(data) > settings.TASKS_BULK_MAX_ITEMS:
+        raise ValidationError(
+            {
+                "non_field_errors": [
+                    f"Не более {settings.TASKS_BULK_MAX_ITEMS} задач за запрос."
+                ]
+            }
+        )
+
+    validated, errors = [], []
+    for item in data:
+        serializer = serializer_class(data=item, partial=partial)
+        serializer.is_valid()
+        validated.append(serializer.validated_data if not serializer.errors else {})
+        errors.append(dict(serializer.errors))
+    return validated, errors
+
+
+def check_references(validated, errors):
+    """
+    Проверяет существование исполнителей и родительских задач
+    (по одному запросу IN). Возвращает найденных исполнителей по id.
+    """
+    executor_ids = {
+        item["executor_id"] for item in validated if item.get("executor_id") is not None
+    }
+    parent_ids = {
+        item["parent_id"] for item in validated if item.get("parent_id") is not None
+    }
+    executors = CustomUser.objects.in_bulk(executor_ids) if executor_ids else {}
+    parents = (
+        set(Task.objects.filter(pk__in=parent_ids).values_list("pk", flat=True))
+        if parent_ids
+        else set()
+    )
+
+    for item, item_errors in zip(validated, errors):
+        executor_id = item.get("executor_id")
+        if executor_id is not None and executor_id not in executors:
+            item_errors["executor_id"] = [f"Пользователь {executor_id} не найден."]
+        parent_id = item.get("parent_id")
+        if parent_id is not None:
+            if parent_id not in parents:
+                item_errors["parent"] = [f"Задача {parent_id} не найдена."]
+            elif parent_id == item.get("id"):
+                item_errors["parent"] = ["Задача не может быть родителем самой себя."]
+    return executors
+
+
+def raise_for_errors(errors):
+    """Отклоняет весь пакет, если хотя бы у одного элемента есть ошибки."""
+    if any(errors):
+        raise ValidationError(errors)
+
+
+def bulk_create_tasks(data, creator):
+    """
+    Создает пакет задач одним INSERT и обновляет счетчики активных задач.
+    Возвращает созданные задачи с подставленными создателем и исполнителем.
+    """
+    validated, errors = validate_batch(data, TaskBulkSerializer)
+    executors = check_references(validated, errors)
+    raise_for_errors(errors)
+
+    tasks = []
+    deltas = Counter()
+    for item in validated:
+        task = Task(**item, creator=creator)
+        if task.executor_id is not None:
+            task.executor = executors[task.executor_id]
+        tasks.append(task)
+        deltas.update(active_counter_deltas(None, (task.executor_id, task.status)))
+
+    with transaction.atomic():
+        Task.objects.bulk_create(tasks)
+        apply_active_counter_deltas(deltas)
+        bump_generation()
+    return tasks
+
+
+def bulk_update_tasks(data):
+    """
+    Частично обновляет пакет задач одним bulk_update.
+    Каждый элемент содержит id задачи и изменяемые поля.
+    """
+    validated, errors = validate_batch(data, TaskBulkUpdateSerializer, partial=True)
+    executors = check_references(validated, errors)
+
+    with transaction.atomic():
+        ids = {item["id"] for item in validated if "id" in item}
+        tasks = (
+            Task.objects.select_related("creator", "executor")
+            .select_for_update(of=("self",))
+            .in_bulk(ids)
+        )
+        for item, item_errors in zip(validated, errors):
+            if "id" in item and item["id"] not in tasks:
+                item_errors["id"] = [f"Задача {item['id']} не найдена."]
+        raise_for_errors(errors)
+
+        fields = {"updated_at"}
+        deltas = Counter()
+        now = timezone.now()
+        for item in validated:
+            task = tasks[item["id"]]
+            previous = (task.executor_id, task.status)
+            for name, value in item.items():
+                if name == "id":
+                    continue
+                setattr(task, name, value)
+                fields.add(FOREIGN_KEY_FIELDS.get(name, name))
+            if "executor_id" in item:
+                task.executor = executors.get(item["executor_id"])
+            task.updated_at = now
+            deltas.update(
+                active_counter_deltas(previous, (task.executor_id, task.status))
+            )
+
+        Task.objects.bulk_update(tasks.values(), sorted(fields))
+        apply_active_counter_deltas(deltas)
+        bump_generation()
+    return [tasks[item["id"]] for item in validated]
+
+
+def bulk_set_status(ids, status):
+    """
+    Переводит задачи в статус status одним UPDATE и обновляет счетчики.
+    Возвращает количество измененных задач.
+    """
+    with transaction.atomic():
+        previous = list(
+            Task.objects.select_for_update()
+            .filter(pk__in=ids)
+            .values_list("pk", "executor_id", "status")
+        )
+        missing = set(ids) - {pk for pk, _, _ in previous}
+        if missing:
+            raise ValidationError(
+                {"ids": [f"Задачи не найдены: {', '.join(map(str, sorted(missing)))}."]}
+            )
+
+        deltas = Counter()
+        for _, executor_id, old_status in previous:
+            deltas.update(
+                active_counter_deltas((executor_id, old_status), (executor_id, status))
+            )
+
+        updated = Task.objects.filter(pk__in=ids).update(
+            status=status, updated_at=timezone.now()
+        )
+        apply_active_counter_deltas(deltas)
+        bump_generation()
+    return updated
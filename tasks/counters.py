@@ -0,0 +1,89 @@
+"""
+Поддержка денормализованного счетчика CustomUser.active_tasks_count.
+
+Счетчик меняется атомарными UPDATE ... SET active_tasks_count = active_tasks_count ± n
+при создании, удалении, переназначении задачи и при смене статуса между
+активными и DONE. Массовые операции (bulk_create/bulk_update, QuerySet.update)
+должны сами передавать изменения в apply_active_counter_deltas.
+"""
+
+from collections import Counter, defaultdict
+
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from users.models import CustomUser
+from .models import Task
+from .report_cache import bump_generation
+
+
+def active_counter_deltas(previous, current):
+    """
+    Изменения счетчиков при переходе задачи из состояния previous в current.
+    Состояние — пара (executor_id, status) или None, если задачи нет.
+    """
+    deltas = Counter()
+    for state, sign in ((previous, -1), (current, 1)):
+        if state is None:
+            continue
+        executor_id, status = state
+        if executor_id is not None and status in Task.ACTIVE_STATUSES:
+            deltas[executor_id] += sign
+    return {user_id: delta for user_id, delta in deltas.items() if delta}
+
+
+def apply_active_counter_deltas(deltas, using=None):
+    """
+    Применяет изменения счетчиков атомарными F()-выражениями.
+    Сотрудники с одинаковым изменением обновляются одним запросом.
+    """
+    ids_by_delta = defaultdict(list)
+    for user_id, delta in deltas.items():
+        if delta:
+            ids_by_delta[delta].append(user_id)
+
+    users = CustomUser.objects.db_manager(using)
+    for delta, user_ids in ids_by_delta.items():
+        users.filter(pk__in=user_ids).update(
+            active_tasks_count=F("active_tasks_count") + delta
+        )
+
+
+def actual_active_tasks_subquery():
+    """Подзапрос с фактическим количеством активных задач сотрудника."""
+    return Coalesce(
+        Subquery(
+            Task.objects.filter(
+                executor=OuterRef("pk"), status__in=Task.ACTIVE_STATUSES
+            )
+            .order_by()
+            .values("executor")
+            .annotate(total=Count("pk"))
+            .values("total"),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def rebuild_active_tasks_counts():
+    """Пересчитывает счетчики всех сотрудников одним UPDATE. Возвращает число строк."""
+    updated = CustomUser.objects.update(
+        active_tasks_count=actual_active_tasks_subquery()
+    )
+    bump_generation()
+    return updated
+
+
+def find_active_counter_mismatches():
+    """Список (id, email, сохраненное значение, фактическое значение) с расхождениями."""
+    return list(
+        CustomUser.objects.annotate(
+            actual_count=Count(
+                "tasks", filter=Q(tasks__status__in=Task.ACTIVE_STATUSES)
+            )
+        )
+        .exclude(active_tasks_count=F("actual_count"))
+        .order_by("pk")
+        .values_list("pk", "email", "active_tasks_count", "actual_count")
+    )
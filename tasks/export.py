@@ -0,0 +1,88 @@
+"""
+Потоковая выгрузка задач в CSV и NDJSON.
+
+Строки читаются через QuerySet.iterator(chunk_size=...) — на PostgreSQL это
+серверный курсор — из values() с именами исполнителя и создателя,
+подтянутыми JOIN-ом, и сразу отдаются клиенту через StreamingHttpResponse.
+Память воркера не зависит от количества задач.
+"""
+
+import csv
+import json
+from abc import ABCMeta, abstractmethod
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+EXPORT_FIELDS = [
+    "id",
+    "title",
+    "description",
+    "status",
+    "due_date",
+    "parent_id",
+    "executor_id",
+    "executor__full_name",
+    "executor__email",
+    "creator_id",
+    "creator__full_name",
+    "created_at",
+    "updated_at",
+]
+
+
+def export_rows(queryset):
+    """Строки выгрузки (словари) из queryset-а задач без создания моделей."""
+    return (
+        queryset.order_by("created_at", "id")
+        .values(*EXPORT_FIELDS)
+        .iterator(chunk_size=settings.TASKS_EXPORT_CHUNK_SIZE)
+    )
+
+
+class _Echo:
+    """Псевдофайл для csv.writer: возвращает записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+class ExportRenderer(BaseRenderer, metaclass=ABCMeta):
+    """
+    Рендерер формата выгрузки. Сами строки отдаются потоком через stream(),
+    а render() используется только для ответов с ошибками — они в JSON
+    и с Content-Type application/json, а не форматом выгрузки.
+    """
+
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = (renderer_context or {}).get("response")
+        if response is not None:
+            response["Content-Type"] = JSONRenderer.media_type
+        return JSONRenderer().render(data)
+
+    @abstractmethod
+    def stream(self, rows):
+        """Фрагменты ответа (строки) для строк выгрузки rows."""
+
+
+class CSVExportRenderer(ExportRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+    def stream(self, rows):
+        writer = csv.writer(_Echo())
+        yield writer.writerow(EXPORT_FIELDS)
+        for row in rows:
+            yield writer.writerow([row[field] for field in EXPORT_FIELDS])
+
+
+class NDJSONExportRenderer(ExportRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def stream(self, rows):
+        for row in rows:
+            yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
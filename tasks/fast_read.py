@@ -0,0 +1,179 @@
+"""
+Быстрая сериализация задач для чтения: список и отчет busy-employees.
+
+TaskSerializer для каждого поля каждой задачи вызывает get_attribute
+и to_representation, а создателя и исполнителя сериализует вложенными
+UserShortSerializer. Здесь задачи читаются через values() без создания
+моделей, а ответ строится по плану, который один раз составляется
+из полей TaskSerializer: для каждого поля заранее известны столбец строки
+и функция преобразования значения. Данные пользователя собираются один раз
+на id в пределах сериализатора (запроса).
+
+Вывод совпадает с TaskSerializer байт в байт (тест FastReadTests). План
+строится по полям TaskSerializer, поэтому меняется вместе с ним; поле,
+которое нельзя прочитать из столбца (например, SerializerMethodField),
+вызывает ImproperlyConfigured.
+"""
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from .serializers import TaskSerializer, UserShortSerializer
+
+
+def iso_format(value):
+    return value.isoformat()
+
+
+def file_url(storage, request):
+    """Преобразование имени файла в URL, как у FileField(use_url=True)."""
+
+    def convert(name):
+        if not name:
+            return None
+        url = storage.url(name)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+    return convert
+
+
+def value_converter(field, model_field, request):
+    """
+    Функция, которая превращает значение столбца в то же значение,
+    что field.to_representation для атрибута модели, или None, если
+    значение не нужно преобразовывать. Значение None столбца выводится
+    как есть, как в Serializer.to_representation.
+    """
+    if isinstance(
+        field,
+        (
+            serializers.IntegerField,
+            serializers.CharField,
+            serializers.ChoiceField,
+            serializers.PrimaryKeyRelatedField,
+        ),
+    ):
+        # Значения столбцов уже нужного типа (для связи — id): без преобразования
+        return None
+    if isinstance(field, serializers.DateTimeField):
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        if not settings.USE_TZ and output_format and output_format.lower() == ISO_8601:
+            # Без часовых поясов enforce_timezone возвращает значение как есть
+            return iso_format
+        return field.to_representation
+    if isinstance(field, serializers.DateField):
+        output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+        if output_format and output_format.lower() == ISO_8601:
+            return iso_format
+        return field.to_representation
+    if isinstance(field, serializers.FileField):
+        if getattr(field, "use_url", api_settings.UPLOADED_FILES_USE_URL):
+            return file_url(model_field.storage, request)
+        return None
+    return field.to_representation
+
+
+def compile_plan(serializer, prefix, request):
+    """
+    План сериализации в порядке полей: [(ключ, столбец values(),
+    преобразование или None, None), ...]; для вложенного сериализатора —
+    (ключ, столбец id, класс сериализатора, вложенный план).
+    """
+    model = serializer.Meta.model
+    plan = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if field.source == "*" or "." in field.source:
+            raise ImproperlyConfigured(
+                f"Поле {name} нельзя прочитать из столбца: быстрый путь не поддерживает"
+            )
+        model_field = model._meta.get_field(field.source)
+        if isinstance(field, serializers.BaseSerializer):
+            nested_prefix = f"{prefix}{field.source}__"
+            nested = compile_plan(field, nested_prefix, request)
+            column = f"{nested_prefix}{field.Meta.model._meta.pk.name}"
+            plan.append((name, column, type(field), nested))
+            continue
+        column = prefix + (
+            model_field.attname if model_field.is_relation else field.source
+        )
+        plan.append((name, column, value_converter(field, model_field, request), None))
+    return plan
+
+
+def plan_columns(plan):
+    """Столбцы values(), нужные плану."""
+    columns = []
+    for _name, column, _convert, nested in plan:
+        if nested is None:
+            columns.append(column)
+        else:
+            columns.extend(plan_columns(nested))
+    return columns
+
+
+class RowSerializer:
+    """
+    Сериализатор строк values() с выводом serializer_class.
+    Использование как у DRF: RowSerializer(rows, context=...).data
+    или to_representation(row) для одной строки.
+    """
+
+    serializer_class = None
+
+    def __init__(self, rows=None, context=None):
+        self.rows = rows
+        self.context = context or {}
+        self.plan = compile_plan(
+            self.serializer_class(), "", self.context.get("request")
+        )
+        self._related = {}
+
+    @classmethod
+    def columns(cls):
+        """Столбцы values(), из которых строится вывод."""
+        return plan_columns(compile_plan(cls.serializer_class(), "", None))
+
+    @classmethod
+    def values(cls, queryset, *extra_columns):
+        """Строки queryset-а для сериализатора (без создания моделей)."""
+        return queryset.values(*cls.columns(), *extra_columns)
+
+    def related(self, key, pk, row, plan):
+        """Вложенный объект (пользователь) — один раз на id."""
+        data = self._related.get((key, pk))
+        if data is None:
+            data = self._related[(key, pk)] = self.build(row, plan)
+        return data
+
+    def build(self, row, plan):
+        data = {}
+        for name, column, convert, nested in plan:
+            value = row[column]
+            if value is None or convert is None:
+                data[name] = value
+            elif nested is None:
+                data[name] = convert(value)
+            else:
+                data[name] = self.related(convert, value, row, nested)
+        return data
+
+    def to_representation(self, row):
+        return self.build(row, self.plan)
+
+    @property
+    def data(self):
+        return [self.build(row, self.plan) for row in self.rows]
+
+
+class TaskRowSerializer(RowSerializer):
+    serializer_class = TaskSerializer
+
+
+class UserShortRowSerializer(RowSerializer):
+    serializer_class = UserShortSerializer
@@ -0,0 +1,171 @@
+"""
+Фильтры и сортировка списка задач (GET /tasks/?status=new&executor=5).
+
+Каждый параметр превращается в условие, которое покрывается индексом
+tasks_task (см. Task.Meta.indexes), поэтому отфильтрованная страница
+читает только подходящие строки:
+
+- status — один или несколько статусов (?status=new&status=done
+  или ?status=new,done): индекс (status, due_date)
+- executor — id исполнителя: индекс (executor, created_at)
+- unassigned=true — задачи без исполнителя: частичный индекс task_unassigned_idx
+- parent — id родительской задачи: индекс (parent, status)
+- due_before / due_after — срок не позже / не раньше даты (YYYY-MM-DD):
+  индекс (due_date, id)
+- overdue=true — активные задачи с прошедшим сроком: индекс (status, due_date)
+- created_by_me=true — задачи, созданные текущим пользователем: индекс creator_id
+- ordering — сортировка из ORDERINGS; id добавляется для однозначного порядка
+  и входит в позицию курсора (TaskCursorPagination), для каждой сортировки
+  есть индекс (поле, id)
+
+Те же фильтры применяются к выгрузке и к асинхронному списку.
+"""
+
+from datetime import date
+
+from django.db.models import Q
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Task
+from .pagination import TaskCursorPagination
+
+# Допустимые значения ?ordering= и соответствующие order_by; последний ключ —
+# всегда id, иначе позиция курсора неуникальна
+ORDERINGS = {
+    "created_at": ("created_at", "id"),
+    "-created_at": ("-created_at", "-id"),
+    "due_date": ("due_date", "id"),
+    "-due_date": ("-due_date", "-id"),
+    "updated_at": ("updated_at", "id"),
+    "-updated_at": ("-updated_at", "-id"),
+}
+
+TRUE_VALUES = {"1", "true", "yes"}
+FALSE_VALUES = {"0", "false", "no"}
+
+
+def parse_bool(params, name):
+    """true/false из параметра name или None, если он не передан."""
+    value = params.get(name)
+    if value is None or value == "":
+        return None
+    value = value.lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValidationError({name: "Должно быть true или false."})
+
+
+def parse_id(params, name):
+    value = params.get(name)
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: "Должно быть целым числом."})
+
+
+def parse_day(params, name):
+    value = params.get(name)
+    if value is None or value == "":
+        return None
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise ValidationError({name: "Дата в формате YYYY-MM-DD."})
+    return day
+
+
+def parse_statuses(params):
+    """Статусы из повторяющегося или перечисленного через запятую ?status=."""
+    statuses = {
+        value.strip()
+        for param in params.getlist("status")
+        for value in param.split(",")
+        if value.strip()
+    }
+    unknown = statuses - set(Task.Status.values)
+    if unknown:
+        raise ValidationError(
+            {"status": f"Неизвестный статус: {', '.join(sorted(unknown))}."}
+        )
+    return sorted(statuses)
+
+
+def filter_tasks(queryset, params, user):
+    """
+    Применяет фильтры списка задач из параметров запроса params (QueryDict).
+    Неверные значения — ValidationError (400).
+    """
+    statuses = parse_statuses(params)
+    if statuses:
+        queryset = queryset.filter(status__in=statuses)
+
+    executor_id = parse_id(params, "executor")
+    if executor_id is not None:
+        queryset = queryset.filter(executor_id=executor_id)
+
+    unassigned = parse_bool(params, "unassigned")
+    if unassigned is not None:
+        queryset = queryset.filter(executor__isnull=unassigned)
+
+    parent_id = parse_id(params, "parent")
+    if parent_id is not None:
+        queryset = queryset.filter(parent_id=parent_id)
+
+    due_before = parse_day(params, "due_before")
+    if due_before is not None:
+        queryset = queryset.filter(due_date__lte=due_before)
+
+    due_after = parse_day(params, "due_after")
+    if due_after is not None:
+        queryset = queryset.filter(due_date__gte=due_after)
+
+    overdue = parse_bool(params, "overdue")
+    if overdue is not None:
+        condition = Q(status__in=Task.ACTIVE_STATUSES, due_date__lt=date.today())
+        queryset = queryset.filter(condition if overdue else ~condition)
+
+    created_by_me = parse_bool(params, "created_by_me")
+    if created_by_me is not None:
+        if created_by_me:
+            queryset = queryset.filter(creator_id=user.pk)
+        else:
+            queryset = queryset.exclude(creator_id=user.pk)
+
+    return queryset
+
+
+def task_ordering(params):
+    """
+    order_by из ?ordering= (только значения ORDERINGS),
+    по умолчанию — порядок курсорной пагинации.
+    """
+    value = params.get("ordering")
+    if not value:
+        return TaskCursorPagination.ordering
+    if value not in ORDERINGS:
+        raise ValidationError(
+            {"ordering": f"Допустимые значения: {', '.join(ORDERINGS)}."}
+        )
+    return ORDERINGS[value]
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    Фильтр-бэкенд TaskViewSet. get_ordering использует курсорная
+    пагинация: страницы строятся по выбранной сортировке.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        queryset = filter_tasks(queryset, request.query_params, request.user)
+        return queryset.order_by(*self.get_ordering(request, queryset, view))
+
+    def get_ordering(self, request, queryset, view):
+        return task_ordering(request.query_params)
@@ -0,0 +1,126 @@
+"""
+Расчет отчета "Важные задачи".
+
+Все данные загружаются несколькими массовыми запросами, а кандидаты
+в исполнители для каждой задачи вычисляются в памяти через словари
+и множества. Количество SQL-запросов не зависит от числа задач.
+"""
+
+from collections import defaultdict
+
+from django.db.models import Exists, OuterRef
+
+from users.models import CustomUser
+from .models import Task
+
+# Статусы подзадач, при которых родительская задача считается важной
+BLOCKING_SUBTASK_STATUSES = [Task.Status.IN_PROGRESS, Task.Status.DONE]
+
+# Насколько исполнитель родительской задачи может быть загружен сильнее
+# наименее загруженного сотрудника, чтобы его все еще предлагали
+PARENT_EXECUTOR_LOAD_MARGIN = 2
+
+
+def candidate_tasks_queryset():
+    """Задачи без исполнителя, у которых есть подзадачи в работе или завершенные."""
+    return Task.objects.filter(
+        Exists(
+            Task.objects.filter(
+                parent=OuterRef("pk"), status__in=BLOCKING_SUBTASK_STATUSES
+            )
+        ),
+        executor__isnull=True,
+    )
+
+
+def candidates_queryset():
+    """Кандидаты вместе с исполнителем родительской задачи."""
+    return candidate_tasks_queryset().values(
+        "id", "title", "due_date", "parent__executor_id"
+    )
+
+
+def subtask_executors_queryset():
+    """Пары (задача-кандидат, исполнитель ее подзадачи)."""
+    return (
+        Task.objects.filter(
+            parent__in=candidate_tasks_queryset().values("pk"),
+            executor__isnull=False,
+        )
+        .order_by()
+        .values_list("parent_id", "executor_id")
+        .distinct()
+    )
+
+
+def employee_load_queryset():
+    """Тройки (id, ФИО, количество активных задач) для всех сотрудников."""
+    return CustomUser.objects.order_by().values_list(
+        "id", "full_name", "active_tasks_count"
+    )
+
+
+def load_candidates():
+    """Загружает кандидатов одним запросом."""
+    return list(candidates_queryset())
+
+
+def load_subtask_executors():
+    """Загружает исполнителей подзадач кандидатов одним запросом."""
+    return list(subtask_executors_queryset())
+
+
+def load_employee_load():
+    """Загружает загрузку всех сотрудников одним запросом."""
+    return list(employee_load_queryset())
+
+
+def compute_important_tasks(candidates, subtask_executors, employee_load):
+    """
+    Вычисляет список важных задач с доступными исполнителями.
+    Не обращается к базе данных: работает только с переданными данными.
+    """
+    names = {}
+    loads = {}
+    for user_id, full_name, active_tasks_count in employee_load:
+        names[user_id] = full_name
+        loads[user_id] = active_tasks_count
+
+    # Наименее загруженные сотрудники одинаковы для всех задач
+    min_load = min(loads.values(), default=0)
+    least_loaded = {
+        names[user_id] for user_id, load in loads.items() if load == min_load
+    }
+
+    executors_by_task = defaultdict(set)
+    for task_id, executor_id in subtask_executors:
+        if executor_id in names:
+            executors_by_task[task_id].add(names[executor_id])
+
+    result = []
+    for task in candidates:
+        available_employees = least_loaded | executors_by_task[task["id"]]
+
+        # Сотрудник, выполняющий родительскую задачу
+        parent_executor_id = task["parent__executor_id"]
+        if (
+            parent_executor_id in loads
+            and loads[parent_executor_id] <= min_load + PARENT_EXECUTOR_LOAD_MARGIN
+        ):
+            available_employees.add(names[parent_executor_id])
+
+        result.append(
+            {
+                "task": task["title"],
+                "due_date": task["due_date"],
+                "available_employees": sorted(available_employees),
+            }
+        )
+    return result
+
+
+def get_important_tasks():
+    """Формирует отчет "Важные задачи" за три SQL-запроса."""
+    return compute_important_tasks(
+        load_candidates(), load_subtask_executors(), load_employee_load()
+    )
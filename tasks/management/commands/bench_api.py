@@ -0,0 +1,128 @@
+import json
+import platform
+import subprocess
+from datetime import datetime
+
+import django
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from tasks.benchmarks import compare_results, run_suite
+
+
+class Command(BaseCommand):
+    """
+    Замеры эндпоинтов API на нескольких размерах данных.
+    Работает на отдельной тестовой базе (test_<имя базы>), рабочие данные
+    не затрагиваются. Результат сохраняется в JSON; --compare печатает
+    сравнение с предыдущим прогоном.
+
+    python manage.py bench_api --sizes 1000,10000,100000 --output bench.json
+    python manage.py bench_api --sizes 1000,10000 --compare bench.json
+    """
+
+    help = "Замеры задержек и количества запросов эндпоинтов API"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="1000,10000",
+            help="Количества задач через запятую",
+        )
+        parser.add_argument(
+            "--users-per-task",
+            type=float,
+            default=0.01,
+            help="Сотрудников на одну задачу",
+        )
+        parser.add_argument("--depth", type=int, default=4)
+        parser.add_argument("--repeat", type=int, default=30)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--use-cache",
+            action="store_true",
+            help="Не отключать кэш отчетов",
+        )
+        parser.add_argument("--output", default="bench.json")
+        parser.add_argument("--compare", help="JSON предыдущего прогона")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options["sizes"].split(",")]
+        except ValueError:
+            raise CommandError("--sizes: ожидаются целые числа через запятую")
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = run_suite(
+                sizes,
+                users_per_task=options["users_per_task"],
+                depth=options["depth"],
+                repeat=options["repeat"],
+                reset=lambda: call_command("flush", interactive=False, verbosity=0),
+                seed=options["seed"],
+                use_cache=options["use_cache"],
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {"meta": self.get_meta(options), "results": results}
+        with open(options["output"], "w", encoding="utf-8") as output:
+            json.dump(report, output, ensure_ascii=False, indent=2)
+        self.print_results(results)
+        self.stdout.write(self.style.SUCCESS(f"Результаты: {options['output']}"))
+
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as baseline:
+                self.print_comparison(json.load(baseline)["results"], results)
+
+    def get_meta(self, options):
+        try:
+            commit = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            "commit": commit,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "repeat": options["repeat"],
+            "depth": options["depth"],
+            "use_cache": options["use_cache"],
+        }
+
+    def print_results(self, results):
+        self.stdout.write(
+            f"{'задач':>8} {'эндпоинт':<24} {'p50':>9} {'p95':>9} {'p99':>9} "
+            f"{'запросов':>8}"
+        )
+        for size, data in results.items():
+            for name, stats in data["endpoints"].items():
+                self.stdout.write(
+                    f"{size:>8} {name:<24} {stats['p50_ms']:>9.2f} "
+                    f"{stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} "
+                    f"{stats['queries']:>8}"
+                )
+
+    def print_comparison(self, baseline, results):
+        self.stdout.write(
+            self.style.MIGRATE_HEADING("Сравнение p50 с базовым прогоном")
+        )
+        for size, name, before, after, ratio, queries in compare_results(
+            baseline, results
+        ):
+            ratio_text = f"x{ratio:.2f}" if ratio is not None else "-"
+            self.stdout.write(
+                f"{size:>8} {name:<24} {before:>9.2f} -> {after:>9.2f} "
+                f"{ratio_text:>7} запросов {queries:+d}"
+            )
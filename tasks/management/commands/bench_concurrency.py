@@ -0,0 +1,85 @@
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.models import CustomUser
+
+DEFAULT_PATHS = [
+    "/api/tasks/busy-employees/",
+    "/api/async/tasks/busy-employees/",
+    "/api/tasks/important-tasks/",
+    "/api/async/tasks/important-tasks/",
+]
+
+
+class Command(BaseCommand):
+    """
+    Сравнение синхронных и асинхронных эндпоинтов под одновременной нагрузкой.
+    Запускается против работающего сервера; чтобы измерять расчет отчетов,
+    а не кэш, запустите сервер с TASKS_REPORT_CACHE_TIMEOUT=0.
+
+    SERVER_MODE=wsgi gunicorn -c config/gunicorn.conf.py
+    python manage.py bench_concurrency --email admin@example.com
+    SERVER_MODE=asgi gunicorn -c config/gunicorn.conf.py
+    python manage.py bench_concurrency --email admin@example.com
+    """
+
+    help = "Нагрузочное сравнение синхронных и async-эндпоинтов задач"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument(
+            "--email", required=True, help="Пользователь, от имени которого запросы"
+        )
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--path", action="append", dest="paths")
+
+    def handle(self, *args, **options):
+        try:
+            user = CustomUser.objects.get(email=options["email"])
+        except CustomUser.DoesNotExist:
+            raise CommandError(f"Пользователь {options['email']} не найден")
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+        self.stdout.write(
+            f"{'path':<40} {'rps':>8} {'p50, мс':>9} {'p95, мс':>9} {'ошибок':>7}"
+        )
+        for path in options["paths"] or DEFAULT_PATHS:
+            url = options["base_url"].rstrip("/") + path
+            rps, latencies, errors = self.run(
+                url, headers, options["concurrency"], options["requests"]
+            )
+            p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else 0
+            self.stdout.write(
+                f"{path:<40} {rps:>8.1f} {statistics.median(latencies) * 1000:>9.1f} "
+                f"{p95 * 1000:>9.1f} {errors:>7}"
+            )
+
+    def run(self, url, headers, concurrency, total):
+        """Отправляет total запросов в concurrency потоков."""
+
+        def request(_):
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(
+                    urllib.request.Request(url, headers=headers), timeout=60
+                ) as response:
+                    response.read()
+                ok = True
+            except OSError:
+                ok = False
+            return time.perf_counter() - started, ok
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(request, range(total)))
+        elapsed = time.perf_counter() - started
+
+        latencies = [latency for latency, _ in results]
+        errors = sum(1 for _, ok in results if not ok)
+        return total / elapsed, latencies, errors
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from tasks.benchmarks import benchmark_json, benchmark_serializers
+from tasks.seeding import seed_tracker
+
+
+class Command(BaseCommand):
+    """
+    Микро-замеры сериализации задач: TaskSerializer против быстрого пути
+    (tasks.fast_read) и JSON DRF против config.fast_json на той же странице.
+    Данные создаются в отдельной тестовой базе.
+
+    python manage.py bench_serialization --tasks 1000
+    """
+
+    help = "Скорость сериализации и JSON-рендеринга страницы задач"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=1000)
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            seed_tracker(
+                users=options["users"],
+                tasks=options["tasks"],
+                depth=4,
+                seed=options["seed"],
+            )
+            results = benchmark_serializers(options["tasks"], options["repeat"])
+            json_results = benchmark_json(options["tasks"], options["repeat"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"Задач: {results['rows']}")
+        self.stdout.write(
+            f"TaskSerializer:    {results['drf_rows_per_second']:>12,.0f} строк/с"
+        )
+        self.stdout.write(
+            f"TaskRowSerializer: {results['fast_rows_per_second']:>12,.0f} строк/с"
+        )
+        self.stdout.write(self.style.SUCCESS(f"Ускорение: x{results['speedup']:.1f}"))
+        self.print_json(json_results)
+
+    def print_json(self, results):
+        self.stdout.write(
+            f"JSON страницы: {results['bytes']:,} байт, "
+            f"вывод совпадает: {'да' if results['identical'] else 'НЕТ'}"
+        )
+        for title, key in (("рендеринг", "render"), ("разбор", "parse")):
+            speed = results[f"{key}_mb_per_second"]
+            self.stdout.write(
+                f"{title:<10} DRF {speed['drf']:>8.1f} МБ/с, "
+                f"fast_json {speed['fast']:>8.1f} МБ/с, "
+                f"x{speed['fast'] / speed['drf']:.1f}"
+            )
@@ -0,0 +1,97 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.http import QueryDict
+
+from tasks import important_tasks, search, services
+from tasks.filters import filter_tasks
+from tasks.models import Task
+from tasks.pagination import TaskCursorPagination
+
+
+class Command(BaseCommand):
+    """
+    Выводит планы выполнения основных запросов каждого эндпоинта задач.
+    Запускать на заполненной базе: на пустых таблицах планировщик
+    PostgreSQL выбирает последовательное сканирование независимо от индексов.
+
+    python manage.py explain_queries
+    """
+
+    help = "Печатает EXPLAIN ANALYZE для основных запросов эндпоинтов задач"
+
+    def get_queries(self):
+        """Пары (название, queryset) в порядке вывода."""
+        page_size = TaskCursorPagination.page_size
+        tasks = Task.objects.select_related("creator", "executor")
+        middle_task = tasks.order_by("created_at", "id")[Task.objects.count() // 2]
+        return [
+            (
+                "tasks-list: первая страница",
+                tasks.order_by("created_at", "id")[: page_size + 1],
+            ),
+            (
+                "tasks-list: страница по курсору",
+                tasks.filter(created_at__gt=middle_task.created_at).order_by(
+                    "created_at", "id"
+                )[: page_size + 1],
+            ),
+            (
+                "tasks-list: ?executor=&status=new,in_progress",
+                filter_tasks(
+                    tasks,
+                    QueryDict(
+                        f"executor={middle_task.executor_id or ''}"
+                        "&status=new,in_progress"
+                    ),
+                    middle_task.creator,
+                ).order_by("created_at", "id")[: page_size + 1],
+            ),
+            (
+                "tasks-list: ?overdue=true",
+                filter_tasks(tasks, QueryDict("overdue=true"), None).order_by(
+                    "created_at", "id"
+                )[: page_size + 1],
+            ),
+            (
+                "tasks-detail",
+                tasks.filter(pk=middle_task.pk),
+            ),
+            ("busy-employees: сотрудники", services.busy_employees_queryset()),
+            (
+                "busy-employees: активные задачи",
+                services.assigned_active_tasks_queryset(),
+            ),
+            ("important-tasks: кандидаты", important_tasks.candidates_queryset()),
+            (
+                "important-tasks: исполнители подзадач",
+                important_tasks.subtask_executors_queryset(),
+            ),
+            (
+                "important-tasks: загрузка сотрудников",
+                important_tasks.employee_load_queryset(),
+            ),
+            ("tasks-search", search.search_tasks("отчет", page_size)),
+        ]
+
+    def handle(self, *args, **options):
+        if not Task.objects.exists():
+            raise CommandError("В базе нет задач: сначала заполните ее данными")
+
+        analyze = connection.vendor == "postgresql"
+        if not analyze:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"База {connection.vendor}: выводится EXPLAIN без ANALYZE"
+                )
+            )
+
+        for title, queryset in self.get_queries():
+            self.stdout.write(self.style.MIGRATE_HEADING(title))
+            self.stdout.write(str(queryset.query))
+            plan = queryset.explain(analyze=True) if analyze else queryset.explain()
+            self.stdout.write(plan)
+            if "Seq Scan on tasks_task" in plan:
+                self.stdout.write(
+                    self.style.WARNING("Последовательное сканирование tasks_task")
+                )
+            self.stdout.write("")
@@ -0,0 +1,52 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections
+
+from tasks.workload import refresh_workload_snapshot
+
+
+class Command(BaseCommand):
+    """
+    Обновление снимка загрузки сотрудников (tasks.workload).
+    Без --once работает постоянно и обновляет снимок каждые --interval секунд;
+    ошибка базы пишется в stderr, следующая попытка — через интервал.
+
+    python manage.py refresh_workload              # каждые WORKLOAD_REFRESH_INTERVAL
+    python manage.py refresh_workload --once       # один раз (cron)
+    """
+
+    help = "Обновляет снимок загрузки сотрудников для GET /api/reports/workload/"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=settings.WORKLOAD_REFRESH_INTERVAL,
+            help="Период обновления, секунды",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Обновить один раз и завершиться",
+        )
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            self.refresh()
+            return
+        while True:
+            close_old_connections()
+            try:
+                self.refresh()
+            except DatabaseError as exc:
+                self.stderr.write(f"Снимок не обновлен: {exc}")
+            time.sleep(options["interval"])
+
+    def refresh(self):
+        refresh = refresh_workload_snapshot()
+        self.stdout.write(
+            f"Снимок загрузки обновлен за {refresh.duration * 1000:.1f} мс "
+            f"({refresh.refreshed_at:%Y-%m-%d %H:%M:%S})"
+        )
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.seeding import seed_tracker
+
+
+class Command(BaseCommand):
+    """
+    Заполнение базы сгенерированными сотрудниками и иерархиями задач.
+
+    python manage.py seed_tracker --users 2000 --tasks 200000 --depth 4
+    """
+
+    help = "Генерирует сотрудников и задачи для нагрузочных проверок"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--tasks", type=int, default=10000)
+        parser.add_argument(
+            "--depth", type=int, default=4, help="Глубина иерархии задач"
+        )
+        parser.add_argument(
+            "--seed", type=int, default=None, help="Зерно генератора случайных чисел"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            users, tasks = seed_tracker(
+                users=options["users"],
+                tasks=options["tasks"],
+                depth=options["depth"],
+                seed=options["seed"],
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        self.stdout.write(
+            self.style.SUCCESS(f"Создано сотрудников: {users}, задач: {tasks}")
+        )
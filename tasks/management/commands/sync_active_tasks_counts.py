@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.counters import find_active_counter_mismatches, rebuild_active_tasks_counts
+
+
+class Command(BaseCommand):
+    """
+    Пересчет и проверка денормализованного счетчика активных задач сотрудников.
+
+    python manage.py sync_active_tasks_counts          # пересчитать и проверить
+    python manage.py sync_active_tasks_counts --check  # только проверить
+    """
+
+    help = "Пересчитывает и проверяет CustomUser.active_tasks_count"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Только проверить счетчики, ничего не изменяя",
+        )
+
+    def handle(self, *args, **options):
+        if not options["check"]:
+            updated = rebuild_active_tasks_counts()
+            self.stdout.write(f"Пересчитано сотрудников: {updated}")
+
+        mismatches = find_active_counter_mismatches()
+        for user_id, email, stored, actual in mismatches:
+            self.stderr.write(
+                f"{email} (id={user_id}): сохранено {stored}, фактически {actual}"
+            )
+        if mismatches:
+            raise CommandError(f"Расхождений в счетчиках: {len(mismatches)}")
+        self.stdout.write(self.style.SUCCESS("Счетчики активных задач совпадают"))
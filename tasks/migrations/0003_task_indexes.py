@@ -0,0 +1,57 @@
+# Generated by Django 5.2.4 on 2026-10-17 19:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0002_alter_task_options_task_creator"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["executor", "status"], name="task_executor_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["parent", "status"], name="task_parent_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["status", "due_date"], name="task_status_due_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["created_at", "id"], name="task_created_at_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(
+                    ("executor__isnull", False), ("status__in", ["new", "in_progress"])
+                ),
+                fields=["created_at"],
+                name="task_active_assigned_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("executor__isnull", True)),
+                fields=["created_at"],
+                name="task_unassigned_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-17 20:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0003_task_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["updated_at"], name="task_updated_at_idx"),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+INDEX_NAME = "task_search_vector_idx"
+
+
+def search_index():
+    # Выражение должно совпадать с tasks.search.SEARCH_VECTOR,
+    # иначе PostgreSQL не использует индекс при поиске
+    return GinIndex(
+        SearchVector("title", weight="A", config="russian")
+        + SearchVector("description", weight="B", config="russian"),
+        name=INDEX_NAME,
+    )
+
+
+def add_search_index(apps, schema_editor):
+    # GIN-индекс tsvector есть только в PostgreSQL
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.add_index(apps.get_model("tasks", "Task"), search_index())
+
+
+def remove_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.remove_index(apps.get_model("tasks", "Task"), search_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0004_task_updated_at_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_index, remove_search_index),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-17 20:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0005_task_search_vector_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["due_date"], name="task_due_date_idx"),
+        ),
+    ]
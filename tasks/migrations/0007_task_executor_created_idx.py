@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-17 21:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0006_task_due_date_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["executor", "created_at"], name="task_executor_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,122 @@
+# Generated by Django 5.2.4 on 2026-10-17 21:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+TABLE = "tasks_workload_snapshot"
+
+# Должно совпадать с tasks.workload.SNAPSHOT_SQL: на других базах снимок
+# пересчитывается этим запросом, на PostgreSQL он хранится в представлении
+SNAPSHOT_SQL = """
+SELECT executor_id AS employee_id,
+       COUNT(*) FILTER (WHERE status = 'new') AS new_count,
+       COUNT(*) FILTER (WHERE status = 'in_progress') AS in_progress_count,
+       COUNT(*) FILTER (WHERE status = 'done') AS done_count,
+       COUNT(*) FILTER (WHERE status IN ('new', 'in_progress')) AS active_count,
+       COUNT(*) FILTER (
+           WHERE status IN ('new', 'in_progress') AND due_date < CURRENT_DATE
+       ) AS overdue_count,
+       MIN(due_date) FILTER (
+           WHERE status IN ('new', 'in_progress')
+       ) AS nearest_due_date
+FROM tasks_task
+WHERE executor_id IS NOT NULL
+GROUP BY executor_id
+"""
+
+
+def create_snapshot(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        # Заполняется первым refresh_workload_snapshot; уникальный индекс
+        # нужен для REFRESH MATERIALIZED VIEW CONCURRENTLY
+        schema_editor.execute(
+            f"CREATE MATERIALIZED VIEW {TABLE} AS {SNAPSHOT_SQL} WITH NO DATA"
+        )
+        schema_editor.execute(
+            f"CREATE UNIQUE INDEX workload_snapshot_employee_idx ON {TABLE} (employee_id)"
+        )
+        return
+    schema_editor.create_model(apps.get_model("tasks", "WorkloadSnapshot"))
+
+
+def drop_snapshot(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP MATERIALIZED VIEW IF EXISTS {TABLE}")
+        return
+    schema_editor.delete_model(apps.get_model("tasks", "WorkloadSnapshot"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0007_task_executor_created_idx"),
+        ("users", "0004_customuser_full_name_trgm_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WorkloadSnapshot",
+            fields=[
+                (
+                    "employee",
+                    models.OneToOneField(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Сотрудник",
+                    ),
+                ),
+                ("new_count", models.PositiveIntegerField(verbose_name="Не начато")),
+                (
+                    "in_progress_count",
+                    models.PositiveIntegerField(verbose_name="В работе"),
+                ),
+                ("done_count", models.PositiveIntegerField(verbose_name="Завершено")),
+                ("active_count", models.PositiveIntegerField(verbose_name="Активных")),
+                (
+                    "overdue_count",
+                    models.PositiveIntegerField(verbose_name="Просрочено"),
+                ),
+                (
+                    "nearest_due_date",
+                    models.DateField(
+                        null=True, verbose_name="Ближайший срок активной задачи"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Загрузка сотрудника",
+                "verbose_name_plural": "Загрузка сотрудников",
+                "db_table": "tasks_workload_snapshot",
+                "managed": False,
+            },
+        ),
+        migrations.RunPython(create_snapshot, drop_snapshot),
+        migrations.CreateModel(
+            name="SnapshotRefresh",
+            fields=[
+                (
+                    "name",
+                    models.CharField(
+                        max_length=50,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Снимок",
+                    ),
+                ),
+                ("refreshed_at", models.DateTimeField(verbose_name="Обновлен")),
+                (
+                    "duration",
+                    models.FloatField(verbose_name="Длительность обновления, с"),
+                ),
+            ],
+            options={
+                "verbose_name": "Обновление снимка",
+                "verbose_name_plural": "Обновления снимков",
+            },
+        ),
+    ]
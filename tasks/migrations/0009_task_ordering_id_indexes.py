@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-17 21:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0008_workload_snapshot"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_updated_at_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_due_date_idx",
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["due_date", "id"], name="task_due_date_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["updated_at", "id"], name="task_updated_at_id_idx"
+            ),
+        ),
+    ]
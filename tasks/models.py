@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, router, transaction
 from django.conf import settings
 
 
@@ -12,6 +12,9 @@ class Task(models.Model):
         IN_PROGRESS = "in_progress", "В работе"
         DONE = "done", "Завершена"
 
+    # Статусы, при которых задача считается активной (учитывается в загрузке)
+    ACTIVE_STATUSES = [Status.NEW, Status.IN_PROGRESS]
+
     title = models.CharField(
         max_length=255,
         verbose_name="Название задачи",
@@ -71,7 +74,126 @@ class Task(models.Model):
         verbose_name = "Задача"
         verbose_name_plural = "Задачи"
         ordering = ["created_at"]
+        indexes = [
+            # Задачи исполнителя в нужных статусах (загрузка, busy-employees)
+            models.Index(
+                fields=["executor", "status"], name="task_executor_status_idx"
+            ),
+            # Задачи исполнителя в порядке создания (фильтр ?executor= списка)
+            models.Index(
+                fields=["executor", "created_at"], name="task_executor_created_idx"
+            ),
+            # Подзадачи в нужных статусах (important-tasks)
+            models.Index(fields=["parent", "status"], name="task_parent_status_idx"),
+            # Фильтры по статусу и сроку (в т.ч. в админке)
+            models.Index(
+                fields=["status", "due_date"], name="task_status_due_date_idx"
+            ),
+            # Сортировка ?ordering=due_date с курсором (due_date, id), фильтр
+            # и иерархия дат по сроку в админке
+            models.Index(fields=["due_date", "id"], name="task_due_date_id_idx"),
+            # Сортировка ?ordering=updated_at с курсором (updated_at, id)
+            # и MAX(updated_at) для ETag/Last-Modified
+            models.Index(fields=["updated_at", "id"], name="task_updated_at_id_idx"),
+            # Сортировка списка и курсорная пагинация
+            models.Index(fields=["created_at", "id"], name="task_created_at_id_idx"),
+            # Частичный индекс: только активные задачи с исполнителем
+            # в порядке создания (busy-employees)
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(
+                    status__in=["new", "in_progress"], executor__isnull=False
+                ),
+                name="task_active_assigned_idx",
+            ),
+            # Частичный индекс: только задачи без исполнителя
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(executor__isnull=True),
+                name="task_unassigned_idx",
+            ),
+            # GIN-индекс полнотекстового поиска (tasks.search) есть только
+            # в PostgreSQL и создается миграцией 0005_task_search_vector_idx
+        ]
 
     def __str__(self):
         """Строковое представление задачи"""
         return f"{self.title} ({self.get_status_display()})"
+
+    def save(self, *args, **kwargs):
+        """
+        Сохраняет задачу и обновляет счетчик активных задач исполнителей.
+        Предыдущее состояние читается с блокировкой строки, чтобы
+        параллельные изменения одной задачи не сбивали счетчик.
+        """
+        # Импорт внутри метода: tasks.counters сам импортирует модель Task
+        from .counters import active_counter_deltas, apply_active_counter_deltas
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not {
+            "executor",
+            "executor_id",
+            "status",
+        } & set(update_fields):
+            return super().save(*args, **kwargs)
+
+        using = kwargs.get("using") or router.db_for_write(Task, instance=self)
+        with transaction.atomic(using=using):
+            previous = None
+            if not self._state.adding and self.pk is not None:
+                previous = (
+                    Task.objects.using(using)
+                    .select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list("executor_id", "status")
+                    .first()
+                )
+            super().save(*args, **kwargs)
+            apply_active_counter_deltas(
+                active_counter_deltas(previous, (self.executor_id, self.status)),
+                using=using,
+            )
+
+
+class WorkloadSnapshot(models.Model):
+    """
+    Снимок загрузки сотрудника: задачи по статусам, просроченные и ближайший
+    срок (tasks.workload). На PostgreSQL — материализованное представление,
+    на других базах — таблица; обе создаются миграцией 0008, а строки
+    пересчитывает только refresh_workload_snapshot.
+    """
+
+    employee = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_constraint=False,
+        related_name="+",
+        verbose_name="Сотрудник",
+    )
+    new_count = models.PositiveIntegerField(verbose_name="Не начато")
+    in_progress_count = models.PositiveIntegerField(verbose_name="В работе")
+    done_count = models.PositiveIntegerField(verbose_name="Завершено")
+    active_count = models.PositiveIntegerField(verbose_name="Активных")
+    overdue_count = models.PositiveIntegerField(verbose_name="Просрочено")
+    nearest_due_date = models.DateField(
+        null=True, verbose_name="Ближайший срок активной задачи"
+    )
+
+    class Meta:
+        managed = False
+        db_table = "tasks_workload_snapshot"
+        verbose_name = "Загрузка сотрудника"
+        verbose_name_plural = "Загрузка сотрудников"
+
+
+class SnapshotRefresh(models.Model):
+    """Время и длительность последнего обновления снимка (для свежести отчета)."""
+
+    name = models.CharField(max_length=50, primary_key=True, verbose_name="Снимок")
+    refreshed_at = models.DateTimeField(verbose_name="Обновлен")
+    duration = models.FloatField(verbose_name="Длительность обновления, с")
+
+    class Meta:
+        verbose_name = "Обновление снимка"
+        verbose_name_plural = "Обновления снимков"
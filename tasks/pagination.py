@@ -0,0 +1,104 @@
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+
+
+def reverse_ordering(ordering):
+    return tuple(name[1:] if name.startswith("-") else f"-{name}" for name in ordering)
+
+
+def keyset_condition(ordering, values):
+    """
+    Строки после позиции values в порядке ordering: (a, id) > (va, vid)
+    раскрывается в a >= va AND (a > va OR (a = va AND id > vid)). Первое
+    условие дает базе диапазон по индексу (a, id).
+    """
+    condition = Q()
+    equal = {}
+    for order, value in zip(ordering, values):
+        name = order.lstrip("-")
+        lookup = "lt" if order.startswith("-") else "gt"
+        condition |= Q(**equal, **{f"{name}__{lookup}": value})
+        equal[name] = value
+    first = ordering[0]
+    lookup = "lte" if first.startswith("-") else "gte"
+    return Q(**{f"{first.lstrip('-')}__{lookup}": values[0]}) & condition
+
+
+class TaskCursorPagination(CursorPagination):
+    """
+    Курсорная (keyset) пагинация списка задач.
+    Страница выбирается условием по ключам сортировки вместо OFFSET, поэтому
+    глубокие страницы стоят столько же, сколько первая. Позиция курсора —
+    значения всех полей сортировки, включая id, поэтому она уникальна:
+    CursorPagination DRF хранит только первое поле и для одинаковых значений
+    (задачи с одним сроком) переходит на OFFSET, который медленнее и при
+    вставках пропускает или повторяет строки.
+    """
+
+    ordering = ("created_at", "id")
+    page_size = settings.TASKS_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.TASKS_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        offset, reverse, position = self.cursor or (0, False, None)
+
+        ordering = reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            try:
+                values = json.loads(position)
+                if not isinstance(values, list) or len(values) != len(ordering):
+                    raise ValueError(position)
+                queryset = queryset.filter(keyset_condition(ordering, values))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        # Лишняя строка показывает, есть ли следующая страница
+        end = offset + self.page_size + 1
+        results = list(queryset[offset:end])
+        self.page = results[: self.page_size]
+        has_following = len(results) > len(self.page)
+        following = (
+            self._get_position_from_instance(results[-1], self.ordering)
+            if has_following
+            else None
+        )
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None or offset > 0
+            self.has_previous = has_following
+            self.next_position = position
+            self.previous_position = following
+        else:
+            self.has_next = has_following
+            self.has_previous = position is not None or offset > 0
+            self.next_position = following
+            self.previous_position = position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def _get_position_from_instance(self, instance, ordering):
+        """Значения всех полей сортировки строки (модели или values())."""
+        names = [order.lstrip("-") for order in ordering]
+        if isinstance(instance, dict):
+            values = [instance[name] for name in names]
+        else:
+            values = [getattr(instance, name) for name in names]
+        return json.dumps([str(value) for value in values])
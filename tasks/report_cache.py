@@ -0,0 +1,164 @@
+"""
+Кэш отчетов busy-employees и important-tasks.
+
+Ключ отчета включает версию — ETag, вычисленный по состоянию задач
+и сотрудников в базе (количество и последнее изменение), — поэтому тело
+ответа и его ETag всегда соответствуют одному состоянию: запись, которую
+не видели сигналы этого процесса (другой воркер, QuerySet.update), меняет
+ETag и вместе с ним ключ отчета.
+
+Кроме того, ключ включает номер поколения данных задач, который
+увеличивается при каждой записи Task/CustomUser (сигналы и массовые
+операции) и сбрасывает отчеты даже при изменениях, не затрагивающих
+updated_at. Старые записи вытесняются по TTL. Используется кэш Django
+(TASKS_REPORT_CACHE_ALIAS). С локальным кэшем (locmem) у каждого воркера
+свои отчеты и свое поколение: ответы остаются согласованными за счет
+версии, но для нескольких воркеров нужен общий кэш (Redis, Memcached),
+иначе каждый воркер вычисляет отчеты заново.
+"""
+
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from config.metrics import registry
+
+GENERATION_KEY = "tasks:generation"
+
+# Счетчики попаданий и промахов текущего процесса
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[settings.TASKS_REPORT_CACHE_ALIAS]
+
+
+def get_generation():
+    """
+    Текущее поколение данных задач. Если ключ вытеснен из кэша, поколение
+    начинается с текущего времени в наносекундах, чтобы не совпасть
+    с поколениями, под которыми еще лежат старые отчеты.
+    """
+    cache = get_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+async def aget_generation():
+    """Асинхронный вариант get_generation."""
+    cache = get_cache()
+    generation = await cache.aget(GENERATION_KEY)
+    if generation is None:
+        await cache.aadd(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = await cache.aget(GENERATION_KEY)
+    return generation
+
+
+def _incr_generation():
+    cache = get_cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def bump_generation():
+    """
+    Сбрасывает закэшированные отчеты. Поколение увеличивается сразу
+    и еще раз после фиксации транзакции: иначе отчет, вычисленный
+    по незафиксированным данным в другом запросе, остался бы в кэше
+    под новым поколением.
+    """
+    _incr_generation()
+    transaction.on_commit(_incr_generation)
+
+
+def _count(name, hit):
+    with _stats_lock:
+        _stats[f"{name}:{'hits' if hit else 'misses'}"] += 1
+
+
+def report_key(name, version, generation):
+    return f"tasks:report:{name}:{version}:{generation}"
+
+
+def cached_report(name, version, compute):
+    """
+    Отчет name из кэша или вычисленный compute(). version — ETag ответа:
+    отчет, закэшированный под другим ETag, не используется.
+    """
+    timeout = settings.TASKS_REPORT_CACHE_TIMEOUT
+    if not timeout:
+        return compute()
+
+    cache = get_cache()
+    key = report_key(name, version, get_generation())
+    value = cache.get(key)
+    hit = value is not None
+    if not hit:
+        value = compute()
+        cache.set(key, value, timeout)
+    _count(name, hit)
+    return value
+
+
+async def acached_report(name, version, compute):
+    """Асинхронный вариант cached_report: compute — корутинная функция."""
+    timeout = settings.TASKS_REPORT_CACHE_TIMEOUT
+    if not timeout:
+        return await compute()
+
+    cache = get_cache()
+    key = report_key(name, version, await aget_generation())
+    value = await cache.aget(key)
+    hit = value is not None
+    if not hit:
+        value = await compute()
+        await cache.aset(key, value, timeout)
+    _count(name, hit)
+    return value
+
+
+def get_cache_stats():
+    """Попадания, промахи и доля попаданий по отчетам в текущем процессе."""
+    with _stats_lock:
+        stats = dict(_stats)
+    reports = {}
+    for name in sorted({key.rsplit(":", 1)[0] for key in stats}):
+        hits = stats.get(f"{name}:hits", 0)
+        misses = stats.get(f"{name}:misses", 0)
+        reports[name] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4),
+        }
+    return {"generation": get_generation(), "reports": reports}
+
+
+def collect_metrics():
+    """Счетчики попаданий и промахов для реестра метрик (config.metrics)."""
+    with _stats_lock:
+        stats = dict(_stats)
+    samples = []
+    for key, value in stats.items():
+        name, kind = key.rsplit(":", 1)
+        result = "hit" if kind == "hits" else "miss"
+        samples.append(
+            (
+                "tasks_report_cache_requests_total",
+                {"report": name, "result": result},
+                value,
+            )
+        )
+    return samples
+
+
+registry.register_collector(collect_metrics)
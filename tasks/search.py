@@ -0,0 +1,91 @@
+"""
+Полнотекстовый поиск задач (GET /tasks/search/?q=).
+
+На PostgreSQL название и описание ищутся по взвешенному tsvector
+(название важнее описания) с ранжированием SearchRank. Выражение
+SEARCH_VECTOR совпадает с GIN-индексом task_search_vector_idx
+(миграция 0005), поэтому поиск не сканирует таблицу. Исполнители
+ищутся по сходству триграмм имени (индекс user_full_name_trgm_idx):
+подходящие сотрудники выбираются отдельным запросом, а их задачи
+добавляются к результатам через индекс по executor_id.
+
+На других базах (SQLite в тестах) — поиск подстроки без учета регистра
+в названии, описании и имени исполнителя; совпадения в названии выше.
+SQLite сравнивает без учета регистра только латиницу.
+"""
+
+from django.contrib.postgres.lookups import TrigramSimilar
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramSimilarity,
+)
+from django.db import connection
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models.functions import Coalesce
+
+from users.models import CustomUser
+from .models import Task
+
+# Конфигурация полнотекстового поиска; должна совпадать с индексом в миграции
+SEARCH_CONFIG = "russian"
+SEARCH_VECTOR = SearchVector("title", weight="A", config=SEARCH_CONFIG) + SearchVector(
+    "description", weight="B", config=SEARCH_CONFIG
+)
+# Сколько сотрудников с похожим именем учитывается при поиске
+MAX_MATCHING_EXECUTORS = 50
+
+
+def matching_executor_ids(text):
+    """id сотрудников, имя которых похоже на text (индекс триграмм)."""
+    return list(
+        CustomUser.objects.filter(TrigramSimilar(F("full_name"), Value(text)))
+        .annotate(similarity=TrigramSimilarity("full_name", text))
+        .order_by("-similarity")
+        .values_list("pk", flat=True)[:MAX_MATCHING_EXECUTORS]
+    )
+
+
+def postgres_search(queryset, text):
+    query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+    condition = Q(search=query)
+    executor_ids = matching_executor_ids(text)
+    rank = SearchRank(F("search"), query)
+    if executor_ids:
+        condition |= Q(executor_id__in=executor_ids)
+        rank += Coalesce(TrigramSimilarity("executor__full_name", text), Value(0.0))
+    return (
+        queryset.alias(search=SEARCH_VECTOR)
+        .filter(condition)
+        .annotate(rank=rank)
+        .order_by("-rank", "-created_at")
+    )
+
+
+def fallback_search(queryset, text):
+    return (
+        queryset.filter(
+            Q(title__icontains=text)
+            | Q(description__icontains=text)
+            | Q(executor__full_name__icontains=text)
+        )
+        .annotate(
+            rank=Case(
+                When(title__icontains=text, then=Value(2)),
+                When(description__icontains=text, then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        )
+        .order_by("-rank", "-created_at")
+    )
+
+
+def search_tasks(text, limit, queryset=None):
+    """Не больше limit задач, подходящих под text, — самые релевантные первыми."""
+    if queryset is None:
+        queryset = Task.objects.select_related("creator", "executor")
+    if connection.vendor == "postgresql":
+        return postgres_search(queryset, text)[:limit]
+    return fallback_search(queryset, text)[:limit]
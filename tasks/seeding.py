@@ -0,0 +1,112 @@
+"""
+Генерация реалистичных данных для нагрузочных проверок.
+
+Сотрудники и иерархии задач создаются через bulk_create пакетами:
+задачи строятся по уровням (корни, подзадачи, подзадачи подзадач...),
+родитель каждой задачи выбирается среди задач предыдущего уровня.
+Статусы смешанные, часть задач (чаще родительских) без исполнителя —
+так появляются кандидаты для отчета important-tasks. Счетчики активных
+задач пересчитываются одним UPDATE в конце.
+"""
+
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from users.models import CustomUser
+from .counters import rebuild_active_tasks_counts
+from .models import Task
+
+FIRST_NAMES = ["Иван", "Анна", "Петр", "Мария", "Олег", "Елена", "Сергей", "Ольга"]
+LAST_NAMES = ["Иванов", "Смирнов", "Кузнецов", "Попов", "Васильев", "Соколов"]
+POSITIONS = ["Разработчик", "Тестировщик", "Аналитик", "Дизайнер", "Менеджер"]
+TITLE_WORDS = ["Подготовить", "Проверить", "Согласовать", "Исправить", "Описать"]
+TITLE_OBJECTS = ["отчет", "API", "макет", "релиз", "документацию", "тесты"]
+
+STATUS_WEIGHTS = {
+    Task.Status.NEW: 40,
+    Task.Status.IN_PROGRESS: 35,
+    Task.Status.DONE: 25,
+}
+# Доля задач без исполнителя: у родительских задач и у листьев иерархии
+UNASSIGNED_PARENT_RATE = 0.3
+UNASSIGNED_LEAF_RATE = 0.1
+
+
+def level_sizes(total, depth):
+    """Количество задач на каждом уровне: каждый следующий вдвое больше."""
+    weights = [2**level for level in range(depth)]
+    sizes = [total * weight // sum(weights) for weight in weights]
+    sizes[-1] += total - sum(sizes)
+    return sizes
+
+
+def seed_users(count, rng, password="seedpass", batch_size=2000):
+    """Создает count сотрудников. Возвращает их id."""
+    password_hash = make_password(password)
+    start = CustomUser.objects.count()
+    users = [
+        CustomUser(
+            email=f"user{start + i}@seed.example.com",
+            full_name=f"{rng.choice(LAST_NAMES)} {rng.choice(FIRST_NAMES)} {i}",
+            position=rng.choice(POSITIONS),
+            password=password_hash,
+        )
+        for i in range(count)
+    ]
+    CustomUser.objects.bulk_create(users, batch_size=batch_size)
+    return list(
+        CustomUser.objects.filter(email__endswith="@seed.example.com").values_list(
+            "pk", flat=True
+        )
+    )
+
+
+def seed_tasks(count, depth, user_ids, rng, batch_size=5000):
+    """Создает count задач в иерархиях глубины depth. Возвращает число задач."""
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+    today = date.today()
+    sizes = level_sizes(count, depth)
+    parent_ids = []
+    created = 0
+
+    for level, size in enumerate(sizes):
+        unassigned_rate = (
+            UNASSIGNED_LEAF_RATE if level == depth - 1 else UNASSIGNED_PARENT_RATE
+        )
+        tasks = [
+            Task(
+                title=f"{rng.choice(TITLE_WORDS)} {rng.choice(TITLE_OBJECTS)} #{i}",
+                description="Сгенерированная задача",
+                status=rng.choices(statuses, weights)[0],
+                due_date=today + timedelta(days=rng.randint(-30, 90)),
+                parent_id=rng.choice(parent_ids) if parent_ids else None,
+                executor_id=(
+                    None if rng.random() < unassigned_rate else rng.choice(user_ids)
+                ),
+                creator_id=rng.choice(user_ids),
+            )
+            for i in range(size)
+        ]
+        Task.objects.bulk_create(tasks, batch_size=batch_size)
+        parent_ids = [task.pk for task in tasks]
+        created += size
+    return created
+
+
+def seed_tracker(users, tasks, depth, seed=None):
+    """
+    Создает users сотрудников и tasks задач глубины depth в одной транзакции
+    и пересчитывает счетчики активных задач.
+    """
+    if users < 1 or depth < 1:
+        raise ValueError("Нужен хотя бы один сотрудник и один уровень задач")
+    rng = random.Random(seed)
+    with transaction.atomic():
+        user_ids = seed_users(users, rng)
+        created = seed_tasks(tasks, depth, user_ids, rng)
+        rebuild_active_tasks_counts()
+    return len(user_ids), created
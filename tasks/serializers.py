@@ -1,6 +1,9 @@
 from datetime import date
 
+from django.conf import settings
 from rest_framework import serializers
+
+from config.fieldsets import SparseFieldsetSerializerMixin
 from .models import Task
 from users.models import CustomUser
 
@@ -15,7 +18,14 @@ class UserShortSerializer(serializers.ModelSerializer):
         fields = ["id", "email", "first_name", "last_name", "phone", "avatar"]
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    """
+    Задача с вложенными создателем и исполнителем.
+    Для чтения поддерживает ?fields= и ?expand=creator,executor (config.fieldsets).
+    """
+
+    expandable_fields = ("creator", "executor")
+
     creator = UserShortSerializer(read_only=True)
     executor = UserShortSerializer(read_only=True)
 
@@ -48,3 +58,38 @@ class TaskSerializer(serializers.ModelSerializer):
                 "Дата выполнения не может быть в прошлом."
             )
         return value
+
+
+class TaskBulkSerializer(TaskSerializer):
+    """
+    Элемент массового создания задач.
+    Исполнитель и родительская задача принимаются как id без запроса к базе:
+    их существование проверяется одним запросом на весь пакет (tasks.bulk).
+    """
+
+    executor_id = serializers.IntegerField(allow_null=True, write_only=True)
+    parent = serializers.IntegerField(
+        source="parent_id", allow_null=True, required=False
+    )
+
+
+class TaskBulkUpdateSerializer(TaskBulkSerializer):
+    """Элемент массового частичного обновления: id задачи и изменяемые поля."""
+
+    id = serializers.IntegerField()
+
+    def validate(self, attrs):
+        if "id" not in attrs:
+            raise serializers.ValidationError({"id": "Обязательное поле."})
+        return attrs
+
+
+class TaskBulkStatusSerializer(serializers.Serializer):
+    """Массовая смена статуса задач."""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=settings.TASKS_BULK_MAX_ITEMS,
+    )
+    status = serializers.ChoiceField(choices=Task.Status.choices)
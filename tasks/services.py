@@ -0,0 +1,70 @@
+from collections import defaultdict
+
+from users.models import CustomUser
+from .fast_read import TaskRowSerializer, UserShortRowSerializer
+from .models import Task
+
+
+def busy_employees_queryset():
+    """
+    Сотрудники с активными задачами по убыванию загрузки —
+    строки values() для UserShortRowSerializer и счетчик задач.
+    """
+    return UserShortRowSerializer.values(
+        CustomUser.objects.filter(active_tasks_count__gt=0).order_by(
+            "-active_tasks_count"
+        ),
+        "active_tasks_count",
+    )
+
+
+def assigned_active_tasks_queryset():
+    """
+    Активные задачи с исполнителем — ровно задачи сотрудников
+    из busy_employees_queryset(). Строки values() для TaskRowSerializer:
+    создатель и исполнитель читаются JOIN-ом без создания моделей.
+    """
+    return TaskRowSerializer.values(
+        Task.objects.filter(
+            executor__isnull=False,
+            status__in=Task.ACTIVE_STATUSES,
+        )
+    )
+
+
+def get_busy_employees():
+    """
+    Формирует отчет "Занятые сотрудники" за фиксированное число запросов:
+    один запрос на сотрудников (по денормализованному счетчику активных задач)
+    и один запрос на все их активные задачи (создатель и исполнитель
+    подгружаются JOIN-ом). Задачи группируются по исполнителю в памяти.
+    """
+    employees = list(busy_employees_queryset())
+    if not employees:
+        return []
+    return build_busy_employees(employees, assigned_active_tasks_queryset())
+
+
+def build_busy_employees(employees, active_tasks):
+    """
+    Собирает отчет из строк сотрудников и их активных задач.
+    Не обращается к базе данных: задачи группируются по исполнителю в памяти
+    и сериализуются быстрым путем (tasks.fast_read) в формате TaskSerializer.
+    """
+    tasks_by_executor = defaultdict(list)
+    for task in active_tasks:
+        tasks_by_executor[task["executor__id"]].append(task)
+
+    employee_serializer = UserShortRowSerializer()
+    task_serializer = TaskRowSerializer()
+    return [
+        {
+            "employee": employee_serializer.to_representation(emp),
+            "active_tasks_count": emp["active_tasks_count"],
+            "tasks": [
+                task_serializer.to_representation(task)
+                for task in tasks_by_executor[emp["id"]]
+            ],
+        }
+        for emp in employees
+    ]
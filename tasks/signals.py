@@ -0,0 +1,28 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.models import CustomUser
+from .counters import active_counter_deltas, apply_active_counter_deltas
+from .models import Task
+from .report_cache import bump_generation
+
+
+@receiver(post_delete, sender=Task)
+def decrement_active_tasks_count(sender, instance, using, **kwargs):
+    """
+    Уменьшает счетчик активных задач исполнителя при удалении задачи.
+    Срабатывает и для QuerySet.delete(), в отличие от Task.delete().
+    """
+    apply_active_counter_deltas(
+        active_counter_deltas((instance.executor_id, instance.status), None),
+        using=using,
+    )
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_report_cache(sender, **kwargs):
+    """Любая запись задачи или сотрудника сбрасывает кэш отчетов."""
+    bump_generation()
@@ -0,0 +1,253 @@
+"""
+Регрессионные тесты количества SQL-запросов.
+
+Каждый эндпоинт TaskViewSet и CustomUserViewSet (и async-версии) вызывается
+на двух объемах данных; количество запросов должно совпадать, иначе
+в эндпоинт попал N+1. Новый маршрут роутера без описания в ENDPOINTS
+роняет test_all_routes_covered, поэтому каждый будущий эндпоинт
+получает такую проверку.
+"""
+
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tasks import urls as task_urls
+from users.authentication import user_cache
+from users import urls as user_urls
+from users.models import CustomUser
+from .models import Task
+from .seeding import seed_tracker
+from .workload import refresh_workload_snapshot
+
+DUE_DATE = (date.today() + timedelta(days=7)).isoformat()
+
+
+def root_task():
+    """Корень последней созданной иерархии."""
+    return Task.objects.filter(parent__isnull=True).order_by("pk").last()
+
+
+def leaf_task():
+    """Самая глубокая задача последней иерархии."""
+    return Task.objects.filter(parent__parent__isnull=False).order_by("pk").last()
+
+
+def new_task():
+    return Task.objects.create(title="Задача для теста", due_date=DUE_DATE)
+
+
+def any_user_id():
+    return CustomUser.objects.order_by("pk").values_list("pk", flat=True).last()
+
+
+def refreshed_workload():
+    refresh_workload_snapshot()
+    return {}, None
+
+
+# (название случая, имя маршрута, метод, подготовка: () -> (kwargs URL, тело))
+ENDPOINTS = [
+    ("tasks-list", "tasks-list", "get", lambda: ({}, None)),
+    (
+        "tasks-create",
+        "tasks-list",
+        "post",
+        lambda: (
+            {},
+            {"title": "Новая", "due_date": DUE_DATE, "executor_id": any_user_id()},
+        ),
+    ),
+    ("tasks-detail", "tasks-detail", "get", lambda: ({"pk": root_task().pk}, None)),
+    (
+        "tasks-update",
+        "tasks-detail",
+        "patch",
+        lambda: (
+            {"pk": new_task().pk},
+            {"status": "in_progress", "executor_id": any_user_id()},
+        ),
+    ),
+    ("tasks-delete", "tasks-detail", "delete", lambda: ({"pk": new_task().pk}, None)),
+    ("tasks-tree", "tasks-tree", "get", lambda: ({"pk": root_task().pk}, None)),
+    (
+        "tasks-ancestors",
+        "tasks-ancestors",
+        "get",
+        lambda: ({"pk": leaf_task().pk}, None),
+    ),
+    ("tasks-busy-employees", "tasks-busy-employees", "get", lambda: ({}, None)),
+    ("tasks-important-tasks", "tasks-important-tasks", "get", lambda: ({}, None)),
+    ("tasks-report-cache-stats", "tasks-report-cache-stats", "get", lambda: ({}, None)),
+    ("tasks-export", "tasks-export", "get", lambda: ({}, None)),
+    ("tasks-search", "tasks-search", "get", lambda: ({}, {"q": "отчет"})),
+    (
+        "tasks-bulk-create",
+        "tasks-bulk",
+        "post",
+        lambda: (
+            {},
+            [
+                {
+                    "title": f"Пакет {i}",
+                    "due_date": DUE_DATE,
+                    "executor_id": any_user_id(),
+                    "parent": root_task().pk,
+                }
+                for i in range(3)
+            ],
+        ),
+    ),
+    (
+        "tasks-bulk-update",
+        "tasks-bulk",
+        "patch",
+        lambda: (
+            {},
+            [
+                {"id": task.pk, "status": "in_progress", "executor_id": any_user_id()}
+                for task in Task.objects.order_by("-pk")[:3]
+            ],
+        ),
+    ),
+    (
+        "tasks-bulk-status",
+        "tasks-bulk-status",
+        "post",
+        lambda: (
+            {},
+            {
+                "ids": list(
+                    Task.objects.order_by("-pk").values_list("pk", flat=True)[:3]
+                ),
+                "status": "done",
+            },
+        ),
+    ),
+    ("reports-workload", "reports-workload", "get", refreshed_workload),
+    ("users-list", "users-list", "get", lambda: ({}, None)),
+    ("users-detail", "users-detail", "get", lambda: ({"pk": any_user_id()}, None)),
+    (
+        "users-update",
+        "users-detail",
+        "patch",
+        lambda: ({"pk": any_user_id()}, {"position": "Аналитик"}),
+    ),
+    ("async-tasks-list", "async-tasks-list", "get", lambda: ({}, None)),
+    (
+        "async-tasks-detail",
+        "async-tasks-detail",
+        "get",
+        lambda: ({"pk": root_task().pk}, None),
+    ),
+    (
+        "async-tasks-busy-employees",
+        "async-tasks-busy-employees",
+        "get",
+        lambda: ({}, None),
+    ),
+    (
+        "async-tasks-important-tasks",
+        "async-tasks-important-tasks",
+        "get",
+        lambda: ({}, None),
+    ),
+]
+
+
+def format_queries(queries):
+    return "\n".join(
+        f"  {number}. {query['sql']}" for number, query in enumerate(queries, 1)
+    )
+
+
+@override_settings(TASKS_REPORT_CACHE_TIMEOUT=0)
+class QueryCountRegressionTests(TestCase):
+    """
+    Количество запросов каждого эндпоинта не зависит от объема данных.
+    """
+
+    # Количество задач в малом и большом наборах данных
+    SMALL, LARGE = 10, 500
+    TASKS_PER_USER = 10
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email="queries@example.com",
+            password="queriespass",
+            full_name="Query Counter",
+            position="Manager",
+            is_staff=True,
+        )
+        # Настоящий JWT: async-представления не поддерживают force_authenticate
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def grow_to(self, tasks):
+        """Добавляет сотрудников и задачи до tasks задач."""
+        missing = tasks - Task.objects.count()
+        seed_tracker(
+            users=max(1, missing // self.TASKS_PER_USER),
+            tasks=missing,
+            depth=3,
+            seed=tasks,
+        )
+
+    def capture(self, route, method, prepare):
+        """Выполняет запрос и возвращает выполненные им SQL-запросы."""
+        kwargs, data = prepare()
+        url = reverse(route, kwargs=kwargs)
+        # Загрузка пользователя при аутентификации входит в каждый замер
+        user_cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, data, format="json")
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertLess(
+            response.status_code, 400, f"{method.upper()} {url}: {response.status_code}"
+        )
+        return queries.captured_queries
+
+    def test_query_counts_do_not_grow(self):
+        self.grow_to(self.SMALL)
+        small = {
+            name: self.capture(route, method, prepare)
+            for name, route, method, prepare in ENDPOINTS
+        }
+        self.grow_to(self.LARGE)
+        large = {
+            name: self.capture(route, method, prepare)
+            for name, route, method, prepare in ENDPOINTS
+        }
+
+        for name, _, _, _ in ENDPOINTS:
+            with self.subTest(endpoint=name):
+                self.assertEqual(
+                    len(small[name]),
+                    len(large[name]),
+                    f"\n{name}: {len(small[name])} запросов на {self.SMALL} задачах, "
+                    f"{len(large[name])} на {self.LARGE}.\n"
+                    f"{self.SMALL} задач:\n{format_queries(small[name])}\n"
+                    f"{self.LARGE} задач:\n{format_queries(large[name])}",
+                )
+
+    def test_all_routes_covered(self):
+        """Каждый маршрут роутеров задач и пользователей есть в ENDPOINTS."""
+        routes = {
+            pattern.name
+            for router in (task_urls.router, user_urls.router)
+            for pattern in router.urls
+        }
+        covered = {route for _, route, _, _ in ENDPOINTS}
+        self.assertEqual(
+            routes - covered,
+            set(),
+            "Добавьте новые маршруты в ENDPOINTS tasks/test_query_counts.py",
+        )
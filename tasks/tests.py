@@ -1,11 +1,51 @@
-from django.test import TestCase
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from decimal import Decimal
+from http.cookies import SimpleCookie
+from io import StringIO
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from asgiref.sync import iscoroutinefunction
+from django.core.cache import cache
+from django.db import connection, connections
+from django.http import HttpResponse
+from django.test import AsyncClient, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APIClient
-from datetime import date, timedelta
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+from datetime import date, datetime, timedelta, timezone as dt_timezone
 
+from config import fast_json
+from config.db import pool_stats
+from config.fast_json import FastJSONParser, FastJSONRenderer
+from config.instrumentation import QueryStats, RequestInstrumentationMiddleware
+from config.metrics import MetricsRegistry, mark_process_dead, registry, render
+from config.paginators import LargeTablePaginator
+from config.replicas import ReplicaRouter
+from users.authentication import user_cache
 from users.models import CustomUser
+from .benchmarks import benchmark_json, benchmark_serializers, run_suite
+from .counters import find_active_counter_mismatches, rebuild_active_tasks_counts
+from .fast_read import TaskRowSerializer
 from .models import Task
+from .seeding import seed_tracker
+from .serializers import TaskSerializer, UserShortSerializer
+from .services import get_busy_employees
+from .workload import get_workload, refresh_workload_snapshot
 
 
 class TaskAPITests(TestCase):
@@ -87,6 +127,33 @@ class TaskAPITests(TestCase):
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_list_cursor_pagination(self):
+        """
+        Список задач отдается постранично по курсору, каждая страница —
+        один SELECT с уже подгруженными создателем и исполнителем
+        (плюс два агрегата для ETag).
+        """
+        self.client.force_authenticate(user=self.manager)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(self.list_url, {"page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]],
+            [self.task1.id, self.task2.id],
+        )
+        self.assertEqual(
+            response.data["results"][0]["executor"]["email"], self.employee1.email
+        )
+        self.assertIsNotNone(response.data["next"])
+
+        with self.assertNumQueries(3):
+            response = self.client.get(response.data["next"])
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]], [self.task3.id]
+        )
+        self.assertIsNone(response.data["next"])
+
     def test_create_task(self):
         """
         Тестируем создание новой задачи авторизованным пользователем.
@@ -169,6 +236,41 @@ class TaskAPITests(TestCase):
         self.assertIsNotNone(emp1_data)
         self.assertEqual(emp1_data["active_tasks_count"], 1)
 
+    def test_busy_employees_constant_queries(self):
+        """
+        Количество запросов busy-employees не растет вместе с числом
+        сотрудников и задач, а задачи группируются по исполнителю.
+        Два запроса отчета и два агрегата для ETag.
+        """
+        self.client.force_authenticate(user=self.manager)
+        with self.assertNumQueries(4):
+            self.client.get(self.busy_employees_url)
+
+        for i in range(5):
+            employee = CustomUser.objects.create_user(
+                email=f"extra{i}@example.com",
+                password="extrapass",
+                full_name=f"Extra {i}",
+                position="Developer",
+            )
+            for _ in range(3):
+                Task.objects.create(
+                    title=f"Задача {i}",
+                    due_date=date.today() + timedelta(days=3),
+                    creator=self.manager,
+                    executor=employee,
+                )
+
+        with self.assertNumQueries(4):
+            response = self.client.get(self.busy_employees_url)
+
+        self.assertEqual(len(response.data), 7)
+        self.assertEqual(response.data[0]["active_tasks_count"], 3)
+        for item in response.data:
+            self.assertEqual(len(item["tasks"]), item["active_tasks_count"])
+            for task in item["tasks"]:
+                self.assertEqual(task["executor"]["id"], item["employee"]["id"])
+
     def test_important_tasks_endpoint(self):
         """
         Тестируем кастомный эндпоинт important-tasks.
@@ -200,6 +302,40 @@ class TaskAPITests(TestCase):
         # Проверяем, что в предложенных исполнителях есть employee1 (исполнитель подзадачи)
         self.assertIn(self.employee1.full_name, task_data["available_employees"])
 
+    def test_important_tasks_candidates(self):
+        """
+        Наименее загруженные сотрудники и исполнитель родительской задачи
+        попадают в кандидаты, а число запросов не зависит от числа задач.
+        """
+        self.task3.parent = self.task2
+        self.task3.save()
+        for i in range(3):
+            Task.objects.create(
+                title=f"Подзадача {i}",
+                due_date=date.today() + timedelta(days=8),
+                status=Task.Status.DONE,
+                creator=self.manager,
+                executor=self.employee1,
+                parent=self.task3,
+            )
+        self.client.force_authenticate(user=self.manager)
+
+        # три запроса отчета и два агрегата для ETag
+        with self.assertNumQueries(5):
+            response = self.client.get(self.important_tasks_url)
+
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(
+            response.data[0]["available_employees"],
+            sorted(
+                [
+                    self.manager.full_name,
+                    self.employee1.full_name,
+                    self.employee2.full_name,
+                ]
+            ),
+        )
+
     def test_task_validation(self):
         """
         Тестируем валидацию данных при создании/обновлении задачи.
@@ -216,3 +352,1609 @@ class TaskAPITests(TestCase):
         response = self.client.post(self.list_url, invalid_data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("due_date", response.data)
+
+
+class ActiveTasksCounterTests(TestCase):
+    """
+    Тесты денормализованного счетчика CustomUser.active_tasks_count.
+    """
+
+    def setUp(self):
+        self.first = CustomUser.objects.create_user(
+            email="first@example.com",
+            password="firstpass",
+            full_name="First Employee",
+            position="Developer",
+        )
+        self.second = CustomUser.objects.create_user(
+            email="second@example.com",
+            password="secondpass",
+            full_name="Second Employee",
+            position="Developer",
+        )
+        self.task = Task.objects.create(
+            title="Задача",
+            due_date=date.today() + timedelta(days=3),
+            executor=self.first,
+        )
+
+    def assertCounts(self, first, second):
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(self.first.active_tasks_count, first)
+        self.assertEqual(self.second.active_tasks_count, second)
+
+    def test_counter_follows_task_lifecycle(self):
+        """Создание, переназначение, смена статуса и удаление задачи."""
+        self.assertCounts(1, 0)
+
+        self.task.executor = self.second
+        self.task.save()
+        self.assertCounts(0, 1)
+
+        self.task.status = Task.Status.DONE
+        self.task.save()
+        self.assertCounts(0, 0)
+
+        self.task.status = Task.Status.IN_PROGRESS
+        self.task.save(update_fields=["status"])
+        self.assertCounts(0, 1)
+
+        self.task.delete()
+        self.assertCounts(0, 0)
+
+    def test_counter_on_queryset_delete(self):
+        """QuerySet.delete() тоже уменьшает счетчик."""
+        Task.objects.create(
+            title="Еще задача",
+            due_date=date.today() + timedelta(days=3),
+            executor=self.first,
+        )
+        self.assertCounts(2, 0)
+        Task.objects.filter(executor=self.first).delete()
+        self.assertCounts(0, 0)
+
+    def test_sync_command_rebuilds_counters(self):
+        """Команда находит расхождения и исправляет их."""
+        CustomUser.objects.filter(pk=self.first.pk).update(active_tasks_count=5)
+
+        with self.assertRaises(CommandError):
+            call_command(
+                "sync_active_tasks_counts",
+                "--check",
+                stdout=StringIO(),
+                stderr=StringIO(),
+            )
+
+        call_command("sync_active_tasks_counts", stdout=StringIO())
+        self.assertCounts(1, 0)
+
+
+class ExplainQueriesCommandTests(TestCase):
+    """
+    Тесты команды explain_queries.
+    """
+
+    def test_explain_requires_data(self):
+        """На пустой базе команда завершается ошибкой."""
+        with self.assertRaises(CommandError):
+            call_command("explain_queries", stdout=StringIO())
+
+    def test_explain_prints_plans(self):
+        """Для каждого запроса выводится заголовок и план."""
+        Task.objects.create(title="Задача", due_date=date.today() + timedelta(days=3))
+        out = StringIO()
+        call_command("explain_queries", stdout=out)
+        output = out.getvalue()
+        self.assertIn("tasks-list: первая страница", output)
+        self.assertIn("important-tasks: загрузка сотрудников", output)
+
+
+class TaskHierarchyTests(TestCase):
+    """
+    Тесты эндпоинтов tree и ancestors (рекурсивный CTE).
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email="tree@example.com",
+            password="treepass",
+            full_name="Tree User",
+            position="Manager",
+        )
+        self.client.force_authenticate(user=self.user)
+
+        due_date = date.today() + timedelta(days=3)
+        self.root = Task.objects.create(title="Проект", due_date=due_date)
+        self.child = Task.objects.create(
+            title="Этап", due_date=due_date, parent=self.root, executor=self.user
+        )
+        self.grandchild = Task.objects.create(
+            title="Шаг", due_date=due_date, parent=self.child
+        )
+        self.sibling = Task.objects.create(
+            title="Второй этап", due_date=due_date, parent=self.root
+        )
+
+    def get_tree(self, task, **params):
+        return self.client.get(reverse("tasks-tree", kwargs={"pk": task.pk}), params)
+
+    def get_ancestors(self, task, **params):
+        return self.client.get(
+            reverse("tasks-ancestors", kwargs={"pk": task.pk}), params
+        )
+
+    def test_tree_in_one_query(self):
+        """Поддерево в порядке обхода в глубину за один запрос."""
+        with self.assertNumQueries(1):
+            response = self.get_tree(self.root)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(item["id"], item["depth"]) for item in response.data],
+            [
+                (self.root.id, 0),
+                (self.child.id, 1),
+                (self.grandchild.id, 2),
+                (self.sibling.id, 1),
+            ],
+        )
+        self.assertEqual(response.data[1]["executor"]["id"], self.user.id)
+
+    def test_tree_depth_limit(self):
+        """max_depth ограничивает глубину обхода и проверяется."""
+        response = self.get_tree(self.root, max_depth=1)
+        self.assertEqual(
+            [item["id"] for item in response.data],
+            [self.root.id, self.child.id, self.sibling.id],
+        )
+        response = self.get_tree(self.root, max_depth=-1)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ancestors_in_one_query(self):
+        """Цепочка предков от корня до родителя за один запрос."""
+        with self.assertNumQueries(1):
+            response = self.get_ancestors(self.grandchild)
+        self.assertEqual(
+            [(item["id"], item["depth"]) for item in response.data],
+            [(self.root.id, 2), (self.child.id, 1)],
+        )
+        self.assertEqual(self.get_ancestors(self.root).data, [])
+
+    def test_cycle_guard(self):
+        """Цикл в иерархии не приводит к бесконечной рекурсии."""
+        Task.objects.filter(pk=self.root.pk).update(parent=self.grandchild)
+        response = self.get_tree(self.root)
+        self.assertEqual(len(response.data), 4)
+        response = self.get_ancestors(self.grandchild)
+        self.assertEqual(
+            [item["id"] for item in response.data], [self.root.id, self.child.id]
+        )
+
+    def test_missing_task(self):
+        """Для несуществующей задачи возвращается 404."""
+        response = self.client.get(reverse("tasks-tree", kwargs={"pk": 999999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TaskBulkTests(TestCase):
+    """
+    Тесты массовых операций с задачами.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.manager = CustomUser.objects.create_user(
+            email="bulk-manager@example.com",
+            password="managerpass",
+            full_name="Bulk Manager",
+            position="Manager",
+        )
+        self.employee = CustomUser.objects.create_user(
+            email="bulk-employee@example.com",
+            password="employeepass",
+            full_name="Bulk Employee",
+            position="Developer",
+        )
+        self.client.force_authenticate(user=self.manager)
+        self.bulk_url = reverse("tasks-bulk")
+        self.bulk_status_url = reverse("tasks-bulk-status")
+        self.due_date = (date.today() + timedelta(days=3)).isoformat()
+
+    def test_bulk_create(self):
+        """Пакет создается за фиксированное число запросов."""
+        parent = Task.objects.create(title="Родитель", due_date=self.due_date)
+        data = [
+            {
+                "title": f"Задача {i}",
+                "due_date": self.due_date,
+                "executor_id": self.employee.id if i % 2 else None,
+                "parent": parent.id,
+            }
+            for i in range(20)
+        ]
+        # исполнители, родители, SAVEPOINT, INSERT, счетчики, RELEASE
+        with self.assertNumQueries(6):
+            response = self.client.post(self.bulk_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 20)
+        self.assertEqual(response.data[1]["executor"]["id"], self.employee.id)
+        self.assertEqual(response.data[0]["creator"]["id"], self.manager.id)
+        self.assertEqual(Task.objects.filter(parent=parent).count(), 20)
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.active_tasks_count, 10)
+
+    def test_bulk_create_reports_item_errors(self):
+        """Ошибки возвращаются по элементам, пакет не сохраняется."""
+        data = [
+            {"title": "Верная", "due_date": self.due_date, "executor_id": None},
+            {"title": "Без исполнителя", "due_date": self.due_date, "executor_id": 0},
+            {"due_date": self.due_date, "executor_id": None},
+        ]
+        response = self.client.post(self.bulk_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("executor_id", response.data[1])
+        self.assertIn("title", response.data[2])
+        self.assertFalse(Task.objects.exists())
+
+    def test_bulk_update(self):
+        """Частичное обновление пакета с переназначением исполнителя."""
+        tasks = [
+            Task.objects.create(title=f"Задача {i}", due_date=self.due_date)
+            for i in range(3)
+        ]
+        data = [
+            {"id": task.id, "executor_id": self.employee.id, "title": f"Новая {i}"}
+            for i, task in enumerate(tasks)
+        ]
+        data.append({"id": tasks[0].id, "status": Task.Status.DONE})
+        response = self.client.patch(self.bulk_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[1]["executor"]["id"], self.employee.id)
+
+        tasks[0].refresh_from_db()
+        self.assertEqual(tasks[0].title, "Новая 0")
+        self.assertEqual(tasks[0].status, Task.Status.DONE)
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.active_tasks_count, 2)
+
+        response = self.client.patch(
+            self.bulk_url,
+            [{"id": 999999, "title": "Нет"}, {"title": "Без id"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("id", response.data[0])
+        self.assertIn("id", response.data[1])
+
+    def test_bulk_status(self):
+        """Смена статуса одним UPDATE со счетчиками."""
+        tasks = [
+            Task.objects.create(
+                title=f"Задача {i}", due_date=self.due_date, executor=self.employee
+            )
+            for i in range(3)
+        ]
+        response = self.client.post(
+            self.bulk_status_url,
+            {"ids": [task.id for task in tasks], "status": Task.Status.DONE},
+            format="json",
+        )
+        self.assertEqual(response.data, {"updated": 3})
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.active_tasks_count, 0)
+
+        response = self.client.post(
+            self.bulk_status_url,
+            {"ids": [999999], "status": Task.Status.DONE},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ReportCacheTests(TestCase):
+    """
+    Тесты кэша отчетов busy-employees и important-tasks.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email="cache@example.com",
+            password="cachepass",
+            full_name="Cache User",
+            position="Manager",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("tasks-busy-employees")
+        self.due_date = date.today() + timedelta(days=3)
+        Task.objects.create(title="Задача", due_date=self.due_date, executor=self.user)
+
+    def test_report_is_cached_until_write(self):
+        """Повторный запрос без записей выполняет только агрегаты для ETag."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.data[0]["active_tasks_count"], 1)
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
+
+        Task.objects.create(title="Еще", due_date=self.due_date, executor=self.user)
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data[0]["active_tasks_count"], 2)
+
+    def test_bulk_write_invalidates_cache(self):
+        """Массовые операции тоже сбрасывают кэш."""
+        self.client.get(self.url)
+        self.client.post(
+            reverse("tasks-bulk-status"),
+            {"ids": list(Task.objects.values_list("pk", flat=True)), "status": "done"},
+            format="json",
+        )
+        self.assertEqual(self.client.get(self.url).data, [])
+
+    def test_cache_stats(self):
+        """Статистика попаданий доступна только staff."""
+        url = reverse("tasks-important-tasks")
+        self.client.get(url)
+        self.client.get(url)
+        stats = self.client.get(reverse("tasks-report-cache-stats")).data
+        self.assertGreaterEqual(stats["reports"]["important-tasks"]["hits"], 1)
+
+        self.user.is_staff = False
+        self.user.save()
+        response = self.client.get(reverse("tasks-report-cache-stats"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ConditionalGetTests(TestCase):
+    """
+    Тесты условных запросов (ETag / Last-Modified).
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email="etag@example.com",
+            password="etagpass",
+            full_name="Etag User",
+            position="Manager",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.task = Task.objects.create(
+            title="Задача",
+            due_date=date.today() + timedelta(days=3),
+            executor=self.user,
+        )
+
+    def assertNotModified(self, url, queries):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        with self.assertNumQueries(queries):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        return etag
+
+    def test_not_modified_without_serialization(self):
+        """304 на список, задачу и отчеты только по агрегатам."""
+        self.assertNotModified(reverse("tasks-list"), 2)
+        self.assertNotModified(reverse("tasks-detail", kwargs={"pk": self.task.pk}), 1)
+        self.assertNotModified(reverse("tasks-busy-employees"), 2)
+        self.assertNotModified(reverse("tasks-important-tasks"), 2)
+        self.assertNotModified(reverse("users-list"), 1)
+        self.assertNotModified(reverse("users-detail", kwargs={"pk": self.user.pk}), 1)
+
+    def test_etag_changes_on_write(self):
+        """Изменение задачи или вложенного сотрудника меняет ETag."""
+        url = reverse("tasks-detail", kwargs={"pk": self.task.pk})
+        etag = self.assertNotModified(url, 1)
+
+        self.client.patch(
+            reverse("users-detail", kwargs={"pk": self.user.pk}),
+            {"full_name": "Новое имя"},
+            format="json",
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+        list_url = reverse("tasks-list")
+        etag = self.assertNotModified(list_url, 2)
+        self.task.delete()
+        response = self.client.get(list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_report_body_and_etag_change_together(self):
+        """
+        Запись без сигналов (QuerySet.update) меняет и ETag, и тело отчета:
+        кэш не отдает старый отчет под новым ETag, а 304 — под старым.
+        """
+        token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        for number, route in enumerate(
+            ["tasks-busy-employees", "async-tasks-busy-employees"]
+        ):
+            with self.subTest(route=route):
+                url = reverse(route)
+                response = self.client.get(url)
+                etag = response["ETag"]
+
+                title = f"Переименована {number}"
+                Task.objects.filter(pk=self.task.pk).update(
+                    title=title,
+                    updated_at=datetime.now() + timedelta(seconds=number + 1),
+                )
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertNotEqual(response["ETag"], etag)
+                self.assertEqual(
+                    json.loads(response.content)[0]["tasks"][0]["title"], title
+                )
+
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_report_etag_changes_on_counter_rebuild(self):
+        """
+        Пересчет счетчиков не трогает updated_at, но меняет ETag отчета
+        через поколение кэша — старый If-None-Match не дает 304.
+        """
+        token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        for route in ["tasks-busy-employees", "async-tasks-busy-employees"]:
+            with self.subTest(route=route):
+                url = reverse(route)
+                cache.clear()
+                CustomUser.objects.filter(pk=self.user.pk).update(active_tasks_count=5)
+                response = self.client.get(url)
+                etag = response["ETag"]
+                self.assertEqual(
+                    json.loads(response.content)[0]["active_tasks_count"], 5
+                )
+
+                rebuild_active_tasks_counts()
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertNotEqual(response["ETag"], etag)
+                self.assertEqual(
+                    json.loads(response.content)[0]["active_tasks_count"], 1
+                )
+
+    def test_if_modified_since(self):
+        """Last-Modified и If-Modified-Since."""
+        url = reverse("tasks-detail", kwargs={"pk": self.task.pk})
+        last_modified = self.client.get(url)["Last-Modified"]
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_missing_task(self):
+        """Для несуществующей задачи — обычный 404."""
+        response = self.client.get(reverse("tasks-detail", kwargs={"pk": 999999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TaskExportTests(TestCase):
+    """
+    Тесты потоковой выгрузки задач.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email="export@example.com",
+            password="exportpass",
+            full_name="Export User",
+            position="Manager",
+        )
+        self.url = reverse("tasks-export")
+        due_date = date.today() + timedelta(days=3)
+        self.tasks = [
+            Task.objects.create(
+                title=f"Задача {i}",
+                due_date=due_date,
+                executor=self.user if i % 2 else None,
+                creator=self.user,
+            )
+            for i in range(3)
+        ]
+
+    def test_export_requires_auth(self):
+        response = self.client.get(self.url, {"format": "csv"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_export_csv(self):
+        """CSV с заголовком и именами исполнителя и создателя."""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {"format": "csv"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith("id,title,"))
+        self.assertIn("Export User", lines[2])
+
+    def test_export_ndjson(self):
+        """NDJSON: по одному JSON-объекту на строку."""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {"format": "ndjson"})
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+        self.assertEqual([row["id"] for row in rows], [t.id for t in self.tasks])
+        self.assertEqual(rows[1]["executor__full_name"], "Export User")
+        self.assertIsNone(rows[0]["executor_id"])
+
+    def test_export_errors_are_json(self):
+        """Ошибки выгрузки — JSON с Content-Type application/json."""
+        for params in [{"format": "csv"}, {"format": "ndjson"}]:
+            with self.subTest(**params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+                self.assertEqual(response["Content-Type"], "application/json")
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {"format": "csv", "status": "archived"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertIn("status", response.json())
+
+
+class AsyncTaskViewsTests(TestCase):
+    """
+    Тесты асинхронных эндпоинтов: ответы совпадают с TaskViewSet.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email="async@example.com",
+            password="asyncpass",
+            full_name="Async User",
+            position="Manager",
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"email": "async@example.com", "password": "asyncpass"},
+            format="json",
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        due_date = date.today() + timedelta(days=3)
+        self.parent = Task.objects.create(title="Родитель", due_date=due_date)
+        self.task = Task.objects.create(
+            title="Подзадача",
+            due_date=due_date,
+            status=Task.Status.IN_PROGRESS,
+            executor=self.user,
+            parent=self.parent,
+        )
+
+    def assertSameResponse(self, sync_name, async_name, **kwargs):
+        sync_response = self.client.get(reverse(sync_name, **kwargs))
+        async_response = self.client.get(reverse(async_name, **kwargs))
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(async_response.content), sync_response.json())
+        return async_response
+
+    def test_reports_match_sync(self):
+        self.assertSameResponse("tasks-busy-employees", "async-tasks-busy-employees")
+        response = self.assertSameResponse(
+            "tasks-important-tasks", "async-tasks-important-tasks"
+        )
+        self.assertEqual(json.loads(response.content)[0]["task"], "Родитель")
+
+        # ETag отчетов совпадает с синхронной версией
+        response = self.client.get(
+            reverse("async-tasks-busy-employees"),
+            HTTP_IF_NONE_MATCH=self.client.get(reverse("tasks-busy-employees"))["ETag"],
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_and_detail(self):
+        response = self.client.get(reverse("async-tasks-list"), {"page_size": 1})
+        data = json.loads(response.content)
+        self.assertEqual([item["id"] for item in data["results"]], [self.parent.id])
+        self.assertIn("/api/async/tasks/", data["next"])
+
+        self.assertSameResponse(
+            "tasks-detail", "async-tasks-detail", kwargs={"pk": self.task.pk}
+        )
+        response = self.client.get(reverse("async-tasks-detail", kwargs={"pk": 999999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_requires_auth(self):
+        self.client.credentials()
+        response = self.client.get(reverse("async-tasks-busy-employees"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("detail", json.loads(response.content))
+
+
+class SeedAndBenchmarkTests(TestCase):
+    """
+    Тесты генерации данных и набора замеров.
+    """
+
+    def test_seed_tracker(self):
+        """Иерархия задач нужной глубины с согласованными счетчиками."""
+        call_command(
+            "seed_tracker",
+            "--users=5",
+            "--tasks=70",
+            "--depth=3",
+            "--seed=1",
+            stdout=StringIO(),
+        )
+        self.assertEqual(CustomUser.objects.count(), 5)
+        self.assertEqual(Task.objects.count(), 70)
+        self.assertEqual(Task.objects.filter(parent__isnull=True).count(), 10)
+        self.assertTrue(Task.objects.filter(parent__parent__isnull=False).exists())
+        self.assertFalse(
+            Task.objects.filter(parent__parent__parent__isnull=False).exists()
+        )
+        self.assertEqual(find_active_counter_mismatches(), [])
+
+    def test_run_suite(self):
+        """Замеры содержат перцентили и количество запросов по эндпоинтам."""
+        results = run_suite(
+            [30], users_per_task=0.1, depth=2, repeat=2, reset=lambda: None
+        )
+        endpoints = results["30"]["endpoints"]
+        self.assertEqual(endpoints["tasks-create"]["status_codes"], [201])
+        self.assertEqual(endpoints["tasks-list"]["status_codes"], [200])
+        self.assertIn("p95_ms", endpoints["tasks-busy-employees"])
+        self.assertGreater(endpoints["tasks-important-tasks"]["queries"], 0)
+
+
+class RequestInstrumentationTests(TestCase):
+    """
+    Тесты замеров запросов: заголовок Server-Timing и лог медленных запросов.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email="timing@example.com",
+            password="timingpass",
+            full_name="Timing User",
+            position="Manager",
+        )
+        self.client.force_authenticate(user=self.user)
+        for i in range(3):
+            Task.objects.create(
+                title=f"Задача {i}", due_date=date.today() + timedelta(days=3)
+            )
+
+    def test_server_timing_header(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("tasks-list"))
+        timing = response["Server-Timing"]
+        self.assertIn("db;dur=", timing)
+        self.assertIn(f'desc="{len(queries)} queries"', timing)
+        for metric in ("render;dur=", "app;dur=", "total;dur="):
+            self.assertIn(metric, timing)
+
+    @override_settings(SLOW_REQUEST_QUERIES=0)
+    def test_slow_request_log(self):
+        with self.assertLogs("config.instrumentation", "WARNING") as logs:
+            self.client.get(reverse("tasks-busy-employees"))
+        record = json.loads(logs.output[0].partition("slow_request ")[2])
+        self.assertEqual(record["path"], "/api/tasks/busy-employees/")
+        self.assertEqual(record["status"], 200)
+        self.assertGreater(record["queries"], 0)
+        self.assertIn("duplicates", record)
+
+    def test_duplicate_queries_reported(self):
+        stats = QueryStats()
+        for _ in range(3):
+            stats(lambda *args: None, "SELECT 1 WHERE id = %s", [1], False, {})
+        stats(lambda *args: None, "SELECT 2", [], False, {})
+        self.assertEqual(
+            stats.duplicates(), [{"sql": "SELECT 1 WHERE id = %s", "count": 3}]
+        )
+
+    async def test_async_chain(self):
+        """
+        Под ASGI middleware работает асинхронно и считает запросы
+        async-эндпоинтов, выполненные ORM в sync_to_async.
+        """
+
+        async def get_response(request):
+            return HttpResponse()
+
+        self.assertTrue(
+            iscoroutinefunction(RequestInstrumentationMiddleware(get_response))
+        )
+        token = AccessToken.for_user(self.user)
+        response = await AsyncClient().get(
+            reverse("async-tasks-list"), headers={"Authorization": f"Bearer {token}"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queries = int(re.search(r'desc="(\d+) queries"', response["Server-Timing"])[1])
+        self.assertGreater(queries, 0)
+
+    @override_settings(REQUEST_INSTRUMENTATION=False)
+    def test_disabled(self):
+        response = self.client.get(reverse("tasks-list"))
+        self.assertNotIn("Server-Timing", response)
+
+
+class MetricsTests(TestCase):
+    """
+    Тесты метрик Prometheus: гистограммы по маршрутам, кэши, доступ staff.
+    """
+
+    def setUp(self):
+        registry.clear()
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email="metrics@example.com",
+            password="metricspass",
+            full_name="Metrics User",
+            position="Manager",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_route_histograms(self):
+        self.client.get(reverse("tasks-list"))
+        self.client.get(reverse("tasks-busy-employees"))
+        self.client.get(reverse("tasks-busy-employees"))
+
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        text = response.content.decode()
+        self.assertIn(
+            'http_requests_total{method="GET",route="tasks-list",status="200"} 1', text
+        )
+        self.assertIn(
+            'http_request_duration_seconds_count{route="tasks-busy-employees"} 2', text
+        )
+        self.assertIn(
+            'http_request_queries_bucket{route="tasks-list",le="+Inf"} 1', text
+        )
+        self.assertIn('http_response_size_bytes_sum{route="tasks-list"}', text)
+        self.assertIn("# TYPE http_request_db_seconds histogram", text)
+        self.assertIn(
+            'tasks_report_cache_requests_total{report="busy-employees",result="hit"}',
+            text,
+        )
+        self.assertIn('auth_user_cache_requests_total{result="miss"}', text)
+
+    def test_staff_only(self):
+        self.user.is_staff = False
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(METRICS_TOKEN="scrape-secret")
+    def test_scrape_token(self):
+        """Prometheus читает метрики по METRICS_TOKEN без JWT."""
+        client = APIClient()
+        response = client.get(
+            reverse("metrics"), HTTP_AUTHORIZATION="Bearer scrape-secret"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("# TYPE http_requests_total counter", response.content.decode())
+
+        response = client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(
+            client.get(reverse("metrics")).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+        # Токен сборщика не открывает API
+        response = client.get(
+            reverse("tasks-list"), HTTP_AUTHORIZATION="Bearer scrape-secret"
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # JWT staff-пользователя по-прежнему работает
+        token = AccessToken.for_user(self.user)
+        response = client.get(reverse("metrics"), HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_worker_snapshots_merged(self):
+        """Снимки воркеров из METRICS_DIR складываются."""
+        registry.observe("http_request_queries", {"route": "tasks-list"}, 3)
+        with tempfile.TemporaryDirectory() as directory:
+            Path(directory, f"{os.getppid()}.json").write_text(
+                json.dumps(registry.snapshot())
+            )
+            with override_settings(METRICS_DIR=directory):
+                text = render(registry.collect())
+        self.assertIn('http_request_queries_count{route="tasks-list"} 2', text)
+        self.assertIn('http_request_queries_bucket{route="tasks-list",le="2"} 0', text)
+        self.assertIn('http_request_queries_bucket{route="tasks-list",le="5"} 2', text)
+
+    def test_dead_worker_counters_kept(self):
+        """
+        Завершение воркера не уменьшает счетчики и гистограммы /metrics/:
+        они сворачиваются в итог завершившихся воркеров, gauge отбрасываются.
+        """
+        worker = MetricsRegistry()
+        worker.inc("http_requests_total", {"route": "worker-route"}, 5)
+        worker.observe("http_request_queries", {"route": "worker-route"}, 3)
+        worker.register_collector(
+            lambda: [("db_pool_connections", {"alias": "worker"}, 4)]
+        )
+        finished = subprocess.Popen([sys.executable, "-c", "pass"])
+        finished.wait()
+        lines = (
+            'http_requests_total{route="worker-route"}',
+            'http_request_queries_count{route="worker-route"}',
+            'http_request_queries_bucket{route="worker-route",le="+Inf"}',
+        )
+
+        def values(text):
+            found = dict(line.rsplit(" ", 1) for line in text.splitlines())
+            return [float(found.get(line, 0)) for line in lines]
+
+        with tempfile.TemporaryDirectory() as directory:
+            # Живой воркер (родитель тестового процесса) и уже завершившийся
+            for pid in (os.getppid(), finished.pid):
+                Path(directory, f"{pid}.json").write_text(json.dumps(worker.snapshot()))
+            with override_settings(METRICS_DIR=directory):
+                before = render(registry.collect())
+                self.assertFalse(Path(directory, f"{finished.pid}.json").exists())
+                mark_process_dead(os.getppid(), directory)
+                after = render(registry.collect())
+                again = render(registry.collect())
+
+        self.assertEqual(values(before), [10, 2, 2])
+        self.assertEqual(values(after), values(before))
+        self.assertEqual(values(again), values(before))
+        self.assertIn('db_pool_connections{alias="worker"} 4', before)
+        self.assertNotIn('db_pool_connections{alias="worker"}', after)
+
+    def test_pool_metrics(self):
+        """Без DB_CONNECTION_MODE=pool статистики пула нет; gauge воркеров складываются."""
+        self.assertEqual(pool_stats(), {})
+        wrapper = type(connections["default"])
+        with patch.dict(connections.settings["default"]["OPTIONS"], {"pool": True}):
+            # Пул еще не создан: статистика пуста, новый пул не создается
+            with patch.object(wrapper, "_connection_pools", {}, create=True):
+                self.assertEqual(pool_stats(), {})
+                self.assertEqual(wrapper._connection_pools, {})
+            pool = Mock(**{"get_stats.return_value": {"pool_size": 2}})
+            with patch.object(
+                wrapper, "_connection_pools", {"default": pool}, create=True
+            ):
+                self.assertEqual(pool_stats(), {"default": {"pool_size": 2}})
+        snapshot = {
+            "counters": [["db_pool_connections", [["alias", "default"]], 3]],
+            "histograms": [],
+        }
+        text = render([snapshot, snapshot])
+        self.assertIn("# TYPE db_pool_connections gauge", text)
+        self.assertIn('db_pool_connections{alias="default"} 6', text)
+
+
+@override_settings(REPLICA_DATABASES=["replica"])
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Тесты чтения с реплики: безопасные запросы ViewSet-ов на replica,
+    запись и аутентификация — на default, read-your-writes после записи.
+    TransactionTestCase: реплика-зеркало — отдельное соединение и видит
+    только зафиксированные данные.
+    """
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.employee, self.writer = self.login("writer@example.com")
+        _, self.reader = self.login("reader@example.com")
+        Task.objects.create(title="Задача", due_date=date.today() + timedelta(days=3))
+
+    def login(self, email):
+        user = CustomUser.objects.create_user(
+            email=email, password="replicapass", full_name=email, position="Manager"
+        )
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        return user, client
+
+    def get_queries(self, client, method, url, data=None):
+        """SQL-запросы к основной базе и к реплике за один запрос."""
+        with CaptureQueriesContext(connections["default"]) as primary:
+            with CaptureQueriesContext(connections["replica"]) as replica:
+                response = getattr(client, method)(url, data, format="json")
+        self.assertLess(response.status_code, 400, response.content)
+        return [q["sql"] for q in primary], [q["sql"] for q in replica]
+
+    def test_safe_requests_read_from_replica(self):
+        for url in (
+            reverse("tasks-list"),
+            reverse("tasks-busy-employees"),
+            reverse("tasks-important-tasks"),
+            reverse("users-list"),
+        ):
+            user_cache.clear()
+            primary, replica = self.get_queries(self.reader, "get", url)
+            # На основной базе — только загрузка пользователя аутентификацией
+            self.assertEqual(len(primary), 1, url)
+            self.assertIn("users_customuser", primary[0])
+            self.assertTrue(replica, url)
+
+    def test_read_your_writes(self):
+        primary, replica = self.get_queries(
+            self.writer,
+            "post",
+            reverse("tasks-list"),
+            {
+                "title": "Новая",
+                "due_date": date.today() + timedelta(days=3),
+                "executor_id": self.employee.id,
+            },
+        )
+        self.assertEqual(replica, [])
+
+        # Автор изменения читает с основной базы, остальные — с реплики.
+        # Клиент с JWT без cookie — по отметке в кэше
+        cookies = self.writer.cookies
+        self.writer.cookies = SimpleCookie()
+        primary, replica = self.get_queries(self.writer, "get", reverse("tasks-list"))
+        self.assertEqual(replica, [])
+        self.assertTrue(primary)
+
+        # Клиент с cookie — и в воркере, где отметки в кэше нет
+        self.writer.cookies = cookies
+        cache.clear()
+        primary, replica = self.get_queries(self.writer, "get", reverse("tasks-list"))
+        self.assertEqual(replica, [])
+        primary, replica = self.get_queries(self.reader, "get", reverse("tasks-list"))
+        self.assertTrue(replica)
+
+        # Cookie другого пользователя не действует
+        self.reader.cookies = self.writer.cookies
+        primary, replica = self.get_queries(self.reader, "get", reverse("tasks-list"))
+        self.assertTrue(replica)
+
+        # По истечении REPLICA_STICKY_SECONDS автор снова читает с реплики
+        with override_settings(REPLICA_STICKY_SECONDS=0):
+            with patch("time.time", return_value=time.time() + 1):
+                primary, replica = self.get_queries(
+                    self.writer, "get", reverse("tasks-list")
+                )
+        self.assertTrue(replica)
+
+    def test_router(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Task), "default")
+        self.assertEqual(router.db_for_write(Task), "default")
+        self.assertFalse(router.allow_migrate("replica", "tasks"))
+        self.assertTrue(router.allow_migrate("default", "tasks"))
+
+
+class TaskSearchTests(TestCase):
+    """
+    Тесты поиска задач (на SQLite — поиск подстроки).
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email="search@example.com",
+            password="searchpass",
+            full_name="Search User",
+            position="Manager",
+        )
+        self.executor = CustomUser.objects.create_user(
+            email="petrov@example.com",
+            password="petrovpass",
+            full_name="Петров Иван",
+            position="Developer",
+        )
+        self.client.force_authenticate(user=self.user)
+        due_date = date.today() + timedelta(days=3)
+        self.by_description = Task.objects.create(
+            title="Релиз", description="Подготовить отчет для релиза", due_date=due_date
+        )
+        self.by_title = Task.objects.create(
+            title="Квартальный отчет", due_date=due_date
+        )
+        self.by_executor = Task.objects.create(
+            title="Макет", due_date=due_date, executor=self.executor
+        )
+        Task.objects.create(title="Другое", due_date=due_date)
+        self.url = reverse("tasks-search")
+
+    def test_search_ranking(self):
+        response = self.client.get(self.url, {"q": "отчет"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [task["id"] for task in response.data],
+            [self.by_title.id, self.by_description.id],
+        )
+
+        response = self.client.get(self.url, {"q": "Петров"})
+        self.assertEqual([task["id"] for task in response.data], [self.by_executor.id])
+        self.assertEqual(response.data[0]["executor"]["id"], self.executor.id)
+
+    def test_limit(self):
+        response = self.client.get(self.url, {"q": "отчет", "limit": 1})
+        self.assertEqual([task["id"] for task in response.data], [self.by_title.id])
+
+        response = self.client.get(self.url, {"q": "отчет", "limit": 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("limit", response.data)
+
+    def test_query_required(self):
+        response = self.client.get(self.url, {"q": "  "})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("q", response.data)
+
+
+class AdminTests(TestCase):
+    """
+    Тесты админки на больших таблицах: количество запросов не растет
+    с числом строк, внешние ключи выбираются автодополнением.
+    """
+
+    def setUp(self):
+        self.admin = CustomUser.objects.create_superuser(
+            email="admin@example.com",
+            password="adminpass",
+            full_name="Admin",
+            position="Admin",
+        )
+        self.client.force_login(self.admin)
+
+    def changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow(self):
+        for url in (
+            reverse("admin:tasks_task_changelist"),
+            reverse("admin:users_customuser_changelist"),
+        ):
+            seed_tracker(users=5, tasks=10, depth=2, seed=1)
+            small = self.changelist_queries(url)
+            seed_tracker(users=50, tasks=90, depth=2, seed=2)
+            self.assertEqual(self.changelist_queries(url), small, url)
+
+    def test_change_form_uses_autocomplete(self):
+        seed_tracker(users=20, tasks=20, depth=2, seed=1)
+        task = Task.objects.filter(parent__isnull=False).first()
+        response = self.client.get(reverse("admin:tasks_task_change", args=[task.pk]))
+        content = response.content.decode()
+        for field in ("parent", "executor", "creator"):
+            self.assertIn(f'data-field-name="{field}"', content)
+        # В <select> только статусы и выбранные значения, а не 40 строк таблиц
+        self.assertLess(content.count("<option"), 10)
+
+    def test_paginator_caps_count(self):
+        seed_tracker(users=5, tasks=30, depth=2, seed=1)
+
+        class SmallPaginator(LargeTablePaginator):
+            max_count = 10
+
+        self.assertEqual(SmallPaginator(Task.objects.all(), 5).count, 10)
+        self.assertEqual(SmallPaginator(Task.objects.filter(parent=None), 5).count, 10)
+        self.assertEqual(LargeTablePaginator(Task.objects.all(), 5).count, 30)
+
+
+class TaskFilterTests(TestCase):
+    """
+    Тесты фильтров и сортировки списка задач: выборка делается в базе,
+    страница по-прежнему читается одним SELECT.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email="filter@example.com",
+            password="filterpass",
+            full_name="Filter User",
+            position="Manager",
+        )
+        self.other = CustomUser.objects.create_user(
+            email="other@example.com",
+            password="otherpass",
+            full_name="Other User",
+            position="Developer",
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"email": "filter@example.com", "password": "filterpass"},
+            format="json",
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        today = date.today()
+        self.parent = Task.objects.create(
+            title="Родитель", due_date=today + timedelta(days=10), creator=self.user
+        )
+        self.overdue = Task.objects.create(
+            title="Просрочена",
+            due_date=today - timedelta(days=2),
+            status=Task.Status.IN_PROGRESS,
+            executor=self.other,
+            parent=self.parent,
+        )
+        self.done = Task.objects.create(
+            title="Завершена",
+            due_date=today - timedelta(days=5),
+            status=Task.Status.DONE,
+            executor=self.user,
+            parent=self.parent,
+            creator=self.user,
+        )
+        self.list_url = reverse("tasks-list")
+
+    def ids(self, url=None, **params):
+        response = self.client.get(url or self.list_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        return [item["id"] for item in json.loads(response.content)["results"]]
+
+    def test_filters(self):
+        cases = [
+            ({"status": "done"}, [self.done.id]),
+            ({"status": "new,done"}, [self.parent.id, self.done.id]),
+            ({"executor": self.other.id}, [self.overdue.id]),
+            ({"unassigned": "true"}, [self.parent.id]),
+            ({"parent": self.parent.id}, [self.overdue.id, self.done.id]),
+            ({"due_before": date.today().isoformat()}, [self.overdue.id, self.done.id]),
+            ({"due_after": date.today().isoformat()}, [self.parent.id]),
+            ({"overdue": "true"}, [self.overdue.id]),
+            ({"overdue": "false"}, [self.parent.id, self.done.id]),
+            ({"created_by_me": "true"}, [self.parent.id, self.done.id]),
+            ({"created_by_me": "true", "status": "done"}, [self.done.id]),
+        ]
+        for params, expected in cases:
+            with self.subTest(params=params):
+                self.assertEqual(self.ids(**params), expected)
+
+    def test_status_repeated(self):
+        response = self.client.get(f"{self.list_url}?status=new&status=in_progress")
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]],
+            [self.parent.id, self.overdue.id],
+        )
+
+    def test_ordering_with_cursor(self):
+        self.assertEqual(
+            self.ids(ordering="due_date"),
+            [self.done.id, self.overdue.id, self.parent.id],
+        )
+        response = self.client.get(
+            self.list_url, {"ordering": "-due_date", "page_size": 2}
+        )
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]],
+            [self.parent.id, self.overdue.id],
+        )
+        response = self.client.get(response.data["next"])
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]], [self.done.id]
+        )
+
+    def test_cursor_pages_through_equal_keys(self):
+        """
+        Задачи с одинаковым сроком: страницы идут по позиции (due_date, id)
+        без OFFSET, без пропусков и повторов и при вставке между запросами.
+        """
+        due_date = date.today() + timedelta(days=30)
+        tasks = [
+            Task.objects.create(title=f"Срок {i}", due_date=due_date) for i in range(7)
+        ]
+        expected = [self.done.id, self.overdue.id, self.parent.id] + [
+            task.id for task in tasks
+        ]
+        params = {"ordering": "due_date", "page_size": 3}
+        response = self.client.get(self.list_url, params)
+        seen = [item["id"] for item in response.data["results"]]
+        previous = None
+        while response.data["next"]:
+            Task.objects.create(title="Вставлена", due_date=date.today())
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(response.data["next"])
+            self.assertFalse(
+                [q["sql"] for q in queries if "OFFSET" in q["sql"]], queries
+            )
+            previous = response.data["previous"]
+            seen.extend(item["id"] for item in response.data["results"])
+        self.assertEqual(seen, expected)
+
+        # Назад от последней страницы — предыдущие задачи с тем же сроком
+        response = self.client.get(previous)
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]],
+            [task.id for task in tasks[3:6]],
+        )
+        response = self.client.get(self.list_url, {"cursor": "cD1bIngiXQ=="})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalid_params(self):
+        for params in (
+            {"status": "archived"},
+            {"executor": "abc"},
+            {"overdue": "maybe"},
+            {"due_before": "2026-02-30"},
+            {"ordering": "title"},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(self.list_url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(next(iter(params)), response.data)
+
+    def test_filtered_page_is_one_select(self):
+        self.ids()  # пользователь JWT попадает в кэш
+        # SELECT страницы и два агрегата для ETag (оба по отфильтрованным задачам)
+        with self.assertNumQueries(3):
+            self.ids(status="in_progress", executor=self.other.id)
+
+    def test_export_and_async_list_use_filters(self):
+        response = self.client.get(
+            reverse("tasks-export"), {"format": "ndjson", "overdue": "true"}
+        )
+        rows = [json.loads(line) for line in response.streaming_content]
+        self.assertEqual([row["id"] for row in rows], [self.overdue.id])
+
+        params = {"parent": self.parent.id, "ordering": "-created_at"}
+        self.assertEqual(
+            self.ids(reverse("async-tasks-list"), **params), self.ids(**params)
+        )
+        response = self.client.get(reverse("async-tasks-list"), {"status": "archived"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class SparseFieldsetTests(TestCase):
+    """
+    Тесты ?fields= и ?expand=: в ответе и в SELECT только выбранные поля,
+    нераскрытые связи отдаются как id без JOIN.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email="sparse@example.com",
+            password="sparsepass",
+            full_name="Sparse User",
+            position="Manager",
+        )
+        self.client.force_authenticate(user=self.user)
+        due_date = date.today() + timedelta(days=3)
+        self.parent = Task.objects.create(
+            title="Родитель", due_date=due_date, creator=self.user
+        )
+        self.task = Task.objects.create(
+            title="Подзадача",
+            due_date=due_date,
+            executor=self.user,
+            creator=self.user,
+            parent=self.parent,
+        )
+        self.list_url = reverse("tasks-list")
+
+    def page_select(self, params):
+        """Ответ списка и SQL страницы (последний запрос)."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        return response.data["results"], queries.captured_queries[-1]["sql"]
+
+    def test_fields(self):
+        results, sql = self.page_select({"fields": "id,title,status"})
+        self.assertEqual(
+            results[1], {"id": self.task.id, "title": "Подзадача", "status": "new"}
+        )
+        self.assertNotIn("JOIN", sql)
+        self.assertNotIn('"description"', sql)
+
+    def test_flat_and_expanded_references(self):
+        results, sql = self.page_select(
+            {"fields": "id,creator,executor,parent", "expand": "executor"}
+        )
+        self.assertEqual(results[1]["creator"], self.user.id)
+        self.assertEqual(results[1]["parent"], self.parent.id)
+        self.assertEqual(results[1]["executor"]["email"], "sparse@example.com")
+        self.assertEqual(sql.count("JOIN"), 1)
+
+        # Только expand: все поля, нераскрытые связи — id
+        results, sql = self.page_select({"expand": ""})
+        self.assertEqual(results[1]["executor"], self.user.id)
+        self.assertIn("title", results[1])
+        self.assertNotIn("JOIN", sql)
+
+    def test_pages_without_extra_queries(self):
+        Task.objects.bulk_create(
+            Task(title=f"Задача {i}", due_date=self.task.due_date) for i in range(5)
+        )
+        self.client.get(self.list_url)
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                self.list_url, {"fields": "id", "page_size": 3, "ordering": "due_date"}
+            )
+        with self.assertNumQueries(3):
+            self.client.get(response.data["next"])
+
+    def test_default_unchanged_and_detail(self):
+        results, _ = self.page_select({})
+        self.assertEqual(results[1]["executor"]["id"], self.user.id)
+        response = self.client.get(
+            reverse("tasks-detail", kwargs={"pk": self.task.pk}), {"fields": "id,title"}
+        )
+        self.assertEqual(response.data, {"id": self.task.id, "title": "Подзадача"})
+
+    def test_invalid(self):
+        for params in ({"fields": "id,secret"}, {"expand": "parent"}, {"fields": ""}):
+            with self.subTest(params=params):
+                response = self.client.get(self.list_url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_write_ignores_fields(self):
+        response = self.client.patch(
+            reverse("tasks-detail", kwargs={"pk": self.task.pk}) + "?fields=id",
+            {"title": "Новое название"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["title"], "Новое название")
+
+    def test_async_list(self):
+        token = AccessToken.for_user(self.user)
+        self.client.force_authenticate(user=None)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        params = {"fields": "id,executor", "expand": "executor"}
+        response = self.client.get(reverse("async-tasks-list"), params)
+        self.assertEqual(
+            json.loads(response.content)["results"],
+            self.client.get(self.list_url, params).json()["results"],
+        )
+
+
+class FastReadTests(TestCase):
+    """
+    Тесты быстрого пути сериализации: вывод совпадает с TaskSerializer
+    байт в байт.
+    """
+
+    def setUp(self):
+        seed_tracker(users=5, tasks=40, depth=3, seed=1)
+        CustomUser.objects.filter(pk=CustomUser.objects.first().pk).update(
+            avatar="avatars/photo.png", phone="+7 900 000-00-00"
+        )
+        Task.objects.filter(pk=Task.objects.last().pk).update(executor=None)
+        self.request = APIRequestFactory().get("/api/tasks/")
+
+    def test_output_matches_task_serializer(self):
+        queryset = Task.objects.order_by("created_at", "id")
+        for context in ({}, {"request": self.request}):
+            with self.subTest(context=context):
+                expected = TaskSerializer(
+                    queryset.select_related("creator", "executor"),
+                    many=True,
+                    context=context,
+                ).data
+                actual = TaskRowSerializer(
+                    TaskRowSerializer.values(queryset), context=context
+                ).data
+                self.assertEqual(
+                    JSONRenderer().render(actual), JSONRenderer().render(expected)
+                )
+        self.assertIn(
+            b"http://testserver/media/avatars/photo.png", JSONRenderer().render(actual)
+        )
+
+    def test_busy_employees_matches_task_serializer(self):
+        report = get_busy_employees()
+        self.assertTrue(report)
+        for item in report:
+            employee = CustomUser.objects.get(pk=item["employee"]["id"])
+            tasks = Task.objects.filter(
+                executor=employee, status__in=Task.ACTIVE_STATUSES
+            ).select_related("creator", "executor")
+            self.assertEqual(
+                JSONRenderer().render(item),
+                JSONRenderer().render(
+                    {
+                        "employee": UserShortSerializer(employee).data,
+                        "active_tasks_count": employee.active_tasks_count,
+                        "tasks": TaskSerializer(tasks, many=True).data,
+                    }
+                ),
+            )
+
+    def test_list_uses_rows(self):
+        user = CustomUser.objects.first()
+        client = APIClient()
+        client.force_authenticate(user=user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse("tasks-list"), {"page_size": 5})
+        # Страница читается values() — только столбцы вывода
+        self.assertNotIn("password", queries.captured_queries[-1]["sql"])
+        tasks = Task.objects.select_related("creator", "executor").order_by(
+            "created_at", "id"
+        )[:5]
+        request = APIRequestFactory().get(reverse("tasks-list"))
+        self.assertEqual(
+            JSONRenderer().render(response.data["results"]),
+            JSONRenderer().render(
+                TaskSerializer(tasks, many=True, context={"request": request}).data
+            ),
+        )
+
+    def test_benchmark(self):
+        results = benchmark_serializers(limit=40, repeat=1)
+        self.assertEqual(results["rows"], 40)
+        self.assertGreater(results["speedup"], 1)
+
+
+class FastJSONTests(TestCase):
+    """
+    Тесты JSON на orjson: вывод совпадает с JSONRenderer DRF,
+    без orjson используются стандартные классы.
+    """
+
+    payload = {
+        "due_date": date(2026, 10, 17),
+        "created_at": datetime(2026, 10, 17, 9, 30, 15, 123456),
+        "created_at_utc": datetime(2026, 10, 17, 9, 30, tzinfo=dt_timezone.utc),
+        "created_at_msk": datetime(
+            2026, 10, 17, 9, 30, tzinfo=dt_timezone(timedelta(hours=3))
+        ),
+        "status_label": Task.Status.IN_PROGRESS.label,
+        "status": Task.Status.DONE,
+        "amount": Decimal("12.50"),
+        "duration": timedelta(minutes=5),
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "title": "Отчет за квартал",
+        7: ["вложенный", {"список": [1, 2.5, None, True]}],
+    }
+
+    def test_render_matches_drf(self):
+        expected = JSONRenderer().render(self.payload)
+        self.assertEqual(FastJSONRenderer().render(self.payload), expected)
+        self.assertIn("В работе".encode(), expected)
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+        # С отступами — стандартный json
+        self.assertEqual(
+            FastJSONRenderer().render(self.payload, "application/json; indent=2"),
+            JSONRenderer().render(self.payload, "application/json; indent=2"),
+        )
+
+    def test_parse(self):
+        body = '{"title": "Задача", "ids": [1, 2]}'.encode()
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body)), {"title": "Задача", "ids": [1, 2]}
+        )
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"title": '))
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"value": NaN}'))
+
+    def test_fallback_without_orjson(self):
+        with patch.object(fast_json, "orjson", None):
+            self.assertEqual(
+                FastJSONRenderer().render(self.payload),
+                JSONRenderer().render(self.payload),
+            )
+            self.assertEqual(FastJSONParser().parse(io.BytesIO(b"[1]")), [1])
+
+    def test_api_uses_fast_json(self):
+        user = CustomUser.objects.create_user(
+            email="json@example.com",
+            password="jsonpass",
+            full_name="Json User",
+            position="Manager",
+        )
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.post(
+            reverse("tasks-list"),
+            data=b'{"title": "Task", "due_date": "2099-01-01", "executor_id": null',
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("JSON parse error", response.data["detail"])
+        response = client.get(reverse("tasks-list"))
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+
+    def test_benchmark(self):
+        seed_tracker(users=3, tasks=20, depth=2, seed=1)
+        results = benchmark_json(limit=20, repeat=1)
+        self.assertTrue(results["identical"])
+        self.assertGreater(results["render_mb_per_second"]["fast"], 0)
+
+
+class WorkloadSnapshotTests(TestCase):
+    """
+    Тесты снимка загрузки сотрудников и GET /reports/workload/.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.busy = CustomUser.objects.create_user(
+            email="busy@example.com",
+            password="busypass",
+            full_name="Busy User",
+            position="Developer",
+        )
+        self.free = CustomUser.objects.create_user(
+            email="free@example.com",
+            password="freepass",
+            full_name="Free User",
+            position="Developer",
+        )
+        today = date.today()
+        for title, executor, task_status, due_date in [
+            ("Просроченная", self.busy, Task.Status.NEW, today - timedelta(days=2)),
+            ("В работе", self.busy, Task.Status.IN_PROGRESS, today + timedelta(days=3)),
+            ("Старая", self.busy, Task.Status.DONE, today - timedelta(days=10)),
+            ("Готово", self.free, Task.Status.DONE, today + timedelta(days=1)),
+            ("Без исполнителя", None, Task.Status.NEW, today),
+        ]:
+            Task.objects.create(
+                title=title, executor=executor, status=task_status, due_date=due_date
+            )
+        self.client.force_authenticate(user=self.free)
+
+    def test_snapshot_counts(self):
+        refresh_workload_snapshot()
+        busy, free = get_workload()
+        self.assertEqual(busy["employee"], UserShortSerializer(self.busy).data)
+        self.assertEqual((busy["new"], busy["in_progress"], busy["done"]), (1, 1, 1))
+        self.assertEqual((busy["active"], busy["overdue"]), (2, 1))
+        self.assertEqual(busy["nearest_due_date"], date.today() - timedelta(days=2))
+        self.assertEqual(free["employee"]["id"], self.free.pk)
+        self.assertEqual((free["active"], free["done"]), (0, 1))
+        self.assertIsNone(free["nearest_due_date"])
+
+    def test_overdue_uses_local_date(self):
+        """Просрочка считается по местной дате, а не CURRENT_DATE базы (UTC)."""
+        with patch(
+            "tasks.workload.local_today",
+            return_value=date.today() + timedelta(days=5),
+        ):
+            refresh_workload_snapshot()
+        self.assertEqual(get_workload()[0]["overdue"], 2)
+
+    def test_snapshot_changes_only_on_refresh(self):
+        refresh_workload_snapshot()
+        Task.objects.filter(executor=self.busy).update(status=Task.Status.DONE)
+        self.assertEqual(get_workload()[0]["active"], 2)
+        refresh_workload_snapshot()
+        self.assertEqual([row["active"] for row in get_workload()], [0, 0])
+
+    def test_report_requires_snapshot(self):
+        response = self.client.get(reverse("reports-workload"))
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    def test_report_and_etag(self):
+        refresh = refresh_workload_snapshot()
+        response = self.client.get(reverse("reports-workload"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["refreshed_at"], refresh.refreshed_at)
+        self.assertEqual(len(response.data["results"]), 2)
+        response = self.client.get(
+            reverse("reports-workload"), HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_report_queries_do_not_depend_on_tasks(self):
+        refresh_workload_snapshot()
+        self.client.get(reverse("reports-workload"))
+        with CaptureQueriesContext(connection) as before:
+            self.client.get(reverse("reports-workload"))
+        seed_tracker(users=5, tasks=50, depth=2, seed=1)
+        refresh_workload_snapshot()
+        with CaptureQueriesContext(connection) as after:
+            response = self.client.get(reverse("reports-workload"))
+        self.assertEqual(len(before), len(after))
+        self.assertEqual(len(after), 2)
+        self.assertEqual(len(response.data["results"]), 7)
+
+    def test_refresh_command(self):
+        out = StringIO()
+        call_command("refresh_workload", "--once", stdout=out)
+        self.assertIn("Снимок загрузки обновлен", out.getvalue())
+        self.assertEqual(len(get_workload()), 2)
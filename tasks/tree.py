@@ -0,0 +1,95 @@
+"""
+Обход иерархии задач (Task.parent) одним SQL-запросом.
+
+Поддерево и цепочка предков выбираются рекурсивным CTE (WITH RECURSIVE),
+который поддерживают и PostgreSQL, и SQLite. Глубина обхода ограничена,
+а путь из посещенных id защищает от циклов в данных: задача, уже
+встреченная на пути, повторно не добавляется.
+"""
+
+from collections import defaultdict
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+from .models import Task
+
+# Рекурсивная часть присоединяет к узлу дерева следующий уровень:
+# подзадачи (обход вниз) или родительскую задачу (обход вверх)
+SUBTREE_JOIN = "t.parent_id = tree.id"
+ANCESTORS_JOIN = "t.id = tree.parent_id"
+
+
+def hierarchy_sql(join_condition):
+    """SQL рекурсивного CTE, возвращающего id задач, достижимых от стартовой."""
+    table = connection.ops.quote_name(Task._meta.db_table)
+    return (
+        "WITH RECURSIVE tree (id, parent_id, depth, path) AS ("
+        f" SELECT id, parent_id, 0, CAST(',' || id || ',' AS TEXT)"
+        f" FROM {table} WHERE id = %s"
+        " UNION ALL"
+        " SELECT t.id, t.parent_id, tree.depth + 1,"
+        " CAST(tree.path || t.id || ',' AS TEXT)"
+        f" FROM {table} t JOIN tree ON {join_condition}"
+        " WHERE tree.depth < %s AND tree.path NOT LIKE '%%,' || t.id || ',%%'"
+        ") SELECT id FROM tree"
+    )
+
+
+def hierarchy_queryset(task_id, max_depth, join_condition):
+    """Задачи иерархии с подгруженными создателем и исполнителем — один SELECT."""
+    return Task.objects.filter(
+        pk__in=RawSQL(hierarchy_sql(join_condition), (task_id, max_depth))
+    ).select_related("creator", "executor")
+
+
+def get_subtree(task_id, max_depth):
+    """
+    Задача и все ее подзадачи до глубины max_depth в порядке обхода в глубину.
+    Возвращает список пар (задача, глубина) или None, если задачи нет.
+    """
+    tasks = {
+        task.pk: task for task in hierarchy_queryset(task_id, max_depth, SUBTREE_JOIN)
+    }
+    if task_id not in tasks:
+        return None
+
+    children = defaultdict(list)
+    for task in tasks.values():
+        if task.pk != task_id:
+            children[task.parent_id].append(task)
+
+    result = []
+    visited = set()
+    stack = [(tasks[task_id], 0)]
+    while stack:
+        task, depth = stack.pop()
+        if task.pk in visited:
+            continue
+        visited.add(task.pk)
+        result.append((task, depth))
+        stack.extend((child, depth + 1) for child in reversed(children[task.pk]))
+    return result
+
+
+def get_ancestors(task_id, max_depth):
+    """
+    Цепочка предков задачи от корня до непосредственного родителя
+    (не более max_depth уровней). Возвращает список пар (задача, глубина),
+    где глубина — расстояние до задачи, или None, если задачи нет.
+    """
+    tasks = {
+        task.pk: task for task in hierarchy_queryset(task_id, max_depth, ANCESTORS_JOIN)
+    }
+    if task_id not in tasks:
+        return None
+
+    chain = []
+    visited = {task_id}
+    parent_id = tasks[task_id].parent_id
+    while parent_id in tasks and parent_id not in visited:
+        visited.add(parent_id)
+        chain.append((tasks[parent_id], len(chain) + 1))
+        parent_id = tasks[parent_id].parent_id
+    chain.reverse()
+    return chain
@@ -1,10 +1,30 @@
 from rest_framework.routers import SimpleRouter
 from django.urls import path, include
-from .views import TaskViewSet
+
+from . import async_views
+from .views import TaskViewSet, WorkloadReportView
 
 router = SimpleRouter()
 router.register(r"tasks", TaskViewSet, basename="tasks")
 
 urlpatterns = [
     path("", include(router.urls)),
+    path("reports/workload/", WorkloadReportView.as_view(), name="reports-workload"),
+    # Асинхронные версии (эффективны под ASGI, см. README)
+    path("async/tasks/", async_views.task_list, name="async-tasks-list"),
+    path(
+        "async/tasks/<int:pk>/",
+        async_views.task_detail,
+        name="async-tasks-detail",
+    ),
+    path(
+        "async/tasks/busy-employees/",
+        async_views.busy_employees,
+        name="async-tasks-busy-employees",
+    ),
+    path(
+        "async/tasks/important-tasks/",
+        async_views.important_tasks,
+        name="async-tasks-important-tasks",
+    ),
 ]
@@ -1,26 +1,64 @@
-from django.db.models import Count, Q
-from rest_framework import viewsets, permissions
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from config.conditional import (
+    ConditionalGetMixin,
+    aggregate_state,
+    make_validators,
+    not_modified_response,
+    set_validators,
+    state_validators,
+)
+from config.fieldsets import SparseFieldsetMixin
+from config.replicas import ReplicaReadMixin
 from users.models import CustomUser
 from .models import Task
-from .serializers import TaskSerializer, UserShortSerializer
+from .bulk import bulk_create_tasks, bulk_set_status, bulk_update_tasks
+from .export import CSVExportRenderer, NDJSONExportRenderer, export_rows
+from .fast_read import TaskRowSerializer
+from .filters import TaskFilterBackend
+from .important_tasks import get_important_tasks
+from .pagination import TaskCursorPagination
+from .report_cache import cached_report, get_cache_stats, get_generation
+from .search import search_tasks
+from .serializers import TaskBulkStatusSerializer, TaskSerializer
+from .services import get_busy_employees
+from .tree import get_ancestors, get_subtree
+from .workload import get_workload, last_refresh
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(
+    ReplicaReadMixin, ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet
+):
     """
     ViewSet для управления задачами.
     Реализует CRUD-операции:
-    - GET /tasks/ — список всех задач
+    - GET /tasks/ — список задач (курсорная пагинация, фильтры tasks.filters)
     - GET /tasks/<id>/ — получить задачу
     - POST /tasks/ — создать новую задачу
     - PUT/PATCH /tasks/<id>/ — обновить задачу
     - DELETE /tasks/<id>/ — удалить задачу
+    - GET /tasks/<id>/tree/ — задача со всеми подзадачами
+    - GET /tasks/<id>/ancestors/ — цепочка родительских задач
+    - POST/PATCH /tasks/bulk/ — массовое создание/обновление задач
+    - POST /tasks/bulk-status/ — массовая смена статуса
+    - GET /tasks/report-cache-stats/ — статистика кэша отчетов
+    - GET /tasks/export/?format=csv|ndjson — потоковая выгрузка задач
+    - GET /tasks/search/?q= — полнотекстовый поиск задач
+    Список, задача и отчеты поддерживают условные запросы (ETag/Last-Modified).
+    Список, задача и поиск поддерживают выборочные поля (?fields=, ?expand=).
     """
 
-    queryset = Task.objects.all()
+    # Создатель и исполнитель подгружаются JOIN-ом: страница — один SELECT
+    queryset = Task.objects.select_related("creator", "executor")
     serializer_class = TaskSerializer
+    pagination_class = TaskCursorPagination
+    filter_backends = [TaskFilterBackend]
     permission_classes = [permissions.IsAuthenticated]  # доступ только авторизованным
 
     def perform_create(self, serializer):
@@ -30,41 +68,69 @@ class TaskViewSet(viewsets.ModelViewSet):
         """
         serializer.save(creator=self.request.user)
 
+    def use_fast_read(self):
+        """
+        Страница списка без ?fields=/?expand= строится из строк values()
+        (tasks.fast_read) — вывод тот же, что у TaskSerializer.
+        """
+        return (
+            self.action == "list"
+            and self.paginator is not None
+            and self.get_fieldset() is None
+        )
+
+    def paginate_queryset(self, queryset):
+        if self.use_fast_read():
+            queryset = TaskRowSerializer.values(queryset)
+        return super().paginate_queryset(queryset)
+
+    def get_serializer(self, *args, **kwargs):
+        if kwargs.get("many") and self.use_fast_read():
+            return TaskRowSerializer(*args, context=self.get_serializer_context())
+        return super().get_serializer(*args, **kwargs)
+
+    def get_list_state(self, queryset):
+        """
+        Состояние задач и сотрудников: данные сотрудников вложены в задачи,
+        поэтому их изменение тоже меняет ETag.
+        """
+        return [aggregate_state(queryset), aggregate_state(CustomUser.objects.all())]
+
+    def get_detail_state(self, pk):
+        """updated_at задачи, ее создателя и исполнителя одним запросом."""
+        row = (
+            Task.objects.filter(pk=pk)
+            .values_list("updated_at", "creator__updated_at", "executor__updated_at")
+            .first()
+        )
+        return list(row) if row else None
+
+    def report_response(self, request, name, compute):
+        """
+        Отчет из кэша с проверкой ETag по состоянию всех задач и сотрудников
+        и поколению кэша отчетов: записи без updated_at (пересчет счетчиков
+        через QuerySet.update) сдвигают поколение и тоже меняют ETag.
+        Отчет кэшируется под тем же ETag, поэтому тело всегда соответствует
+        заголовку, а 304 — отданному ранее телу.
+        """
+        etag, timestamp = state_validators(
+            f"{name}:{get_generation()}", self.get_list_state(Task.objects.all())
+        )
+        response = not_modified_response(request, etag, timestamp) or Response(
+            cached_report(name, etag, compute)
+        )
+        return set_validators(response, etag, timestamp)
+
     @action(detail=False, methods=["get"], url_path="busy-employees")
     def busy_employees(self, request):
         """
         Специальный эндпоинт: список сотрудников по загрузке.
         Возвращает сотрудников с количеством активных задач (new, in_progress),
         отсортированных по количеству задач по убыванию.
+        Число SQL-запросов не зависит от количества сотрудников и задач.
+        Результат кэшируется до следующей записи задач или сотрудников.
         """
-        employees = (
-            CustomUser.objects.annotate(
-                active_tasks_count=Count(
-                    "tasks",
-                    filter=Q(
-                        tasks__status__in=[Task.Status.NEW, Task.Status.IN_PROGRESS]
-                    ),
-                )
-            )
-            .filter(active_tasks_count__gt=0)
-            .order_by("-active_tasks_count")
-        )
-
-        # Формируем список для ответа
-        data = []
-        for emp in employees:
-            tasks = emp.tasks.filter(
-                status__in=[Task.Status.NEW, Task.Status.IN_PROGRESS]
-            )
-            data.append(
-                {
-                    "employee": UserShortSerializer(emp).data,
-                    "active_tasks_count": emp.active_tasks_count,
-                    "tasks": TaskSerializer(tasks, many=True).data,
-                }
-            )
-
-        return Response(data)
+        return self.report_response(request, "busy-employees", get_busy_employees)
 
     @action(detail=False, methods=["get"], url_path="important-tasks")
     def important_tasks(self, request):
@@ -72,60 +138,186 @@ class TaskViewSet(viewsets.ModelViewSet):
         Эндпоинт "Важные задачи":
         - Задачи без исполнителя, но от которых зависят задачи в работе
         - Определение сотрудников, кто может их взять
+        Расчет выполняется в tasks.important_tasks за фиксированное число запросов.
+        Результат кэшируется до следующей записи задач или сотрудников.
         """
-        candidate_tasks = Task.objects.filter(executor__isnull=True)
-        candidate_tasks = candidate_tasks.filter(
-            subtasks__status__in=[Task.Status.IN_PROGRESS, Task.Status.DONE]
-        ).distinct()
+        return self.report_response(request, "important-tasks", get_important_tasks)
 
-        employees_with_load = CustomUser.objects.annotate(
-            active_tasks_count=Count(
-                "tasks",
-                filter=Q(tasks__status__in=[Task.Status.NEW, Task.Status.IN_PROGRESS]),
-            )
-        )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="report-cache-stats",
+        permission_classes=[permissions.IsAdminUser],
+    )
+    def report_cache_stats(self, request):
+        """
+        Попадания и промахи кэша отчетов в текущем процессе (только для staff).
+        """
+        return Response(get_cache_stats())
 
-        # Наименее загруженный
-        min_load = (
-            employees_with_load.aggregate(
-                min_count=Count(
-                    "tasks",
-                    filter=Q(
-                        tasks__status__in=[Task.Status.NEW, Task.Status.IN_PROGRESS]
-                    ),
-                )
-            )["min_count"]
-            or 0
-        )
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        Поиск задач по названию, описанию и имени исполнителя (?q=),
+        самые релевантные первыми; ?limit= — не больше TASKS_SEARCH_MAX_RESULTS.
+        """
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            raise ValidationError({"q": "Обязательный параметр."})
+        value = request.query_params.get("limit", settings.TASKS_SEARCH_MAX_RESULTS)
+        try:
+            limit = int(value)
+        except ValueError:
+            raise ValidationError({"limit": "Должно быть целым числом."})
+        if not 1 <= limit <= settings.TASKS_SEARCH_MAX_RESULTS:
+            raise ValidationError(
+                {"limit": f"Должно быть от 1 до {settings.TASKS_SEARCH_MAX_RESULTS}."}
+            )
+        tasks = search_tasks(text, limit, self.get_queryset())
+        return Response(self.get_serializer(tasks, many=True).data)
 
-        result = []
-        for task in candidate_tasks:
-            available_employees = set()
-
-            # Наименее загруженные сотрудники
-            least_loaded = employees_with_load.filter(active_tasks_count=min_load)
-            available_employees.update([f"{u.full_name}" for u in least_loaded])
-            # Исполнители подзадач
-            subtask_executors = task.subtasks.exclude(
-                executor__isnull=True
-            ).values_list("executor__full_name", flat=True)
-            available_employees.update(subtask_executors)
-
-            # Сотрудник, выполняющий родительскую задачу
-            if task.parent and task.parent.executor:
-                parent_executor = task.parent.executor
-                parent_active_tasks_count = parent_executor.tasks.filter(
-                    status__in=[Task.Status.NEW, Task.Status.IN_PROGRESS]
-                ).count()
-                if parent_active_tasks_count <= min_load + 2:
-                    available_employees.add(parent_executor.full_name)
-
-            result.append(
+    def get_max_depth(self):
+        """
+        Глубина обхода иерархии из параметра ?max_depth=,
+        не больше TASKS_TREE_MAX_DEPTH.
+        """
+        value = self.request.query_params.get("max_depth")
+        if value is None:
+            return settings.TASKS_TREE_MAX_DEPTH
+        try:
+            max_depth = int(value)
+        except ValueError:
+            raise ValidationError({"max_depth": "Должно быть целым числом."})
+        if not 0 <= max_depth <= settings.TASKS_TREE_MAX_DEPTH:
+            raise ValidationError(
                 {
-                    "task": task.title,
-                    "due_date": task.due_date,
-                    "available_employees": list(available_employees),
+                    "max_depth": "Должно быть от 0 до "
+                    f"{settings.TASKS_TREE_MAX_DEPTH}."
                 }
             )
+        return max_depth
+
+    def hierarchy_response(self, loader):
+        """
+        Задачи иерархии в формате TaskSerializer с полем depth.
+        loader — get_subtree или get_ancestors.
+        """
+        try:
+            task_id = int(self.kwargs["pk"])
+        except ValueError:
+            raise NotFound()
+        nodes = loader(task_id, self.get_max_depth())
+        if nodes is None:
+            raise NotFound()
+        return Response(
+            [
+                {**self.get_serializer(task).data, "depth": depth}
+                for task, depth in nodes
+            ]
+        )
+
+    @action(detail=True, methods=["get"])
+    def tree(self, request, pk=None):
+        """
+        Поддерево задачи одним SQL-запросом (рекурсивный CTE):
+        сама задача и все ее подзадачи в порядке обхода в глубину.
+        depth — уровень относительно запрошенной задачи.
+        """
+        return self.hierarchy_response(get_subtree)
+
+    @action(detail=True, methods=["get"])
+    def ancestors(self, request, pk=None):
+        """
+        Цепочка родительских задач одним SQL-запросом (рекурсивный CTE)
+        от корня до непосредственного родителя.
+        depth — расстояние до запрошенной задачи.
+        """
+        return self.hierarchy_response(get_ancestors)
+
+    @action(detail=False, methods=["post", "patch"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Массовые операции в одной транзакции:
+        - POST — создать список задач (создатель — текущий пользователь)
+        - PATCH — частично обновить список задач, у каждого элемента есть id
+        При ошибках возвращается 400 и список ошибок по элементам, ничего
+        не сохраняется.
+        """
+        if request.method == "POST":
+            tasks = bulk_create_tasks(request.data, creator=request.user)
+            response_status = status.HTTP_201_CREATED
+        else:
+            tasks = bulk_update_tasks(request.data)
+            response_status = status.HTTP_200_OK
+        return Response(
+            self.get_serializer(tasks, many=True).data, status=response_status
+        )
+
+    @action(detail=False, methods=["post"], url_path="bulk-status")
+    def bulk_status(self, request):
+        """
+        Массовая смена статуса: {"ids": [...], "status": "done"}.
+        Выполняется одним UPDATE, возвращает количество измененных задач.
+        """
+        serializer = TaskBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        updated = bulk_set_status(
+            serializer.validated_data["ids"], serializer.validated_data["status"]
+        )
+        return Response({"updated": updated})
+
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=[CSVExportRenderer, NDJSONExportRenderer],
+    )
+    def export(self, request):
+        """
+        Потоковая выгрузка задач в CSV или NDJSON (?format=csv|ndjson).
+        Учитывает те же фильтры, что и список. Строки читаются серверным
+        курсором и сразу отправляются клиенту, поэтому память воркера
+        не растет с количеством задач.
+        """
+        renderer = request.accepted_renderer
+        queryset = self.filter_queryset(self.get_queryset())
+        # Строки читаются после выхода из представления — закрепляем базу,
+        # выбранную для запроса (реплика или основная)
+        rows = export_rows(queryset.using(queryset.db))
+        response = StreamingHttpResponse(
+            renderer.stream(rows),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="tasks.{renderer.format}"'
+        )
+        return response
 
-        return Response(result)
+
+class WorkloadReportView(ReplicaReadMixin, APIView):
+    """
+    GET /reports/workload/ — загрузка сотрудников из снимка (tasks.workload):
+    задачи по статусам, просроченные и ближайший срок активной задачи.
+    refreshed_at — время обновления снимка; ETag меняется только после
+    обновления, поэтому повторные запросы дашборда получают 304.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        refresh = last_refresh()
+        if refresh is None:
+            return Response(
+                {"detail": "Снимок загрузки еще не построен (refresh_workload)."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        etag, timestamp = make_validators(
+            ["workload", refresh.refreshed_at.isoformat()], refresh.refreshed_at
+        )
+        response = not_modified_response(request, etag, timestamp) or Response(
+            {
+                "refreshed_at": refresh.refreshed_at,
+                "refresh_interval": settings.WORKLOAD_REFRESH_INTERVAL,
+                "results": get_workload(),
+            }
+        )
+        return set_validators(response, etag, timestamp)
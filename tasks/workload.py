@@ -0,0 +1,133 @@
+"""
+Снимок загрузки сотрудников для дашбордов (GET /reports/workload/).
+
+Загрузка — количество задач по статусам, просроченные активные задачи
+и ближайший срок активной задачи — считается одной группировкой tasks_task
+по исполнителю и сохраняется в tasks_workload_snapshot (WorkloadSnapshot).
+Эндпоинт читает готовые строки, поэтому его стоимость зависит от числа
+сотрудников, а не задач.
+
+На PostgreSQL снимок — материализованное представление: обновление
+REFRESH MATERIALIZED VIEW CONCURRENTLY не блокирует чтение отчета.
+На других базах (SQLite в тестах) — таблица, которая пересчитывается
+в транзакции (DELETE + INSERT ... SELECT). Снимок обновляет команда
+refresh_workload (каждые WORKLOAD_REFRESH_INTERVAL секунд или --once
+из cron); время обновления хранится в SnapshotRefresh и отдается
+в отчете как refreshed_at.
+
+Просроченные задачи считаются по местной дате (TIME_ZONE), как фильтр
+?overdue=true: в таблицу дата передается параметром, а представление
+PostgreSQL обновляется с часовым поясом сеанса TIME_ZONE, в котором
+CURRENT_DATE — местная дата. CURRENT_DATE SQLite — дата в UTC.
+"""
+
+import time
+from datetime import date
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .models import SnapshotRefresh, WorkloadSnapshot
+from .serializers import UserShortSerializer
+
+SNAPSHOT_NAME = "workload"
+TABLE = WorkloadSnapshot._meta.db_table
+
+# Должно совпадать с SNAPSHOT_SQL миграции 0008_workload_snapshot
+# (на PostgreSQL представление хранит определение из миграции, где вместо
+# параметра %s — CURRENT_DATE)
+SNAPSHOT_SQL = """
+SELECT executor_id AS employee_id,
+       COUNT(*) FILTER (WHERE status = 'new') AS new_count,
+       COUNT(*) FILTER (WHERE status = 'in_progress') AS in_progress_count,
+       COUNT(*) FILTER (WHERE status = 'done') AS done_count,
+       COUNT(*) FILTER (WHERE status IN ('new', 'in_progress')) AS active_count,
+       COUNT(*) FILTER (
+           WHERE status IN ('new', 'in_progress') AND due_date < %s
+       ) AS overdue_count,
+       MIN(due_date) FILTER (
+           WHERE status IN ('new', 'in_progress')
+       ) AS nearest_due_date
+FROM tasks_task
+WHERE executor_id IS NOT NULL
+GROUP BY executor_id
+"""
+
+COLUMNS = (
+    "employee_id",
+    "new_count",
+    "in_progress_count",
+    "done_count",
+    "active_count",
+    "overdue_count",
+    "nearest_due_date",
+)
+
+
+def local_today():
+    """Местная дата: Django задает процессу часовой пояс TIME_ZONE."""
+    return date.today()
+
+
+def _refresh_materialized_view(cursor):
+    # CURRENT_DATE представления — в часовом поясе сеанса; с USE_TZ сеанс в UTC
+    cursor.execute("SELECT set_config('TimeZone', %s, true)", [settings.TIME_ZONE])
+    cursor.execute(
+        "SELECT ispopulated FROM pg_matviews WHERE matviewname = %s", [TABLE]
+    )
+    (populated,) = cursor.fetchone()
+    # CONCURRENTLY невозможно для еще не заполненного представления
+    concurrently = "CONCURRENTLY " if populated else ""
+    cursor.execute(f"REFRESH MATERIALIZED VIEW {concurrently}{TABLE}")
+
+
+def _refresh_table(cursor):
+    cursor.execute(f"DELETE FROM {TABLE}")
+    cursor.execute(
+        f"INSERT INTO {TABLE} ({', '.join(COLUMNS)}) {SNAPSHOT_SQL}", [local_today()]
+    )
+
+
+def refresh_workload_snapshot(using="default"):
+    """Пересчитывает снимок загрузки и возвращает запись SnapshotRefresh."""
+    connection = connections[using]
+    started = time.perf_counter()
+    with transaction.atomic(using=using):
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                _refresh_materialized_view(cursor)
+            else:
+                _refresh_table(cursor)
+        refresh, _ = SnapshotRefresh.objects.using(using).update_or_create(
+            name=SNAPSHOT_NAME,
+            defaults={
+                "refreshed_at": timezone.now(),
+                "duration": time.perf_counter() - started,
+            },
+        )
+    return refresh
+
+
+def last_refresh():
+    """Последнее обновление снимка или None, если снимок еще не строился."""
+    return SnapshotRefresh.objects.filter(name=SNAPSHOT_NAME).first()
+
+
+def get_workload():
+    """Строки снимка по убыванию числа активных задач — одним запросом."""
+    snapshot = WorkloadSnapshot.objects.select_related("employee").order_by(
+        "-active_count", "employee_id"
+    )
+    return [
+        {
+            "employee": UserShortSerializer(row.employee).data,
+            "new": row.new_count,
+            "in_progress": row.in_progress_count,
+            "done": row.done_count,
+            "active": row.active_count,
+            "overdue": row.overdue_count,
+            "nearest_due_date": row.nearest_due_date,
+        }
+        for row in snapshot
+    ]
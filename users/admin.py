@@ -1,5 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+
+from config.paginators import LargeTablePaginator
 from .models import CustomUser
 
 
@@ -17,6 +19,9 @@ class CustomUserAdmin(UserAdmin):
     search_fields = ("email", "full_name", "position")
     # Сортировка пользователей (по email по умолчанию)
     ordering = ("email",)
+    # Без COUNT(*) по всей таблице
+    paginator = LargeTablePaginator
+    show_full_result_count = False
     # Настройка отображения формы редактирования пользователя
     fieldsets = (
         (None, {"fields": ("email", "password")}),
@@ -0,0 +1,163 @@
+"""
+JWT-аутентификация с кэшем пользователей в памяти процесса.
+
+Стандартный JWTAuthentication читает строку CustomUser из базы на каждый
+запрос. Здесь пользователь после первой успешной проверки хранится
+в LRU-кэше процесса с коротким TTL (AUTH_USER_CACHE_TIMEOUT) вместе
+с версией пользователя — меткой в общем кэше Django (AUTH_USER_CACHE_ALIAS).
+Запись пользователя (деактивация, смена пароля, удаление через API
+или админку) меняет метку сигналами, и при следующем запросе каждый воркер
+видит другую метку и заново читает и проверяет пользователя. Цена
+попадания — одно чтение из общего кэша вместо запроса к базе.
+
+Метка общая для воркеров только с общим кэшем (Redis, Memcached);
+с locmem остальные воркеры видят изменение не позже TTL. Запись в обход
+сигналов (QuerySet.update) тоже видна не позже TTL.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from config.metrics import registry
+
+
+class UserCache:
+    """
+    Потокобезопасный LRU-кэш пользователей с ограничением по времени жизни.
+    Ключ — id пользователя в виде строки, как в claim токена.
+    """
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id, version=None):
+        """Пользователь из кэша, если он сохранен с той же версией."""
+        user_id = str(user_id)
+        with self._lock:
+            item = self._items.get(user_id)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, cached_version, user = item
+            if expires_at < time.monotonic() or cached_version != version:
+                del self._items[user_id]
+                self.misses += 1
+                return None
+            self._items.move_to_end(user_id)
+            self.hits += 1
+            return user
+
+    def set(self, user_id, user, version=None):
+        if self.timeout <= 0:
+            return
+        user_id = str(user_id)
+        with self._lock:
+            self._items[user_id] = (time.monotonic() + self.timeout, version, user)
+            self._items.move_to_end(user_id)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def delete(self, user_id):
+        with self._lock:
+            self._items.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+user_cache = UserCache(
+    max_size=settings.AUTH_USER_CACHE_SIZE, timeout=settings.AUTH_USER_CACHE_TIMEOUT
+)
+
+
+def version_key(user_id):
+    return f"auth:user:{user_id}:version"
+
+
+def get_user_version(user_id):
+    """
+    Версия пользователя в общем кэше. Если ключа нет, версия начинается
+    с текущего времени в наносекундах, чтобы не совпасть с прежней.
+    """
+    cache = caches[settings.AUTH_USER_CACHE_ALIAS]
+    key = version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _bump_user_version(user_id):
+    caches[settings.AUTH_USER_CACHE_ALIAS].set(
+        version_key(user_id), time.time_ns(), timeout=None
+    )
+
+
+def invalidate_user(user_id):
+    """
+    Сбрасывает пользователя в кэшах всех воркеров. Версия меняется сразу
+    и еще раз после фиксации транзакции: иначе пользователь, прочитанный
+    до фиксации в другом запросе, остался бы в кэше под новой версией.
+    """
+    user_cache.delete(user_id)
+    _bump_user_version(user_id)
+    transaction.on_commit(lambda: _bump_user_version(user_id))
+
+
+def collect_metrics():
+    """Попадания и промахи кэша пользователей для реестра метрик (config.metrics)."""
+    return [
+        ("auth_user_cache_requests_total", {"result": "hit"}, user_cache.hits),
+        ("auth_user_cache_requests_total", {"result": "miss"}, user_cache.misses),
+    ]
+
+
+registry.register_collector(collect_metrics)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication, который берет пользователя из user_cache.
+    В кэш попадают только пользователи, прошедшие все проверки
+    JWTAuthentication.get_user, а запись, сохраненная под другой версией
+    пользователя, не используется: после деактивации, смены пароля
+    или удаления в любом воркере пользователь проверяется заново.
+    При попадании повторно проверяется привязка токена к паролю
+    (CHECK_REVOKE_TOKEN): токен, выданный до смены пароля, не проходит.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        version = get_user_version(user_id)
+        user = user_cache.get(user_id, version)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user, version)
+        elif api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+        # Копия: изменения request.user в одном запросе не попадают в кэш
+        return copy.copy(user)
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.4 on 2026-10-17 19:23
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_active_tasks_count(apps, schema_editor):
+    """Заполняет счетчик по существующим задачам одним UPDATE."""
+    CustomUser = apps.get_model("users", "CustomUser")
+    Task = apps.get_model("tasks", "Task")
+    db_alias = schema_editor.connection.alias
+    active_tasks = (
+        Task.objects.using(db_alias)
+        .filter(executor=OuterRef("pk"), status__in=["new", "in_progress"])
+        .order_by()
+        .values("executor")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    CustomUser.objects.using(db_alias).update(
+        active_tasks_count=Coalesce(
+            Subquery(active_tasks, output_field=IntegerField()), Value(0)
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0001_initial"),
+        ("tasks", "0002_alter_task_options_task_creator"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customuser",
+            name="active_tasks_count",
+            field=models.PositiveIntegerField(
+                db_index=True,
+                default=0,
+                editable=False,
+                help_text="Количество активных задач сотрудника",
+                verbose_name="Активных задач",
+            ),
+        ),
+        migrations.RunPython(fill_active_tasks_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-17 20:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_customuser_active_tasks_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customuser",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                db_index=True,
+                default=django.utils.timezone.now,
+                verbose_name="Обновлен",
+            ),
+            preserve_default=False,
+        ),
+    ]
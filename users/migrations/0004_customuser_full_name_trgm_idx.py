@@ -0,0 +1,33 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.db import migrations
+
+INDEX_NAME = "user_full_name_trgm_idx"
+
+
+def trigram_index():
+    return GinIndex(fields=["full_name"], opclasses=["gin_trgm_ops"], name=INDEX_NAME)
+
+
+def add_trigram_index(apps, schema_editor):
+    # Расширение pg_trgm и GIN-индекс триграмм есть только в PostgreSQL
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.add_index(apps.get_model("users", "CustomUser"), trigram_index())
+
+
+def remove_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.remove_index(apps.get_model("users", "CustomUser"), trigram_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_customuser_updated_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_trigram_index, remove_trigram_index),
+    ]
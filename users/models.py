@@ -71,6 +71,21 @@ class CustomUser(AbstractUser):
         help_text="Изображение профиля",
     )
 
+    # Денормализованный счетчик задач в статусах new/in_progress.
+    # Поддерживается при записи задач (см. tasks.counters).
+    active_tasks_count = models.PositiveIntegerField(
+        default=0,
+        db_index=True,
+        editable=False,
+        verbose_name="Активных задач",
+        help_text="Количество активных задач сотрудника",
+    )
+
+    # Время последнего изменения: по нему вычисляются ETag/Last-Modified
+    updated_at = models.DateTimeField(
+        auto_now=True, db_index=True, verbose_name="Обновлен"
+    )
+
     USERNAME_FIELD = "email"  # Указываем, что логином является email
     REQUIRED_FIELDS = ["full_name", "position"]
 
@@ -1,9 +1,11 @@
 from rest_framework import serializers
+
+from config.fieldsets import SparseFieldsetSerializerMixin
 from .models import CustomUser
 
 
-class CustomUserSerializer(serializers.ModelSerializer):
-    """Сериализатор для модели CustomUser."""
+class CustomUserSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    """Сериализатор для модели CustomUser (для чтения поддерживает ?fields=)."""
 
     class Meta:
         model = CustomUser
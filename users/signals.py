@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_user
+from .models import CustomUser
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def evict_cached_user(sender, instance, **kwargs):
+    """
+    Сбрасывает пользователя в кэше аутентификации всех воркеров при любом
+    изменении: деактивации, смене пароля, удалении.
+    """
+    invalidate_user(instance.pk)
@@ -1,7 +1,12 @@
+from unittest.mock import patch
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
+from .authentication import user_cache
 from .models import CustomUser
 
 
@@ -73,6 +78,24 @@ class UserAPITests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertGreaterEqual(len(response.data), 1)
 
+    def test_sparse_fields(self):
+        """
+        ?fields= оставляет в ответе и в SELECT только перечисленные столбцы.
+        """
+        self.client.force_authenticate(user=self.admin_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, {"fields": "id,email"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data[0], {"id": self.admin_user.id, "email": "admin@example.com"}
+        )
+        select = queries.captured_queries[-1]["sql"]
+        self.assertIn('"email"', select)
+        self.assertNotIn('"password"', select)
+
+        response = self.client.get(self.list_url, {"fields": "id,salary"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_duplicate_email_registration(self):
         """
         Проверяем, что нельзя зарегистрировать пользователя с существующим email.
@@ -86,3 +109,62 @@ class UserAPITests(TestCase):
         response = self.client.post(self.register_url, data, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """
+    Тесты кэша пользователей JWT-аутентификации.
+    """
+
+    def setUp(self):
+        user_cache.clear()
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            email="jwt@example.com",
+            password="jwtpass",
+            full_name="Jwt User",
+            position="Employee",
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"email": "jwt@example.com", "password": "jwtpass"},
+            format="json",
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.detail_url = reverse("users-detail", kwargs={"pk": self.user.pk})
+
+    def test_cached_user_costs_no_queries(self):
+        """Повторный запрос не читает пользователя из базы."""
+        etag = self.client.get(self.detail_url)["ETag"]
+        # единственный запрос — updated_at для ETag
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_deactivated_user_is_evicted(self):
+        """Деактивация пользователя сразу закрывает доступ."""
+        self.assertEqual(self.client.get(self.detail_url).status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_other_worker_sees_deactivation(self):
+        """
+        Деактивация в другом воркере (его сигналы не трогают LRU этого
+        процесса) закрывает доступ через версию в общем кэше.
+        """
+        self.assertEqual(self.client.get(self.detail_url).status_code, 200)
+        with patch.object(user_cache, "delete"):
+            self.user.is_active = False
+            self.user.save()
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_is_evicted(self):
+        """Удаленный пользователь не проходит аутентификацию."""
+        self.assertEqual(self.client.get(self.detail_url).status_code, 200)
+        response = self.client.delete(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
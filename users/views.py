@@ -1,10 +1,15 @@
 from rest_framework import viewsets, generics, permissions
 
+from config.conditional import ConditionalGetMixin
+from config.fieldsets import SparseFieldsetMixin
+from config.replicas import ReplicaReadMixin
 from .models import CustomUser
 from .serializers import CustomUserSerializer, UserRegisterSerializer
 
 
-class CustomUserViewSet(viewsets.ModelViewSet):
+class CustomUserViewSet(
+    ReplicaReadMixin, ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet
+):
     """
     ViewSet для управления сотрудниками (пользователями).
     Поддерживает операции:
@@ -12,6 +17,8 @@ class CustomUserViewSet(viewsets.ModelViewSet):
     - POST (создание)
     - PUT/PATCH (обновление)
     - DELETE (удаление)
+    Список и детальный просмотр поддерживают условные запросы (ETag/Last-Modified)
+    и выборочные поля (?fields=).
     """
 
     queryset = CustomUser.objects.all()